@@ -1,15 +1,20 @@
 # sparrow/core/application.py
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import replace
-from typing import Optional, Type
+from typing import Optional, Tuple, Type
 
 import moderngl
 import pygame
 
 from sparrow.core.scene import Scene
 from sparrow.core.timing import FixedStep
+from sparrow.graphics.graph.render_graph import PreparedFrame
 from sparrow.input.handler import InputHandler
 from sparrow.resources.core import SimulationTime
 from sparrow.resources.rendering import RenderContext, RenderViewport
+from sparrow.systems.rendering import ensure_renderer_resource, render_system
+
+PendingRender = Tuple[Scene, "Future[PreparedFrame]"]
 
 
 class Application:
@@ -53,7 +58,16 @@ class Application:
 
         self.clock = pygame.time.Clock()
 
-    def run(self, start_scene_cls: Type[Scene]) -> None:
+    def run(self, start_scene_cls: Type[Scene], *, pipelined: bool = False) -> None:
+        """
+        Run the main loop until the window closes.
+
+        Args:
+            start_scene_cls: Scene to start with.
+            pipelined: Prepare frame N (culling, buffer packing) on a worker
+                thread while the main thread simulates step N+1. GL submission
+                stays on the main thread; presentation lags one frame.
+        """
         self.change_scene(start_scene_cls)
         self.running = True
 
@@ -67,6 +81,13 @@ class Application:
 
         self.timer.start()
 
+        executor: ThreadPoolExecutor | None = None
+        if pipelined:
+            executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="render-prep"
+            )
+        pending: PendingRender | None = None
+
         while self.running:
             if self.window is not None:
                 for event in pygame.event.get():
@@ -75,6 +96,10 @@ class Application:
                     if event.type == pygame.KEYDOWN:
                         if event.key == pygame.K_ESCAPE:
                             self.running = False
+                    if event.type == pygame.VIDEORESIZE:
+                        self.screen_size = (event.w, event.h)
+                        if self.active_scene:
+                            self.active_scene.request_resize(event.w, event.h)
 
                     if self.active_scene:
                         inp = self.active_scene.world.get_resource(InputHandler)
@@ -97,7 +122,10 @@ class Application:
                     self.active_scene.world.mutate_resource(new_st)
                     self.active_scene.on_update()
 
-                self.active_scene.on_render()
+                if executor is None:
+                    self.active_scene.on_render()
+                else:
+                    pending = self._render_pipelined(executor, pending)
 
             if self.window is not None:
                 pygame.display.flip()
@@ -105,9 +133,43 @@ class Application:
             if self.clock is not None:
                 self.clock.tick(60)
 
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+        if self.active_scene:
+            self.active_scene.on_exit()
+
         if self._pygame_initialized:
             pygame.quit()
 
+    def _render_pipelined(
+        self,
+        executor: ThreadPoolExecutor,
+        pending: PendingRender | None,
+    ) -> PendingRender | None:
+        """
+        Submit the previously prepared frame, then extract the current one
+        and hand it to the render-prep worker.
+        """
+        scene = self.active_scene
+        assert scene is not None
+
+        if pending is not None:
+            pending_scene, future = pending
+            prepared = future.result()
+            if pending_scene is scene:
+                render_system(scene.world, prepared)
+
+        frame = scene.extract_render()
+        if frame is None:
+            return None
+
+        renderer_res = ensure_renderer_resource(scene.world)
+        if renderer_res is None:
+            return None
+
+        return scene, executor.submit(renderer_res.renderer.prepare_frame, frame)
+
     def change_scene(self, scene_cls: Type[Scene]) -> None:
         if self.active_scene:
             self.active_scene.on_exit()
@@ -332,4 +332,8 @@ class PolygonRenderable:
 
 @dataclass
 class RenderLayer:
+    __soa_dtype__ = [
+        ("order", "i4"),
+    ]
+
     order: int = 0
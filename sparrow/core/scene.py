@@ -4,23 +4,12 @@ from typing import TYPE_CHECKING, List, Optional
 
 import pygame
 
-from sparrow.core.components import (
-    EID,
-    Mesh,
-    PointLight,
-    PolygonRenderable,
-    RenderLayer,
-    Transform,
-)
+from sparrow.core.components import PointLight, Transform
 from sparrow.core.query import Query
 from sparrow.core.scheduler import Scheduler, Stage
 from sparrow.core.world import World
-from sparrow.graphics.ecs.frame_submit import (
-    DrawItem,
-    LightPoint,
-    PolygonDrawItem,
-    RenderFrameInput,
-)
+from sparrow.graphics.ecs.frame_submit import LightPoint, RenderFrameInput
+from sparrow.graphics.ecs.render_mirror import RenderMirror
 from sparrow.graphics.renderer.settings import (
     ForwardRendererSettings,
     RendererSettings,
@@ -29,12 +18,12 @@ from sparrow.graphics.renderer.settings import (
 )
 from sparrow.input.context import InputContext
 from sparrow.input.handler import InputHandler
-from sparrow.math import batch_transform_to_matrix
 from sparrow.resources.cameras import CameraOutput
 from sparrow.resources.core import SimulationTime
 from sparrow.resources.physics import Gravity
 from sparrow.resources.rendering import (
     RenderContext,
+    RendererResource,
     RendererSettingsResource,
     RenderFrame,
     RenderViewport,
@@ -72,11 +61,13 @@ class Scene:
         self.scheduler = Scheduler()
 
         self._pending_renderer_settings = renderer_settings
+        self.render_mirror = RenderMirror()
 
         self._register_default_systems()
 
         self.frame_index = 0
         self.last_time = 0
+        self._pending_resize: Optional[tuple[int, int]] = None
 
         input_handler = InputHandler()
         self.world.add_resource(input_handler)
@@ -129,14 +120,64 @@ class Scene:
         self.scheduler.run_stage(Stage.PHYSICS, self.world)
         self.scheduler.run_stage(Stage.POST_UPDATE, self.world)
 
-        # TODO: Poll input, window events, resize handling.
-        # If resized, update renderer settings and rebuild graph or trigger resize path.
+        self._apply_pending_resize()
+
+    def request_resize(self, width: int, height: int) -> None:
+        """Queue a window resize; it is applied on the next update."""
+        self._pending_resize = (width, height)
+
+    def _apply_pending_resize(self) -> None:
+        """
+        Publish the new viewport and resize the renderer.
+
+        The renderer's logical resolution only follows the window if it
+        matched the old viewport; fixed internal resolutions are kept and
+        scaled at present time.
+        """
+        if self._pending_resize is None:
+            return
+        w, h = self._pending_resize
+        self._pending_resize = None
+
+        viewport = self.world.try_resource(RenderViewport)
+        if w <= 0 or h <= 0 or viewport is None:
+            return  # minimized, or not rendering
+        if (w, h) == (viewport.width, viewport.height):
+            return
+        self.world.mutate_resource(RenderViewport(width=w, height=h))
+
+        renderer_res = self.world.try_resource(RendererResource)
+        if renderer_res is None:
+            return
+        renderer = renderer_res.renderer
+        res = renderer.settings.resolution
+        if (res.logical_width, res.logical_height) != (
+            viewport.width,
+            viewport.height,
+        ):
+            return
+
+        renderer.resize(w, h)
+        self.world.mutate_resource(RendererSettingsResource(renderer.settings))
 
     def on_render(self) -> None:
         """Called every frame to submit render data (if rendering is enabled)."""
-        if not self.render_enabled:
+        if self.extract_render() is None:
             return
 
+        render_system(self.world)
+
+    def extract_render(self) -> Optional[RenderFrameInput]:
+        """
+        Extract this frame's render data and publish it as the RenderFrame
+        resource.
+
+        The returned frame stays valid until the next extraction, so it can
+        be prepared on another thread while the world keeps simulating.
+        """
+        if not self.render_enabled:
+            return None
+
         frame = self.get_render_frame()
         frame_res = RenderFrame(frame)
 
@@ -145,11 +186,17 @@ class Scene:
         else:
             self.world.mutate_resource(frame_res)
 
-        render_system(self.world)
+        return frame
 
     def on_exit(self) -> None:
         """Called when transitioning away from this scene."""
-        pass
+        renderer_res = self.world.try_resource(RendererResource)
+        if renderer_res is None:
+            return
+        renderer = renderer_res.renderer
+        renderer.shutdown()
+        if renderer.settings.shaders.manifest_path is not None:
+            renderer.save_shader_manifest()
 
     def configure_rendering(self) -> None:
         if not self.render_enabled:
@@ -185,6 +232,9 @@ class Scene:
         """
         Extracts data from the ECS World to build the FrameContext for the Renderer.
         You can override this if you need custom render logic.
+
+        Meshes and polygons come from the persistent render mirror, which only
+        rebuilds the draw items of entities that changed since the last frame.
         """
         viewport = self.world.try_resource(RenderViewport)
         if viewport is None:
@@ -202,78 +252,38 @@ class Scene:
         if sim_time:
             dt = sim_time.delta_seconds
 
-        draws: List[DrawItem] = []
-        draw_id = 0
-        for count, (meshes, transforms) in Query(self.world, Mesh, Transform):
-            models = batch_transform_to_matrix(
-                transforms.pos.vec,
-                transforms.rot.vec,
-                transforms.scale.vec,
-            )
-
-            for i in range(count):
-                draws.append(
-                    DrawItem(
-                        meshes.mesh_id[i],
-                        meshes.material_id[i],
-                        models[i],
-                        draw_id,
-                    )
-                )
-                draw_id += 1
+        instances = self.render_mirror.sync(self.world)
 
         point_lights: List[LightPoint] = []
         light_id = 0
         for count, (lights, transforms) in Query(
             self.world, PointLight, Transform
         ):
+            radius = Query.flat(lights.radius)
+            intensity = Query.flat(lights.intensity)
             for i in range(count):
                 point_lights.append(
                     LightPoint(
-                        transforms.pos.vec[i],
-                        lights.radius[i],
-                        lights.color[i],
-                        lights.intensity[i],
+                        transforms.pos.vec[i].copy(),
+                        float(radius[i]),
+                        lights.color[i].copy(),
+                        float(intensity[i]),
                         light_id,
                     )
                 )
                 light_id += 1
 
-        polygons: List[PolygonDrawItem] = []
-        for count, (polys, transforms, eids) in Query(
-            self.world, PolygonRenderable, Transform, EID
-        ):
-            models = batch_transform_to_matrix(
-                transforms.pos.vec,
-                transforms.rot.vec,
-                transforms.scale.vec,
-            )
-
-            for i in range(count):
-                eid_native = eids[i].item()
-                layer_comp = self.world.component(eid_native, RenderLayer)
-                layer_order = layer_comp.order if layer_comp else 0
-
-                width_native = polys.stroke_width[i].item()
-
-                polygons.append(
-                    PolygonDrawItem(
-                        vertices=polys.vertices[i],
-                        color=polys.color[i],
-                        model=models[i],
-                        stroke_width=width_native,
-                        closed=polys.closed[i],
-                        layer=layer_order,
-                    )
-                )
-
         return RenderFrameInput(
             frame_index=self.frame_index,
             dt_seconds=dt,
             camera=cam_out.active,
-            draws=draws,
+            draws=self.render_mirror.draws,
             point_lights=point_lights,
-            polygons=polygons,
+            polygons=self.render_mirror.polygons,
+            polygon_bounds=self.render_mirror.polygon_bounds,
+            polygon_instances=self.render_mirror.polygon_instances,
+            polygon_shapes=self.render_mirror.shapes,
+            instances=instances,
             viewport_width=w,
             viewport_height=h,
         )
@@ -46,6 +46,9 @@ def dump_render_graph_state(
     for i, pid in enumerate(graph.pass_order):
         print(f"    {i:02d}: {pid}")
 
+    if graph.culled_passes:
+        print(f"\n  Culled passes   : {[str(pid) for pid in graph.culled_passes]}")
+
     # ------------------------------------------------------------------
     # Pass details
     # ------------------------------------------------------------------
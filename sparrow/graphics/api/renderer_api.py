@@ -2,10 +2,11 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional
 
 from sparrow.graphics.graph.builder import RenderGraphBuilder
 from sparrow.graphics.graph.pass_base import RenderPass
+from sparrow.graphics.graph.profiling import PassTiming
 from sparrow.graphics.graph.resources import BufferDesc, FramebufferDesc, TextureDesc
 from sparrow.graphics.renderer.deferred_renderer import DeferredRenderer
 from sparrow.graphics.util.ids import PassId, ResourceId
@@ -36,6 +37,10 @@ class GraphEdit:
         """Add or replace a framebuffer resource."""
         self._builder.add_framebuffer(rid, desc)
 
+    def export_resource(self, rid: ResourceId) -> None:
+        """Keep the passes writing a resource even if no pass reads it."""
+        self._builder.export_resource(rid)
+
     def add_pass(self, pid: PassId, pass_obj: RenderPass) -> None:
         """Add a new pass."""
         self._builder.add_pass(pid, pass_obj)
@@ -88,6 +93,18 @@ class RendererAPI:
         """
         self.renderer.rebuild_graph(configure, reason=reason)
 
+    def set_pass_enabled(self, pid: PassId, enabled: bool) -> None:
+        """Toggle a pass for the following frames without recompiling."""
+        self.renderer.set_pass_enabled(pid, enabled)
+
+    def set_profiling(self, enabled: bool, *, history: int = 120) -> None:
+        """Start or stop recording per-pass CPU/GPU timings."""
+        self.renderer.set_profiling(enabled, history=history)
+
+    def pass_timings(self) -> Dict[PassId, PassTiming]:
+        """Rolling per-pass timings; empty while profiling is off."""
+        return self.renderer.pass_timings()
+
     def rebuild_default_graph(self) -> None:
         """Rebuild the default pass set (gbuffer -> lighting -> tonemap)."""
         ...
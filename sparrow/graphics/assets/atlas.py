@@ -0,0 +1,279 @@
+# sparrow/graphics/assets/atlas.py
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from sparrow.core.components import Sprite
+from sparrow.graphics.util.ids import TextureId
+from sparrow.types import Rect
+
+if TYPE_CHECKING:
+    from sparrow.core.world import World
+
+
+class SkylinePacker:
+    """
+    Bottom-left skyline bin packer for one fixed-size page.
+
+    The skyline is the list of (x, y, width) segments forming the top edge
+    of everything placed so far; a rectangle goes where it rests lowest,
+    preferring the narrowest segment on ties.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self._skyline: List[Tuple[int, int, int]] = [(0, 0, width)]
+
+    def insert(self, width: int, height: int) -> Optional[Tuple[int, int]]:
+        """
+        Place a `width` x `height` rectangle.
+
+        Returns:
+            Its top-left corner, or None if it does not fit.
+        """
+        best: Optional[Tuple[int, int, int]] = None  # (bottom, seg width, i)
+        best_y = 0
+        for i, (x, _, seg_width) in enumerate(self._skyline):
+            y = self._fit(i, width, height)
+            if y is None:
+                continue
+            key = (y + height, seg_width, i)
+            if best is None or key < best:
+                best, best_y = key, y
+        if best is None:
+            return None
+
+        i = best[2]
+        x = self._skyline[i][0]
+        self._raise(i, x, best_y + height, width)
+        return x, best_y
+
+    def _fit(self, i: int, width: int, height: int) -> Optional[int]:
+        x = self._skyline[i][0]
+        if x + width > self.width:
+            return None
+        y = 0
+        remaining = width
+        while remaining > 0:
+            _, seg_y, seg_width = self._skyline[i]
+            y = max(y, seg_y)
+            if y + height > self.height:
+                return None
+            remaining -= seg_width
+            i += 1
+        return y
+
+    def _raise(self, i: int, x: int, top: int, width: int) -> None:
+        right = x + width
+        # Trim or drop the segments the new rectangle covers.
+        j = i
+        while j < len(self._skyline) and self._skyline[j][0] < right:
+            seg_x, seg_y, seg_width = self._skyline[j]
+            seg_right = seg_x + seg_width
+            if seg_right <= right:
+                del self._skyline[j]
+            else:
+                self._skyline[j] = (right, seg_y, seg_right - right)
+                break
+        self._skyline.insert(i, (x, top, width))
+
+        # Merge neighbours at the same height.
+        merged: List[Tuple[int, int, int]] = []
+        for seg in self._skyline:
+            if merged and merged[-1][1] == seg[1]:
+                prev = merged[-1]
+                merged[-1] = (prev[0], prev[1], prev[2] + seg[2])
+            else:
+                merged.append(seg)
+        self._skyline = merged
+
+
+@dataclass(frozen=True, slots=True)
+class AtlasEntry:
+    """Where one image landed: its page and pixel rectangle (sans gutter)."""
+
+    page: int
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+@dataclass(slots=True)
+class TextureAtlas:
+    """
+    Images packed into one or more RGBA8 pages.
+
+    Each page is uploaded as its own texture, `page_id(n)`; a sprite selects
+    its page through `texture_id` and its image through `region`.
+    """
+
+    name: str
+    page_size: Tuple[int, int]
+    pages: List[np.ndarray]  # (height, width, 4) uint8
+    entries: Dict[str, AtlasEntry] = field(default_factory=dict)
+    mip_levels: int = 0  # highest mip level free of bleeding between images
+
+    def page_id(self, page: int) -> TextureId:
+        return TextureId(f"{self.name}#{page}")
+
+    def region(self, key: str, sub_region: Optional[Rect] = None) -> Rect:
+        """
+        Normalized (u, v, w, h) of an image on its page.
+
+        Args:
+            sub_region: Region within the source image, in its own
+                normalized coordinates; defaults to the whole image.
+
+        Raises:
+            KeyError: If the image is not in the atlas.
+        """
+        try:
+            entry = self.entries[key]
+        except KeyError:
+            raise KeyError(f"Image '{key}' is not in atlas '{self.name}'")
+
+        u, v, w, h = sub_region if sub_region is not None else (0.0, 0.0, 1.0, 1.0)
+        page_w, page_h = self.page_size
+        return (
+            (entry.x + u * entry.width) / page_w,
+            (entry.y + v * entry.height) / page_h,
+            w * entry.width / page_w,
+            h * entry.height / page_h,
+        )
+
+    def remap(self, sprite: Sprite) -> Sprite:
+        """
+        Point a sprite at its image's atlas page.
+
+        Sprites whose texture is not in the atlas are returned unchanged.
+        """
+        entry = self.entries.get(sprite.texture_id)
+        if entry is None:
+            return sprite
+        return replace(
+            sprite,
+            texture_id=self.page_id(entry.page),
+            region=self.region(sprite.texture_id, sprite.region),
+        )
+
+
+def build_atlas(
+    name: str,
+    images: Mapping[str, np.ndarray],
+    *,
+    page_size: int = 2048,
+    padding: int = 4,
+) -> TextureAtlas:
+    """
+    Pack RGBA8 images into as few pages as possible.
+
+    Every image gets a gutter of `padding` texels filled by extruding its
+    edges, so bilinear filtering never reads a neighbour. Cells are aligned
+    to the largest power of two not above `padding`; up to that mip level a
+    texel never averages two images, which bounds `mip_levels`.
+
+    Args:
+        images: (height, width, 4) uint8 arrays, keyed by the texture id
+            sprites use for them.
+
+    Raises:
+        ValueError: If an image is not RGBA8 or does not fit on a page.
+    """
+    if padding < 1:
+        raise ValueError("Atlas padding must be at least one texel")
+
+    align = 1 << (padding.bit_length() - 1)
+    mip_levels = align.bit_length() - 1
+
+    def cell(size: int) -> int:
+        return -(-(size + 2 * padding) // align) * align
+
+    for key, img in images.items():
+        if img.ndim != 3 or img.shape[2] != 4 or img.dtype != np.uint8:
+            raise ValueError(f"Image '{key}' is not an RGBA8 array")
+        h, w = img.shape[:2]
+        if cell(w) > page_size or cell(h) > page_size:
+            raise ValueError(
+                f"Image '{key}' ({w}x{h}) does not fit a {page_size}px atlas page"
+            )
+
+    # Tallest first packs a skyline far tighter than arrival order.
+    order = sorted(
+        images, key=lambda k: (-images[k].shape[0], -images[k].shape[1], k)
+    )
+
+    packers: List[SkylinePacker] = []
+    pages: List[np.ndarray] = []
+    entries: Dict[str, AtlasEntry] = {}
+    for key in order:
+        img = images[key]
+        h, w = img.shape[:2]
+        for page, packer in enumerate(packers):
+            spot = packer.insert(cell(w) // align, cell(h) // align)
+            if spot is not None:
+                break
+        else:
+            page = len(packers)
+            packers.append(SkylinePacker(page_size // align, page_size // align))
+            pages.append(np.zeros((page_size, page_size, 4), dtype=np.uint8))
+            spot = packers[page].insert(cell(w) // align, cell(h) // align)
+            assert spot is not None
+
+        x, y = spot[0] * align + padding, spot[1] * align + padding
+        _blit_extruded(pages[page], img, x, y, padding)
+        entries[key] = AtlasEntry(page, x, y, w, h)
+
+    return TextureAtlas(
+        name=name,
+        page_size=(page_size, page_size),
+        pages=pages,
+        entries=entries,
+        mip_levels=mip_levels,
+    )
+
+
+def build_atlas_from_files(
+    name: str,
+    paths: Mapping[str, str],
+    *,
+    page_size: int = 2048,
+    padding: int = 4,
+) -> TextureAtlas:
+    """Decode image files to RGBA8 and pack them, see `build_atlas`."""
+    images: Dict[str, np.ndarray] = {}
+    for key, path in paths.items():
+        with Image.open(path) as img:
+            images[key] = np.asarray(img.convert("RGBA"))
+    return build_atlas(name, images, page_size=page_size, padding=padding)
+
+
+def remap_sprites(world: World, atlas: TextureAtlas) -> int:
+    """
+    Rewrite every `Sprite` in `world` that uses an atlas image.
+
+    Returns:
+        The number of sprites changed.
+    """
+    changed = [
+        (eid, remapped)
+        for eid, sprite in world.join(Sprite)
+        if (remapped := atlas.remap(sprite)) is not sprite
+    ]
+    for eid, sprite in changed:
+        world.mutate_component(eid, sprite)
+    return len(changed)
+
+
+def _blit_extruded(
+    page: np.ndarray, img: np.ndarray, x: int, y: int, padding: int
+) -> None:
+    h, w = img.shape[:2]
+    # Edge-padding the image repeats its border texels into the gutter.
+    padded = np.pad(img, ((padding, padding), (padding, padding), (0, 0)), "edge")
+    page[y - padding : y + h + padding, x - padding : x + w + padding] = padded
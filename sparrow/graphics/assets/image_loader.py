@@ -0,0 +1,116 @@
+# sparrow/graphics/assets/image_loader.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from sparrow.graphics.assets.texture_cache import (
+    load_cached_texture,
+    store_cached_texture,
+)
+from sparrow.graphics.util.blob_file import Buffer
+
+Pixels = Buffer
+
+
+@dataclass(frozen=True, slots=True)
+class DecodedTexture:
+    """
+    RGBA8 pixels ready for `TextureManager.create_from_bytes`.
+
+    `mips` holds levels 1..n, when the import asked for a prebuilt chain.
+    """
+
+    data: Pixels
+    width: int
+    height: int
+    mips: Tuple[Pixels, ...] = ()
+
+
+def decode_texture(
+    path: str, *, cache_dir: Optional[str] = None, mips: bool = False
+) -> DecodedTexture:
+    """
+    Decode an image file to RGBA8.
+
+    Args:
+        cache_dir: If set, decoded pixels are kept there and memory-mapped
+            on later calls, skipping the image decode.
+        mips: Also build the mip chain, filtered in linear light.
+    """
+    settings = {"format": "rgba8", "mips": mips}
+    if cache_dir is not None:
+        cached = load_cached_texture(path, cache_dir, settings)
+        if cached is not None:
+            (data, width, height), *rest = cached
+            return DecodedTexture(data, width, height, tuple(p for p, _, _ in rest))
+
+    with Image.open(path) as img:
+        rgba = np.asarray(img.convert("RGBA"))
+    height, width = rgba.shape[:2]
+    levels = [(rgba.tobytes(), width, height)]
+    if mips:
+        levels += [
+            (level.tobytes(), level.shape[1], level.shape[0])
+            for level in build_mip_chain(rgba)
+        ]
+
+    if cache_dir is not None:
+        store_cached_texture(path, cache_dir, settings, levels)
+    return DecodedTexture(
+        levels[0][0], width, height, tuple(p for p, _, _ in levels[1:])
+    )
+
+
+# sRGB decode table; the encode side is computed (it has no 8-bit input).
+_TO_LINEAR = np.where(
+    (v := np.arange(256, dtype=np.float32) / 255.0) <= 0.04045,
+    v / 12.92,
+    ((v + 0.055) / 1.055) ** 2.4,
+).astype(np.float32)
+
+
+def _to_srgb(linear: np.ndarray) -> np.ndarray:
+    linear = np.clip(linear, 0.0, 1.0)
+    encoded = np.where(
+        linear <= 0.0031308,
+        linear * 12.92,
+        1.055 * np.power(linear, 1.0 / 2.4) - 0.055,
+    )
+    return np.rint(encoded * 255.0).astype(np.uint8)
+
+
+def build_mip_chain(rgba: np.ndarray) -> List[np.ndarray]:
+    """
+    Box-filter an RGBA8 image down to 1x1.
+
+    Colour is averaged in linear light and weighted by alpha, so dark
+    fringes do not creep in from transparent texels. Odd trailing rows and
+    columns are dropped, as in GL's own mip sizes.
+
+    Returns:
+        Levels 1..n as (height, width, 4) uint8 arrays.
+    """
+    alpha = rgba[..., 3:].astype(np.float32) / 255.0
+    # Premultiplied linear colour, plus alpha.
+    level = np.concatenate([_TO_LINEAR[rgba[..., :3]] * alpha, alpha], axis=-1)
+
+    chain = []
+    while level.shape[0] > 1 or level.shape[1] > 1:
+        h, w = level.shape[:2]
+        if h > 1:
+            level = (level[0 : h & ~1 : 2] + level[1 : h & ~1 : 2]) * 0.5
+        if w > 1:
+            level = (level[:, 0 : w & ~1 : 2] + level[:, 1 : w & ~1 : 2]) * 0.5
+
+        a = level[..., 3:]
+        colour = np.divide(
+            level[..., :3], a, out=np.zeros_like(level[..., :3]), where=a > 0
+        )
+        chain.append(
+            np.concatenate([_to_srgb(colour), np.rint(a * 255.0).astype(np.uint8)], -1)
+        )
+    return chain
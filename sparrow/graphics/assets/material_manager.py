@@ -36,6 +36,7 @@ class MaterialManager:
 
     def __init__(self) -> None:
         self._materials: Dict[MaterialId, Material] = {}
+        self._indices: Dict[MaterialId, int] = {}
 
         self.create(
             MaterialId("engine.default"),
@@ -45,6 +46,7 @@ class MaterialManager:
     def create(self, material_id: MaterialId, material: Material) -> None:
         """Register or replace a material."""
         self._materials[material_id] = material
+        self._indices.setdefault(material_id, len(self._indices))
 
     def get(self, material_id: MaterialId) -> Material:
         """Get a material by id."""
@@ -52,3 +54,10 @@ class MaterialManager:
             return self._materials[material_id]
         except KeyError:
             raise KeyError(f"Material '{material_id}' not found")
+
+    def index_of(self, material_id: MaterialId) -> int:
+        """Small stable integer handle of a material (creation order)."""
+        try:
+            return self._indices[material_id]
+        except KeyError:
+            raise KeyError(f"Material '{material_id}' not found")
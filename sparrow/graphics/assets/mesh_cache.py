@@ -0,0 +1,95 @@
+# sparrow/graphics/assets/mesh_cache.py
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+from sparrow.graphics.assets.types import MeshData, VertexLayout
+from sparrow.graphics.util.blob_file import (
+    current_stamp,
+    read_blob_file,
+    source_stamp,
+    write_blob_file,
+)
+
+# Blobs: vertices, then indices (empty for non-indexed meshes).
+_MAGIC = b"SPRMESH2"
+
+
+def _cache_file(path: str | Path, cache_dir: str | Path) -> Path:
+    key = hashlib.sha256(str(Path(path).resolve()).encode("utf-8")).hexdigest()
+    return Path(cache_dir) / f"{key[:32]}.mesh"
+
+
+def load_cached_mesh(path: str | Path, cache_dir: str | Path) -> Optional[MeshData]:
+    """
+    Memory-map the cached import of `path`, if it is up to date.
+
+    Freshness is decided by `current_stamp`.
+
+    Returns:
+        MeshData whose buffers view the mapped file, or None on a miss.
+    """
+    entry = read_blob_file(_cache_file(path, cache_dir), _MAGIC)
+    if entry is None:
+        return None
+    header, (vertices, indices) = entry
+    stamp = current_stamp(header, path)
+    if stamp is None:
+        return None
+
+    layout = header["layout"]
+    data = MeshData(
+        vertices=vertices,
+        indices=indices if len(indices) else None,
+        vertex_layout=VertexLayout(
+            attributes=list(layout["attributes"]),
+            format=layout["format"],
+            stride_bytes=layout["stride_bytes"],
+        ),
+        aabb=(tuple(header["aabb"][0]), tuple(header["aabb"][1])),
+        index_element_size=header["index_element_size"],
+    )
+
+    if stamp["mtime_ns"] != header["mtime_ns"]:
+        # Same content under a new mtime: refresh the stamp.
+        store_cached_mesh(path, cache_dir, data, digest=stamp["sha256"])
+    return data
+
+
+def store_cached_mesh(
+    path: str | Path,
+    cache_dir: str | Path,
+    data: MeshData,
+    *,
+    digest: Optional[str] = None,
+) -> None:
+    """
+    Write `data` as the cached import of `path`.
+
+    Args:
+        digest: SHA-256 of the source, if the caller already computed it.
+
+    Failures to write are ignored; the cache is an optimization.
+    """
+    try:
+        stamp = source_stamp(path, digest=digest)
+    except OSError:
+        return
+
+    header = {
+        "source": str(path),
+        **stamp,
+        "layout": {
+            "attributes": list(data.vertex_layout.attributes),
+            "format": data.vertex_layout.format,
+            "stride_bytes": data.vertex_layout.stride_bytes,
+        },
+        "aabb": [list(data.aabb[0]), list(data.aabb[1])],
+        "index_element_size": data.index_element_size,
+    }
+    indices = data.indices if data.indices is not None else b""
+    write_blob_file(
+        _cache_file(path, cache_dir), _MAGIC, header, [data.vertices, indices]
+    )
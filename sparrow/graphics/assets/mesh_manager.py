@@ -2,12 +2,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, Optional, Sequence, Set
 
 import moderngl
+import numpy as np
 
-from sparrow.graphics.assets.obj_loader import load_obj
+from sparrow.graphics.assets.obj_loader import load_obj, parse_obj
 from sparrow.graphics.assets.types import MeshData, VertexLayout
+from sparrow.graphics.helpers.bvh import Bvh, build_bvh, triangle_bounds
 from sparrow.graphics.util.ids import MeshId
 
 
@@ -18,9 +20,60 @@ class MeshHandle:
     vbo: moderngl.Buffer
     ibo: Optional[moderngl.Buffer]
     vertex_layout: VertexLayout
-    vao_cache: Dict[int, moderngl.VertexArray]  # keyed by program id/hash
+    vao_cache: Dict[tuple[int, int], moderngl.VertexArray]  # (program, instances)
     label: str
     data: MeshData
+    triangles: Optional[np.ndarray] = None  # see MeshManager.triangles
+    blas: Optional[Bvh] = None  # see MeshManager.blas
+
+    @property
+    def draw_count(self) -> int:
+        """Number of vertices (or indices, if indexed) drawn per instance."""
+        if self.data.indices is not None:
+            return len(self.data.indices) // self.data.index_element_size
+        return len(self.data.vertices) // self.vertex_layout.stride_bytes
+
+
+@dataclass(frozen=True, slots=True)
+class InstanceLayout:
+    """
+    Per-instance vertex attributes appended to a mesh VAO.
+
+    Attributes:
+        buffer: Buffer holding one record per instance.
+        format: moderngl format string with the "/i" divisor,
+            e.g. "1u /i" or "16f /i".
+        attributes: Shader attribute names, in format order.
+    """
+
+    buffer: moderngl.Buffer
+    format: str
+    attributes: Sequence[str]
+
+
+# Unit cube drawn for meshes that are still loading.
+_PLACEHOLDER_OBJ = b"""
+v -0.5 -0.5 -0.5
+v 0.5 -0.5 -0.5
+v 0.5 0.5 -0.5
+v -0.5 0.5 -0.5
+v -0.5 -0.5 0.5
+v 0.5 -0.5 0.5
+v 0.5 0.5 0.5
+v -0.5 0.5 0.5
+vn 0 0 -1
+vn 0 0 1
+vn -1 0 0
+vn 1 0 0
+vn 0 -1 0
+vn 0 1 0
+f 1//1 4//1 3//1 2//1
+f 5//2 6//2 7//2 8//2
+f 1//3 5//3 8//3 4//3
+f 2//4 3//4 7//4 6//4
+f 1//5 2//5 6//5 5//5
+f 4//6 8//6 7//6 3//6
+"""
 
 
 class MeshManager:
@@ -29,6 +82,12 @@ class MeshManager:
     def __init__(self, gl: moderngl.Context) -> None:
         self._gl = gl
         self._meshes: Dict[MeshId, MeshHandle] = {}
+        self._indices: Dict[MeshId, int] = {}
+        self._pending: Set[MeshId] = set()
+        self._placeholder: Optional[MeshHandle] = None
+        # Bumped whenever an existing mesh id gets new geometry; consumers
+        # caching per-mesh data (e.g. BLASes) rebuild when it changes.
+        self.revision = 0
 
         # self._load_engine_defaults()
 
@@ -77,10 +136,41 @@ class MeshManager:
         )
         """
 
+    def reserve(self, mesh_id: MeshId, *, label: str = "") -> MeshHandle:
+        """
+        Register `mesh_id` before its data is available.
+
+        Until `create()` supplies the geometry, the mesh draws as a unit
+        cube placeholder. The returned handle stays valid: `create()` fills
+        it in place.
+        """
+        if mesh_id in self._meshes:
+            raise KeyError(f"Mesh '{mesh_id}' already exists")
+
+        placeholder = self._placeholder_handle()
+        handle = MeshHandle(
+            vbo=placeholder.vbo,
+            ibo=placeholder.ibo,
+            vertex_layout=placeholder.vertex_layout,
+            vao_cache={},
+            label=label or str(mesh_id),
+            data=placeholder.data,
+        )
+        self._meshes[mesh_id] = handle
+        self._indices[mesh_id] = len(self._indices)
+        self._pending.add(mesh_id)
+        return handle
+
+    def is_resident(self, mesh_id: MeshId) -> bool:
+        """True once the mesh's own geometry is on the GPU."""
+        return mesh_id in self._meshes and mesh_id not in self._pending
+
     def create(
         self, mesh_id: MeshId, data: MeshData, *, label: str = ""
     ) -> MeshHandle:
-        """Upload a mesh and store it under mesh_id."""
+        """Upload a mesh and store it under mesh_id (or fill a reservation)."""
+        if mesh_id in self._pending:
+            return self._fill_reservation(mesh_id, data, label)
         if mesh_id in self._meshes:
             raise KeyError(f"Mesh '{mesh_id}' already exists")
 
@@ -100,8 +190,42 @@ class MeshManager:
         )
 
         self._meshes[mesh_id] = handle
+        self._indices[mesh_id] = len(self._indices)
+        return handle
+
+    def _fill_reservation(
+        self, mesh_id: MeshId, data: MeshData, label: str
+    ) -> MeshHandle:
+        handle = self._meshes[mesh_id]
+        for vao in handle.vao_cache.values():
+            vao.release()
+
+        handle.vbo = self._gl.buffer(data.vertices)
+        handle.ibo = self._gl.buffer(data.indices) if data.indices is not None else None
+        handle.vertex_layout = data.vertex_layout
+        handle.vao_cache = {}
+        handle.data = data
+        handle.triangles = handle.blas = None
+        if label:
+            handle.label = label
+
+        self._pending.discard(mesh_id)
+        self.revision += 1
         return handle
 
+    def _placeholder_handle(self) -> MeshHandle:
+        if self._placeholder is None:
+            data = parse_obj(_PLACEHOLDER_OBJ, name="placeholder")
+            self._placeholder = MeshHandle(
+                vbo=self._gl.buffer(data.vertices),
+                ibo=self._gl.buffer(data.indices),
+                vertex_layout=data.vertex_layout,
+                vao_cache={},
+                label="Placeholder",
+                data=data,
+            )
+        return self._placeholder
+
     def get(self, mesh_id: MeshId) -> MeshHandle:
         """Retrieve an existing mesh handle."""
         try:
@@ -109,12 +233,59 @@ class MeshManager:
         except KeyError:
             raise KeyError(f"Mesh '{mesh_id}' not found")
 
+    def index_of(self, mesh_id: MeshId) -> int:
+        """Small stable integer handle of a mesh (creation order)."""
+        try:
+            return self._indices[mesh_id]
+        except KeyError:
+            raise KeyError(f"Mesh '{mesh_id}' not found")
+
+    def triangles(self, mesh_id: MeshId) -> np.ndarray:
+        """
+        Model-space (T, 3, 3) triangle corners, computed once per mesh.
+
+        Triangles are in the leaf order of the mesh's BLAS (see `blas`).
+        """
+        mesh = self.get(mesh_id)
+        if mesh.triangles is None:
+            self._build_blas(mesh)
+        assert mesh.triangles is not None
+        return mesh.triangles
+
+    def blas(self, mesh_id: MeshId) -> Bvh:
+        """
+        Bottom-level BVH over the mesh's model-space triangles.
+
+        Built once per mesh with binned SAH; its leaves index `triangles()`
+        directly (the triangles are stored pre-permuted).
+        """
+        mesh = self.get(mesh_id)
+        if mesh.blas is None:
+            self._build_blas(mesh)
+        assert mesh.blas is not None
+        return mesh.blas
+
+    def _build_blas(self, mesh: MeshHandle) -> None:
+        triangles = mesh_triangles(mesh.data)
+        bvh = build_bvh(*triangle_bounds(triangles))
+        mesh.triangles = np.ascontiguousarray(triangles[bvh.order])
+        mesh.blas = bvh
+
     def vao_for(
-        self, mesh_id: MeshId, program: moderngl.Program
+        self,
+        mesh_id: MeshId,
+        program: moderngl.Program,
+        instances: Optional[InstanceLayout] = None,
     ) -> moderngl.VertexArray:
-        """Create or reuse a VAO for the given mesh and program."""
+        """
+        Create or reuse a VAO for the given mesh and program.
+
+        If `instances` is given, its per-instance attributes are bound after
+        the mesh's vertex attributes. The VAO is cached per instance buffer;
+        call `release_instance_vaos` before that buffer goes away.
+        """
         mesh = self.get(mesh_id)
-        key = id(program)
+        key = (id(program), id(instances.buffer) if instances else 0)
 
         vao = mesh.vao_cache.get(key)
         if vao is not None:
@@ -152,11 +323,29 @@ class MeshManager:
                 f"and program {id(program)}"
             )
 
-        vao = self._gl.vertex_array(program, content)
+        if instances is not None:
+            content.append(
+                (instances.buffer, instances.format, *instances.attributes)
+            )
+
+        vao = self._gl.vertex_array(
+            program,
+            content,
+            index_buffer=mesh.ibo,
+            index_element_size=mesh.data.index_element_size,
+        )
         mesh.vao_cache[key] = vao
         return vao
 
 
+    def release_instance_vaos(self, buffer: moderngl.Buffer) -> None:
+        """Release cached VAOs built against an instance buffer being freed."""
+        key = id(buffer)
+        for mesh in self._meshes.values():
+            for cache_key in [k for k in mesh.vao_cache if k[1] == key]:
+                mesh.vao_cache.pop(cache_key).release()
+
+
 def _format_size(fmt: str) -> int:
     # fmt examples: "3f", "2f", "4i"
     count = int(fmt[:-1])
@@ -170,3 +359,28 @@ def _format_size(fmt: str) -> int:
         return count * 2
 
     raise ValueError(f"Unsupported vertex format: {fmt}")
+
+
+def mesh_triangles(data: MeshData) -> np.ndarray:
+    """
+    Model-space triangle corners of a mesh.
+
+    Positions are the first three floats of each vertex. Index buffers of
+    2 or 4 bytes per element are resolved.
+
+    Returns:
+        (T, 3, 3) float32 array: triangle, corner, xyz.
+    """
+    stride = data.vertex_layout.stride_bytes // 4
+    positions = np.frombuffer(data.vertices, dtype=np.float32).reshape(
+        -1, stride
+    )[:, :3]
+
+    if data.indices is not None:
+        index_dtype = np.uint16 if data.index_element_size == 2 else np.uint32
+        indices = np.frombuffer(data.indices, dtype=index_dtype)
+        corners = positions[indices[: len(indices) // 3 * 3]]
+    else:
+        corners = positions[: len(positions) // 3 * 3]
+
+    return np.ascontiguousarray(corners.reshape(-1, 3, 3), dtype=np.float32)
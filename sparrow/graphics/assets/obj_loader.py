@@ -1,125 +1,340 @@
 # sparrow/graphics/assets/obj_loader.py
 from __future__ import annotations
 
-import struct
-from typing import List, Tuple
+import hashlib
+import re
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
+from sparrow.graphics.assets.mesh_cache import load_cached_mesh, store_cached_mesh
 from sparrow.graphics.assets.types import MeshData, VertexLayout
 
+_LAYOUT = VertexLayout(
+    attributes=["in_pos", "in_normal", "in_uv"],
+    format="3f 3f 2f",
+    stride_bytes=32,
+)
+
+
+_TAGS = (b"v", b"vt", b"vn", b"f")
+
+
+@dataclass(frozen=True, slots=True)
+class _Block:
+    """The lines of one OBJ tag, without the tag."""
+
+    payload: bytes  # line bodies, each ending in b"\n"
+    line_numbers: np.ndarray  # where each line sits in the file
+
+    def __len__(self) -> int:
+        return len(self.line_numbers)
+
+    def lines(self) -> List[bytes]:
+        return self.payload.split(b"\n")[:-1]
 
-def load_obj(path: str) -> MeshData:
+
+def load_obj(path: str, *, cache_dir: Optional[str] = None) -> MeshData:
     """
     Load a Wavefront OBJ file into MeshData.
 
     Supported:
-      - v, vn, vt
-      - triangular faces only
-      - flat-expanded vertex buffer (no index buffer)
+      - v, vn, vt (extra columns such as w or vertex colors are ignored)
+      - faces with any number of corners (fan-triangulated), including
+        negative (relative) indices
+      - indexed output: identical (position, normal, uv) corners share one
+        vertex; indices are uint16 when they fit, uint32 otherwise
+
+    Args:
+        path: OBJ file to load.
+        cache_dir: If set, the parsed mesh is stored there and later loads
+            of the unchanged file memory-map it instead of parsing.
 
     Raises:
         ValueError: on unsupported or malformed input.
     """
-    positions: List[Tuple[float, float, float]] = []
-    normals: List[Tuple[float, float, float]] = []
-    uvs: List[Tuple[float, float]] = []
-    vertices: List[bytes] = []
-
-    min_x = min_y = min_z = float("inf")
-    max_x = max_y = max_z = float("-inf")
-
-    with open(path, "r") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-
-            parts = line.split()
-            tag = parts[0]
-
-            if tag == "v":
-                px, py, pz = map(float, parts[1:4])
-                positions.append((px, py, pz))
-
-                if px < min_x:
-                    min_x = px
-                if px > max_x:
-                    max_x = px
-                if py < min_y:
-                    min_y = py
-                if py > max_y:
-                    max_y = py
-                if pz < min_z:
-                    min_z = pz
-                if pz > max_z:
-                    max_z = pz
-
-            elif tag == "vn":
-                nx, ny, nz = map(float, parts[1:4])
-                normals.append((nx, ny, nz))
-
-            elif tag == "vt":
-                u, v = map(float, parts[1:3])
-                uvs.append((u, v))
-
-            elif tag == "f":
-                if len(parts) != 4:
-                    raise ValueError("Only triangular faces are supported")
-
-                for vert in parts[1:4]:
-                    v_idx, vt_idx, vn_idx = _parse_face_vertex(vert)
-                    px, py, pz = positions[v_idx]
-
-                    nx, ny, nz = (
-                        normals[vn_idx]
-                        if vn_idx is not None
-                        else (0.0, 1.0, 0.0)
-                    )
-                    u, v = uvs[vt_idx] if vt_idx is not None else (0.0, 0.0)
-
-                    vertices.append(
-                        struct.pack("<3f 3f 2f", px, py, pz, nx, ny, nz, u, v)
-                    )
-
-        if not vertices:
-            raise ValueError(f"No geometry found in OBJ: {path}")
-
-        vertex_blob = b"".join(vertices)
-        stride = struct.calcsize("<3f3f2f")
-
-        layout = VertexLayout(
-            attributes=["in_pos", "in_normal", "in_uv"],
-            format="3f 3f 2f",
-            stride_bytes=stride,
-        )
+    if cache_dir is not None:
+        cached = load_cached_mesh(path, cache_dir)
+        if cached is not None:
+            return cached
+
+    text = Path(path).read_bytes()
+    data = parse_obj(text, name=path)
+
+    if cache_dir is not None:
+        digest = hashlib.sha256(text).hexdigest()
+        store_cached_mesh(path, cache_dir, data, digest=digest)
+    return data
+
+
+def parse_obj(text: bytes, *, name: str = "<obj>") -> MeshData:
+    """Parse OBJ source text; see `load_obj()`."""
+    blocks = _split_blocks(text)
+    if not len(blocks[b"v"]) or not len(blocks[b"f"]):
+        raise ValueError(f"No geometry found in OBJ: {name}")
+
+    # Bounds come from the full-precision values.
+    positions = _parse_floats(blocks[b"v"], 3, name, dtype=np.float64)
+    aabb = (
+        tuple(float(x) for x in positions.min(axis=0)),
+        tuple(float(x) for x in positions.max(axis=0)),
+    )
+    positions = positions.astype(np.float32)
+    uvs = _parse_floats(blocks[b"vt"], 2, name)
+    normals = _parse_floats(blocks[b"vn"], 3, name)
+
+    counts, columns = _parse_faces(blocks[b"f"], name)
+    if np.any(counts < 3):
+        raise ValueError(f"Face with fewer than 3 vertices in OBJ: {name}")
+    if np.any(columns[0] == 0):
+        raise ValueError(f"Face corner without a position in OBJ: {name}")
+
+    tables = (positions, uvs, normals)
+    v_idx, vt_idx, vn_idx = (
+        _zero_based(column, blocks[tag], blocks[b"f"], counts, len(table), name)
+        for column, tag, table in zip(columns, _TAGS, tables)
+    )
+
+    corners = _triangulate(counts)
+    vertices, indices = _deduplicate(
+        positions, normals, uvs, v_idx[corners], vt_idx[corners], vn_idx[corners]
+    )
+
+    # 0xFFFF is the fixed primitive-restart index, so it stays unused.
+    index_dtype = np.uint16 if len(vertices) < 0xFFFF else np.uint32
+
+    return MeshData(
+        vertices=vertices.tobytes(),
+        indices=indices.astype(index_dtype).tobytes(),
+        vertex_layout=_LAYOUT,
+        aabb=aabb,
+        index_element_size=np.dtype(index_dtype).itemsize,
+    )
+
+
+def _split_blocks(text: bytes) -> Dict[bytes, _Block]:
+    """
+    Gather the v, vt, vn and f lines without a per-line Python loop.
+
+    Lines are classified by their first bytes. Each tag's lines are cut out
+    of the file as runs of consecutive lines, then the tags are stripped.
+    """
+    if not text.endswith(b"\n"):
+        text += b"\n"
+
+    buf = np.frombuffer(text, dtype=np.uint8)
+    ends = np.flatnonzero(buf == ord("\n"))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    padded = np.concatenate((buf, np.zeros(3, dtype=np.uint8)))
+
+    first = padded[starts]
+    if np.any((first == ord(" ")) | (first == ord("\t"))):
+        return _split_blocks(re.sub(rb"^[ \t]+", b"", text, flags=re.MULTILINE))
+
+    kind = np.zeros(len(starts), dtype=np.int8)
+    for code, tag in enumerate(_TAGS, start=1):
+        after = padded[starts + len(tag)]
+        match = (after == ord(" ")) | (after == ord("\t"))
+        for i, char in enumerate(tag):
+            match &= padded[starts + i] == char
+        kind[match] = code
 
-        return MeshData(
-            vertices=vertex_blob,
-            indices=None,
-            vertex_layout=layout,
-            aabb=((min_x, min_y, min_z), (max_x, max_y, max_z)),
+    change = np.flatnonzero(np.diff(kind)) + 1
+    run_first = np.concatenate(([0], change))
+    run_last = np.concatenate((change, [len(kind)])) - 1
+
+    blocks: Dict[bytes, _Block] = {}
+    for code, tag in enumerate(_TAGS, start=1):
+        runs = kind[run_first] == code
+        body = b"\n" + b"".join(
+            text[starts[a] : ends[b] + 1]
+            for a, b in zip(run_first[runs], run_last[runs])
         )
+        for sep in (b" ", b"\t"):
+            body = body.replace(b"\n" + tag + sep, b"\n" + sep)
+        blocks[tag] = _Block(body[1:], np.flatnonzero(kind == code))
+    return blocks
+
+
+def _fromstring(payload: bytes, dtype: type) -> Optional[np.ndarray]:
+    """Whitespace-separated numbers, or None if some token is not one."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return np.fromstring(payload, dtype=dtype, sep=" ")
+        except (ValueError, DeprecationWarning):
+            return None
+
+
+def _parse_floats(
+    block: _Block, width: int, name: str, dtype: type = np.float32
+) -> np.ndarray:
+    """First `width` numbers of each line, as an (N, width) array."""
+    if not len(block):
+        return np.zeros((0, width), dtype=dtype)
+
+    columns = len(block.payload[: block.payload.index(b"\n")].split())
+    values = _fromstring(block.payload, dtype)
+    if (
+        values is not None
+        and columns >= width
+        and values.size == len(block) * columns
+    ):
+        return np.ascontiguousarray(values.reshape(-1, columns)[:, :width])
+
+    # Ragged rows (e.g. an optional w on some vertices).
+    try:
+        rows = [[float(x) for x in line.split()[:width]] for line in block.lines()]
+        return np.array(rows, dtype=dtype).reshape(-1, width)
+    except ValueError:
+        raise ValueError(f"Malformed vertex data in OBJ: {name}") from None
+
+
+def _parse_faces(
+    block: _Block, name: str
+) -> Tuple[np.ndarray, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Parse face lines into per-face corner counts and per-corner v/vt/vn.
+
+    Indices stay as written (1-based, negative = relative); 0 marks a
+    missing element.
+    """
+    payload = block.payload
+    counts = _tokens_per_line(payload, len(block))
+    n = int(counts.sum())
+    if n == 0:
+        return counts, (np.zeros(0, dtype=np.int64),) * 3
+
+    # Fast path: every corner is written like the first one.
+    first = payload.split(None, 1)[0]
+    slashes = first.count(b"/")
+    double = b"//" in first
+    if payload.count(b"/") == n * slashes and payload.count(b"//") == n * double:
+        flat = _fromstring(payload.replace(b"/", b" "), np.int64)
+        fields = slashes + 1 - double
+        if flat is not None and flat.size == n * fields:
+            flat = flat.reshape(n, fields)
+            missing = np.zeros(n, dtype=np.int64)
+            v = flat[:, 0]
+            vt = flat[:, 1] if slashes >= 1 and not double else missing
+            vn = flat[:, -1] if slashes == 2 else missing
+            return counts, (v, vt, vn)
+
+    out = np.zeros((n, 3), dtype=np.int64)
+    try:
+        for i, token in enumerate(payload.split()):
+            for j, part in enumerate(token.split(b"/")[:3]):
+                if part:
+                    out[i, j] = int(part)
+    except ValueError:
+        raise ValueError(f"Malformed face in OBJ: {name}") from None
+    return counts, (out[:, 0], out[:, 1], out[:, 2])
 
 
-def _parse_index(val: str) -> int | None:
+def _tokens_per_line(payload: bytes, lines: int) -> np.ndarray:
+    buf = np.frombuffer(payload, dtype=np.uint8)
+    newline = buf == ord("\n")
+    space = newline | (buf == ord(" ")) | (buf == ord("\t")) | (buf == ord("\r"))
+    starts = ~space
+    starts[1:] &= space[:-1]
+    line_of = np.searchsorted(np.flatnonzero(newline), np.flatnonzero(starts))
+    return np.bincount(line_of, minlength=lines)
+
+
+def _zero_based(
+    idx: np.ndarray,
+    elements: _Block,
+    faces: _Block,
+    counts: np.ndarray,
+    size: int,
+    name: str,
+) -> np.ndarray:
     """
-    If positive, convert 1-based to 0-based.
-    If negative, keep as is (Python handles relative indexing natively).
+    Resolve written indices to 0-based ones; missing (0) becomes -1.
+
+    Negative indices count back from the last element defined above the
+    face.
     """
-    if not val:
-        return None
-    idx = int(val)
-    return idx - 1 if idx > 0 else idx
+    negative = idx < 0
+    if negative.any():
+        above = np.searchsorted(elements.line_numbers, faces.line_numbers)
+        idx = idx.copy()
+        idx[negative] += np.repeat(above, counts)[negative] + 1
+
+    if idx.size and (idx.max() > size or idx.min() < 0):
+        raise ValueError(f"Face references a missing element in OBJ: {name}")
+    return idx - 1
+
+
+def _triangulate(counts: np.ndarray) -> np.ndarray:
+    """Fan-triangulate faces; returns corner indices, three per triangle."""
+    face_start = np.cumsum(counts) - counts
+    tris = counts - 2
+    face = np.repeat(np.arange(len(counts)), tris)
+    fan = np.arange(len(face)) - np.repeat(np.cumsum(tris) - tris, tris) + 1
+
+    a = face_start[face]
+    b = a + fan
+    return np.stack([a, b, b + 1], axis=1).ravel()
 
 
-def _parse_face_vertex(token: str) -> Tuple[int, int | None, int | None]:
+def _deduplicate(
+    positions: np.ndarray,
+    normals: np.ndarray,
+    uvs: np.ndarray,
+    v: np.ndarray,
+    vt: np.ndarray,
+    vn: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
     """
-    Parse a face vertex token: v/vt/vn or v//vn or v/vt
-    OBJ indices are 1-based.
+    Build the unique vertex buffer and the index buffer for corners.
+
+    Corners are merged by their index triple first, then by value; vertices
+    keep the order in which they first occur.
     """
-    parts = token.split("/")
+    n_vt, n_vn = len(uvs) + 1, len(normals) + 1
+    if len(positions) * n_vt * n_vn < 2**62:
+        key = (v * n_vt + (vt + 1)) * n_vn + (vn + 1)
+        first, inverse = _unique_in_order(key)
+    else:
+        first, inverse = _unique_in_order(np.stack([v, vt, vn], axis=1))
+
+    v, vt, vn = v[first], vt[first], vn[first]
+    rows = np.zeros((len(first), 8), dtype=np.float32)
+    rows[:, 0:3] = positions[v]
+    rows[:, 3:6] = _gather(normals, vn, (0.0, 1.0, 0.0))
+    rows[:, 6:8] = _gather(uvs, vt, (0.0, 0.0))
+
+    by_value = rows.view(np.dtype((np.void, rows.itemsize * 8))).ravel()
+    value_first, value_inverse = _unique_in_order(by_value)
+    return rows[value_first], value_inverse[inverse]
+
 
-    v = _parse_index(parts[0])
-    vt = _parse_index(parts[1]) if len(parts) > 1 and parts[1] else None
-    vn = _parse_index(parts[2]) if len(parts) > 2 and parts[2] else None
+def _gather(
+    table: np.ndarray, idx: np.ndarray, default: Tuple[float, ...]
+) -> np.ndarray:
+    """Rows of `table` at `idx`, or `default` where idx is -1 (missing)."""
+    out = np.empty((len(idx), len(default)), dtype=np.float32)
+    out[:] = default
+    present = idx >= 0
+    out[present] = table[idx[present]]
+    return out
 
-    return v, vt, vn
+
+def _unique_in_order(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns:
+        (first, inverse): index of each unique key's first occurrence, in
+        order of appearance, and the position of every key in that list.
+    """
+    axis = 0 if keys.ndim > 1 else None
+    _, first, inverse = np.unique(
+        keys, return_index=True, return_inverse=True, axis=axis
+    )
+    order = np.argsort(first, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return first[order], rank[inverse.ravel()]
@@ -0,0 +1,278 @@
+# sparrow/graphics/assets/streaming.py
+from __future__ import annotations
+
+import queue
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Deque, Optional, Union
+
+import numpy as np
+
+from sparrow.graphics.assets.image_loader import (
+    DecodedTexture,
+    Pixels,
+    decode_texture,
+)
+from sparrow.graphics.assets.mesh_manager import MeshManager
+from sparrow.graphics.assets.obj_loader import load_obj
+from sparrow.graphics.assets.texture_manager import TextureManager
+from sparrow.graphics.assets.types import MeshData
+from sparrow.graphics.renderer.settings import AssetStreamingSettings
+from sparrow.graphics.util.ids import MeshId, TextureId
+
+
+class AssetState(str, Enum):
+    """Lifecycle of a background load."""
+
+    PENDING = "pending"  # decoding, or waiting for its upload
+    RESIDENT = "resident"
+    FAILED = "failed"  # the placeholder stays in place
+
+
+@dataclass(slots=True)
+class AssetRequest:
+    """
+    Handle of a background load, returned immediately.
+
+    `state` and `error` are only updated on the main thread, by
+    `AssetLoader.pump()`.
+    """
+
+    asset_id: str
+    label: str
+    state: AssetState = AssetState.PENDING
+    error: Optional[BaseException] = None
+
+    @property
+    def done(self) -> bool:
+        return self.state is not AssetState.PENDING
+
+
+Decoded = Union[MeshData, DecodedTexture]
+
+
+_PAGE = 4096
+
+
+def _fault_in(buffer: Pixels) -> None:
+    """
+    Touch every page of a memory-mapped buffer without copying it.
+
+    Reading one byte per page makes the kernel load the file here, on the
+    worker, instead of stalling the GL thread during the upload.
+    """
+    if isinstance(buffer, memoryview):
+        np.frombuffer(buffer, dtype=np.uint8)[::_PAGE].sum()
+
+
+def _read_texture(path: str, cache_dir: Optional[str], mips: bool) -> DecodedTexture:
+    image = decode_texture(path, cache_dir=cache_dir, mips=mips)
+    for level in (image.data, *image.mips):
+        _fault_in(level)
+    return image
+
+
+def _read_mesh(path: str, cache_dir: Optional[str]) -> MeshData:
+    data = load_obj(path, cache_dir=cache_dir)
+    _fault_in(data.vertices)
+    if data.indices is not None:
+        _fault_in(data.indices)
+    return data
+
+
+@dataclass(slots=True)
+class _Job:
+    request: AssetRequest
+    future: Future[Decoded]
+    upload: Callable[[Decoded], None]
+
+
+class AssetLoader:
+    """
+    Loads meshes and textures without stalling the main thread.
+
+    `load_mesh()` / `load_texture()` reserve the id in its manager, so it
+    renders as a placeholder right away, and parse or decode the file on a
+    worker thread. `pump()`, called once per frame on the GL thread, uploads
+    finished assets within the frame's upload budget.
+    """
+
+    def __init__(
+        self,
+        meshes: MeshManager,
+        textures: TextureManager,
+        settings: AssetStreamingSettings = AssetStreamingSettings(),
+    ) -> None:
+        self._meshes = meshes
+        self._textures = textures
+        self._settings = settings
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.workers, thread_name_prefix="asset-load"
+        )
+        # Jobs whose decode finished, in completion order.
+        self._finished: queue.SimpleQueue[_Job] = queue.SimpleQueue()
+        self._ready: Deque[_Job] = deque()
+        self._in_flight = 0
+
+    @property
+    def pending(self) -> int:
+        """Loads not yet resident or failed."""
+        return self._in_flight
+
+    def load_mesh(
+        self,
+        mesh_id: MeshId,
+        path: str,
+        *,
+        label: str = "",
+        cache_dir: Optional[str] = None,
+    ) -> AssetRequest:
+        """
+        Load an OBJ file in the background.
+
+        Args:
+            cache_dir: Binary import cache, see `load_obj`.
+
+        Raises:
+            KeyError: If the mesh id is already taken.
+        """
+        self._meshes.reserve(mesh_id, label=label)
+
+        def upload(data: Decoded) -> None:
+            assert isinstance(data, MeshData)
+            self._meshes.create(mesh_id, data, label=label)
+
+        return self._submit(
+            AssetRequest(str(mesh_id), label or path),
+            upload,
+            _read_mesh,
+            path,
+            cache_dir,
+        )
+
+    def load_texture(
+        self, tex_id: TextureId, path: str, *, label: str = "", mips: bool = False
+    ) -> AssetRequest:
+        """
+        Load an image file in the background as a mipmapped RGBA8 texture.
+
+        Decoded pixels are cached in `settings.texture_cache_dir`, if set.
+
+        Args:
+            mips: Build the mip chain on the CPU, in linear light, instead
+                of with the driver's filter.
+
+        Raises:
+            KeyError: If the texture id is already taken.
+        """
+        self._textures.reserve(tex_id, label=label)
+
+        def upload(image: Decoded) -> None:
+            assert isinstance(image, DecodedTexture)
+            self._textures.create_from_bytes(
+                tex_id,
+                data=image.data,
+                width=image.width,
+                height=image.height,
+                components=4,
+                dtype="f1",
+                label=label,
+                mips=image.mips,
+            )
+
+        return self._submit(
+            AssetRequest(str(tex_id), label or path),
+            upload,
+            _read_texture,
+            path,
+            self._settings.texture_cache_dir,
+            mips,
+        )
+
+    def pump(self) -> int:
+        """
+        Upload finished assets within this frame's budget.
+
+        Must run on the thread owning the GL context.
+
+        Returns:
+            The number of assets that became resident or failed.
+        """
+        while True:
+            try:
+                self._ready.append(self._finished.get_nowait())
+            except queue.Empty:
+                break
+
+        budget = self._settings
+        deadline = time.perf_counter() + budget.upload_ms_per_frame / 1000.0
+        uploaded_bytes = 0
+        completed = 0
+        while self._ready:
+            job = self._ready[0]
+            size = _size_of(job.future)
+            if completed and (
+                uploaded_bytes + size > budget.upload_bytes_per_frame
+                or time.perf_counter() >= deadline
+            ):
+                break
+
+            self._ready.popleft()
+            self._complete(job)
+            uploaded_bytes += size
+            completed += 1
+        return completed
+
+    def flush(self) -> None:
+        """Wait for every queued load and upload it now, ignoring the budget."""
+        while True:
+            # Jobs a budget-limited pump() left behind first; they no
+            # longer come through `_finished`.
+            while self._ready:
+                self._complete(self._ready.popleft())
+            if not self._in_flight:
+                return
+            self._ready.append(self._finished.get())
+
+    def shutdown(self) -> None:
+        """Cancel queued decodes; already-resident assets are unaffected."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._ready.clear()
+
+    def _submit(
+        self,
+        request: AssetRequest,
+        upload: Callable[[Decoded], None],
+        decode: Callable[..., Decoded],
+        *args: object,
+    ) -> AssetRequest:
+        future = self._executor.submit(decode, *args)
+        job = _Job(request, future, upload)
+        future.add_done_callback(lambda _: self._finished.put(job))
+        self._in_flight += 1
+        return request
+
+    def _complete(self, job: _Job) -> None:
+        request = job.request
+        self._in_flight -= 1
+        try:
+            job.upload(job.future.result())
+        except Exception as exc:
+            request.state = AssetState.FAILED
+            request.error = exc
+            return
+        request.state = AssetState.RESIDENT
+
+
+def _size_of(future: Future[Decoded]) -> int:
+    """Bytes an upload will move; 0 for failed decodes."""
+    if future.cancelled() or future.exception() is not None:
+        return 0
+    result = future.result()
+    if isinstance(result, DecodedTexture):
+        return len(result.data) + sum(len(m) for m in result.mips)
+    indices = len(result.indices) if result.indices is not None else 0
+    return len(result.vertices) + indices
@@ -0,0 +1,91 @@
+# sparrow/graphics/assets/texture_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sparrow.graphics.util.blob_file import (
+    Buffer,
+    current_stamp,
+    read_blob_file,
+    source_stamp,
+    write_blob_file,
+)
+
+# Blobs: one per mip level, base level first.
+_MAGIC = b"SPRTEX02"
+
+Level = Tuple[Buffer, int, int]  # pixels, width, height
+
+
+def _cache_file(
+    path: str | Path, cache_dir: str | Path, settings: Dict[str, Any]
+) -> Path:
+    key = json.dumps([str(Path(path).resolve()), settings], sort_keys=True)
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return Path(cache_dir) / f"{digest[:32]}.tex"
+
+
+def load_cached_texture(
+    path: str | Path, cache_dir: str | Path, settings: Dict[str, Any]
+) -> Optional[List[Level]]:
+    """
+    Memory-map the cached decode of `path` under import `settings`.
+
+    Freshness is decided by `current_stamp`.
+
+    Returns:
+        (pixels, width, height) per mip level, base level first, whose
+        pixels view the mapped file; or None on a miss.
+    """
+    entry = read_blob_file(_cache_file(path, cache_dir, settings), _MAGIC)
+    if entry is None:
+        return None
+    header, blobs = entry
+    if header.get("settings") != settings:
+        return None
+    stamp = current_stamp(header, path)
+    if stamp is None:
+        return None
+
+    levels = [(pixels, w, h) for pixels, (w, h) in zip(blobs, header["sizes"])]
+    if stamp["mtime_ns"] != header["mtime_ns"]:
+        # Same content under a new mtime: refresh the stamp.
+        store_cached_texture(
+            path, cache_dir, settings, levels, digest=stamp["sha256"]
+        )
+    return levels
+
+
+def store_cached_texture(
+    path: str | Path,
+    cache_dir: str | Path,
+    settings: Dict[str, Any],
+    levels: Sequence[Level],
+    *,
+    digest: Optional[str] = None,
+) -> None:
+    """
+    Write decoded `levels` (pixels, width, height) as the cache of `path`.
+
+    Failures to write are ignored; the cache is an optimization.
+    """
+    try:
+        stamp = source_stamp(path, digest=digest)
+    except OSError:
+        return
+
+    header = {
+        "source": str(path),
+        **stamp,
+        "settings": settings,
+        "sizes": [[w, h] for _, w, h in levels],
+    }
+    write_blob_file(
+        _cache_file(path, cache_dir, settings),
+        _MAGIC,
+        header,
+        [pixels for pixels, _, _ in levels],
+    )
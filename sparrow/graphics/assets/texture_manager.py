@@ -2,14 +2,27 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import Any, Dict, List, Optional, Sequence, Set
 
 import moderngl
-from PIL import Image
 
-from sparrow.graphics.helpers.spectral_sky import generate_spectral_sky_lut
+from sparrow.graphics.assets.atlas import TextureAtlas
+from sparrow.graphics.assets.image_loader import Pixels, decode_texture
+from sparrow.graphics.helpers.sky_lut_cache import SkyLutCache
 from sparrow.graphics.util.ids import TextureId
 
+SKY_LUT_ID = TextureId("engine.sky_lut")
+
+# `generate_spectral_sky_lut` arguments of the engine's default sky.
+_SKY_LUT_DEFAULTS = dict(
+    width=512,
+    height=256,
+    altitude=150,
+    sun_intensity=50.0,
+    sun_elevation=15.0,
+    sun_rotation=0.0,
+)
+
 
 @dataclass(slots=True)
 class TextureHandle:
@@ -22,33 +35,31 @@ class TextureHandle:
 class TextureManager:
     """Creates and caches textures and cubemaps."""
 
-    def __init__(self, gl: moderngl.Context) -> None:
+    def __init__(
+        self,
+        gl: moderngl.Context,
+        *,
+        cache_dir: Optional[str] = None,
+        sky_luts: Optional[SkyLutCache] = None,
+    ) -> None:
+        """
+        Args:
+            cache_dir: Decoded-texture cache for the engine defaults, see
+                `decode_texture`.
+            sky_luts: Generates `SKY_LUT_ID`'s pixels; an in-memory cache
+                if None.
+        """
         self._gl = gl
+        self._cache_dir = cache_dir
+        self._sky_luts = sky_luts if sky_luts is not None else SkyLutCache()
         self._textures: Dict[TextureId, TextureHandle] = {}
+        self._pending: Set[TextureId] = set()
+        self._placeholder: Optional[moderngl.Texture] = None
 
         self._load_engine_defaults()
 
     def _load_engine_defaults(self) -> None:
         """
-        sky_data = generate_spectral_sky_lut(
-            width=512,
-            height=256,
-            altitude=150,
-            sun_intensity=50.0,
-            sun_elevation=15.0,
-            sun_rotation=0.0,
-        )
-
-        self.create_from_bytes(
-            TextureId("engine.sky_lut"),
-            data=sky_data,
-            width=512,
-            height=256,
-            components=4,
-            dtype="f4",
-            label="Default Sky LUT",
-        )
-
         img = Image.open(
             "sparrow/graphics/assets/defaults/textures/pupil_diffraction.png"
         ).convert("RGBA")
@@ -63,13 +74,14 @@ class TextureManager:
             label="Pupil Aperture",
         )
         """
-        img = Image.open(
-            "sparrow/graphics/assets/defaults/textures/splashscreen.png"
-        ).convert("RGBA")
+        img = decode_texture(
+            "sparrow/graphics/assets/defaults/textures/splashscreen.png",
+            cache_dir=self._cache_dir,
+        )
 
         self.create_from_bytes(
             tex_id=TextureId("engine.splashscreen"),
-            data=img.tobytes(),
+            data=img.data,
             width=img.width,
             height=img.height,
             components=4,
@@ -77,18 +89,69 @@ class TextureManager:
             label="Pupil Aperture",
         )
 
+    def sky_lut(self) -> TextureHandle:
+        """The `SKY_LUT_ID` texture, generated with the default sky on first use."""
+        if SKY_LUT_ID in self._textures:
+            return self._textures[SKY_LUT_ID]
+        return self.update_sky_lut()
+
+    def update_sky_lut(self, **params: Any) -> TextureHandle:
+        """
+        Regenerate `SKY_LUT_ID` from the engine's default sky plus `params`.
+
+        The pixels come from the sky LUT cache, so time-of-day changes that
+        revisit a sun position skip the ray march. A LUT of the same size is
+        written into the existing texture; otherwise the handle is pointed
+        at a new one.
+
+        Args:
+            params: `generate_spectral_sky_lut` arguments.
+        """
+        params = {**_SKY_LUT_DEFAULTS, **params}
+        width, height = params["width"], params["height"]
+        data = self._sky_luts.spectral(**params)
+
+        handle = self._textures.get(SKY_LUT_ID)
+        if handle is not None and tuple(handle.texture.size) == (width, height):
+            handle.texture.write(data)
+            handle.texture.build_mipmaps()
+            return handle
+
+        previous = handle.texture if handle is not None else None
+        if handle is not None:
+            self._pending.add(SKY_LUT_ID)
+        handle = self.create_from_bytes(
+            SKY_LUT_ID,
+            data=data,
+            width=width,
+            height=height,
+            components=4,
+            dtype="f4",
+            label="Default Sky LUT",
+        )
+        if previous is not None and previous is not self._placeholder:
+            previous.release()
+        return handle
+
     def create_from_bytes(
         self,
         tex_id: TextureId,
         *,
-        data: bytes,
+        data: Pixels,
         width: int,
         height: int,
         components: int,
         dtype: str,
         label: str = "",
+        mips: Sequence[Pixels] = (),
     ) -> TextureHandle:
-        if tex_id in self._textures:
+        """
+        Upload a mipmapped 2D texture (or fill a `reserve()`d one).
+
+        Args:
+            mips: Prebuilt levels 1..n; the driver builds the chain if empty.
+        """
+        if tex_id in self._textures and tex_id not in self._pending:
             raise KeyError(f"Texture '{tex_id}' already exists")
 
         texture = self._gl.texture(
@@ -98,14 +161,78 @@ class TextureManager:
         texture.repeat_x = False
         texture.repeat_y = False
 
-        texture.build_mipmaps()
+        if mips:
+            # Allocate the chain, then overwrite it with the prebuilt levels.
+            texture.build_mipmaps(max_level=len(mips))
+            for level, pixels in enumerate(mips, start=1):
+                texture.write(pixels, level=level)
+        else:
+            texture.build_mipmaps()
 
         texture.filter = (moderngl.LINEAR_MIPMAP_LINEAR, moderngl.LINEAR)
 
+        if tex_id in self._pending:
+            # Holders of the reserved handle see the real texture from now on.
+            self._pending.discard(tex_id)
+            handle = self._textures[tex_id]
+            handle.texture = texture
+            if label:
+                handle.label = label
+            return handle
+
         handle = TextureHandle(texture=texture, label=label or str(tex_id))
         self._textures[tex_id] = handle
         return handle
 
+    def reserve(self, tex_id: TextureId, *, label: str = "") -> TextureHandle:
+        """
+        Register `tex_id` before its pixels are available.
+
+        The handle samples a 1x1 mid-grey placeholder until
+        `create_from_bytes()` fills it in place.
+        """
+        if tex_id in self._textures:
+            raise KeyError(f"Texture '{tex_id}' already exists")
+
+        if self._placeholder is None:
+            self._placeholder = self._gl.texture((1, 1), 4, data=bytes((128,) * 4))
+
+        handle = TextureHandle(texture=self._placeholder, label=label or str(tex_id))
+        self._textures[tex_id] = handle
+        self._pending.add(tex_id)
+        return handle
+
+    def is_resident(self, tex_id: TextureId) -> bool:
+        """True once the texture's own pixels are on the GPU."""
+        return tex_id in self._textures and tex_id not in self._pending
+
+    def create_atlas(self, atlas: TextureAtlas) -> List[TextureHandle]:
+        """
+        Upload each atlas page as `atlas.page_id(n)`.
+
+        The mip chain stops at `atlas.mip_levels`; deeper levels would blend
+        neighbouring images.
+        """
+        handles = []
+        width, height = atlas.page_size
+        for page, pixels in enumerate(atlas.pages):
+            tex_id = atlas.page_id(page)
+            if tex_id in self._textures:
+                raise KeyError(f"Texture '{tex_id}' already exists")
+
+            texture = self._gl.texture((width, height), 4, data=pixels.tobytes())
+            texture.repeat_x = False
+            texture.repeat_y = False
+            texture.build_mipmaps(max_level=atlas.mip_levels)
+            texture.filter = (moderngl.LINEAR_MIPMAP_LINEAR, moderngl.LINEAR)
+
+            handle = TextureHandle(
+                texture=texture, label=f"Atlas {atlas.name} page {page}"
+            )
+            self._textures[tex_id] = handle
+            handles.append(handle)
+        return handles
+
     def create_2d(
         self,
         tex_id: TextureId,
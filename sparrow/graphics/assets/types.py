@@ -18,8 +18,9 @@ class VertexLayout:
 class MeshData:
     """CPU-side mesh payload used to create GPU buffers."""
 
-    vertices: bytes
-    indices: Optional[bytes]
+    # memoryviews when mapped from the mesh import cache (assets.mesh_cache)
+    vertices: bytes | memoryview
+    indices: Optional[bytes | memoryview]
     vertex_layout: VertexLayout
     aabb: Tuple[Tuple[float, float, float], Tuple[float, float, float]]
     index_element_size: int = 4  # bytes (2 or 4)
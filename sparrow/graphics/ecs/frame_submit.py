@@ -6,8 +6,22 @@ from typing import Mapping, Optional, Sequence
 
 import numpy as np
 
+from sparrow.graphics.ecs.polygon_shapes import PolygonShapes
 from sparrow.types import Vector2
 
+# Per-instance polygon record, streamed to the GPU as-is. `affine` holds
+# the two rows of the 2D model transform (x' = a*x + b*y + tx, ...),
+# `shape` indexes RenderFrameInput.polygon_shapes.
+POLYGON_INSTANCE_DTYPE = np.dtype(
+    [
+        ("affine", "f4", (2, 3)),
+        ("color", "f4", (4,)),
+        ("width", "f4"),
+        ("shape", "i4"),
+        ("layer", "i4"),
+    ]
+)
+
 
 @dataclass(frozen=True, slots=True)
 class CameraData:
@@ -46,6 +60,7 @@ class DrawItem:
     model: np.ndarray  # model transform matrix (4,4)
     entity_id: int
     sort_key: int = 0  # optional packed sort key
+    instance: int = -1  # slot in the persistent instance buffer, -1 if none
 
 
 @dataclass(frozen=True, slots=True)
@@ -63,6 +78,27 @@ class PolygonDrawItem:
     layer: int = 0
 
 
+@dataclass(frozen=True, slots=True)
+class InstanceUpdate:
+    """
+    Incremental update of the persistent per-instance model matrices.
+
+    `models` holds one matrix per instance slot (see DrawItem.instance).
+    Only the half-open slot ranges in `dirty` changed since the update
+    numbered `base_sequence`; a consumer that did not apply that update
+    must treat every slot as dirty.
+    """
+
+    sequence: int
+    base_sequence: int
+    models: np.ndarray  # (count, 4, 4) float32
+    dirty: Sequence[tuple[int, int]]
+
+    @property
+    def count(self) -> int:
+        return len(self.models)
+
+
 @dataclass(frozen=True, slots=True)
 class RenderFrameInput:
     """All inputs needed to render a frame."""
@@ -73,6 +109,11 @@ class RenderFrameInput:
     draws: Sequence[DrawItem]
     point_lights: Sequence[LightPoint]
     polygons: Sequence[PolygonDrawItem] = tuple()
+    polygon_bounds: Optional[np.ndarray] = None  # (N, 4) cx, cy, radius, width
+    polygon_instances: Optional[np.ndarray] = None  # (N,) POLYGON_INSTANCE_DTYPE
+    polygon_shapes: Optional[PolygonShapes] = None
+    instances: Optional[InstanceUpdate] = None
+    draw_sort_keys: Optional[np.ndarray] = None  # (N,) uint64, set when sorted
     debug_flags: Optional[Mapping[str, bool]] = None
     viewport_width: Optional[int] = None
     viewport_height: Optional[int] = None
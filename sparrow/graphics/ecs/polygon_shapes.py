@@ -0,0 +1,207 @@
+# sparrow/graphics/ecs/polygon_shapes.py
+from __future__ import annotations
+
+import bisect
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from sparrow.types import Vector2
+
+_Key = Tuple[bool, Tuple[float, ...]]
+
+_SHAPE_DTYPE = np.dtype(
+    [
+        ("first", np.int64),  # first arena vertex
+        ("count", np.int64),  # LINES vertex count; 0 for free ids
+        ("radius", np.float64),  # model-space bounding radius
+        ("refs", np.int64),
+        ("written", np.int64),  # `sequence` when its vertices were written
+    ]
+)
+
+
+class PolygonShapes:
+    """
+    Reference-counted registry of distinct polygon outlines.
+
+    Each shape is stored once, in model space, as LINES segment endpoints
+    together with its bounding radius. Polygons that share an outline
+    (same points, same closed flag) share a shape id, so the renderer can
+    upload each outline once and only stream per-instance transforms.
+
+    `acquire()` and `release()` count the polygons using a shape. When the
+    last one lets go, its id and its range of the vertex arena are
+    recycled, so content that creates a fresh outline per spawn or per
+    frame (rotated bullets, trails) keeps the registry at its live size.
+
+    Shape `i` occupies vertices [first[i], first[i] + counts[i]) of the
+    arena, `packed()`, a CPU copy of what the renderer uploads.
+    """
+
+    def __init__(self) -> None:
+        self.vertex_count = 0  # arena high-water mark
+        self.sequence = 0  # bumped whenever arena vertices are written
+        self._vertices = np.zeros((1024, 2), dtype=np.float32)
+        self._free_ranges: List[Tuple[int, int]] = []  # (first, count), sorted
+
+        self._table = np.zeros(64, dtype=_SHAPE_DTYPE)
+        self._len = 0
+        self._free_ids: List[int] = []
+        self._ids: Dict[_Key, int] = {}
+        self._keys: List[Optional[_Key]] = []
+
+    def __len__(self) -> int:
+        """Number of shape ids, including free ones; tables are this long."""
+        return self._len
+
+    @property
+    def live(self) -> int:
+        """Number of shapes in use."""
+        return len(self._ids)
+
+    @property
+    def first(self) -> np.ndarray:
+        """(len(self),) first arena vertex per shape."""
+        return self._table["first"][: self._len]
+
+    @property
+    def counts(self) -> np.ndarray:
+        """(len(self),) LINES vertex count per shape (0 for free ids)."""
+        return self._table["count"][: self._len]
+
+    @property
+    def radius(self) -> np.ndarray:
+        """(len(self),) model-space bounding radius per shape."""
+        return self._table["radius"][: self._len]
+
+    def acquire(self, vertices: Sequence[Vector2], closed: bool) -> int:
+        """Id of the outline through `vertices`, adding a reference to it."""
+        coords = tuple(c for v in vertices for c in (v.x, v.y))
+        key = (bool(closed) and len(vertices) > 1, coords)
+
+        shape = self._ids.get(key)
+        if shape is not None:
+            self._table["refs"][shape] += 1
+            return shape
+
+        points = np.asarray(coords, dtype=np.float32).reshape(-1, 2)
+        n = len(points)
+        if n < 2:
+            segments = np.zeros((0, 2), dtype=np.float32)
+        else:
+            start = np.arange(n if key[0] else n - 1)
+            ends = np.stack([start, (start + 1) % n], axis=1).ravel()
+            segments = points[ends]
+
+        first = self._allocate(len(segments))
+        self._vertices[first : first + len(segments)] = segments
+        self.sequence += 1
+
+        shape = self._new_id()
+        self._ids[key] = shape
+        self._keys[shape] = key
+        self._table[shape] = (
+            first,
+            len(segments),
+            float(np.sqrt((points**2).sum(axis=1)).max()) if n else 0.0,
+            1,
+            self.sequence,
+        )
+        return shape
+
+    def release(self, shape: int) -> None:
+        """Drop one reference; the last one frees the shape."""
+        refs = self._table["refs"]
+        if shape >= self._len or refs[shape] <= 0:
+            raise KeyError(f"Polygon shape {shape} is not in use")
+        refs[shape] -= 1
+        if refs[shape]:
+            return
+
+        key = self._keys[shape]
+        assert key is not None
+        del self._ids[key]
+        self._keys[shape] = None
+        first, count = self._table[["first", "count"]][shape].tolist()
+        self._deallocate(first, count)
+        self._table[shape] = (0, 0, 0.0, 0, 0)
+        self._free_ids.append(shape)
+
+    def release_many(self, shapes: Iterable[int]) -> None:
+        """`release()` each id; negative ids (unresolved) are skipped."""
+        for shape in shapes:
+            if shape >= 0:
+                self.release(int(shape))
+
+    def packed(self) -> np.ndarray:
+        """(vertex_count, 2) arena contents; free ranges hold stale data."""
+        return self._vertices[: self.vertex_count]
+
+    def vertex_span_since(self, sequence: int) -> Tuple[int, int]:
+        """
+        Arena range [lo, hi) covering every vertex written after `sequence`.
+
+        Returns (0, 0) if nothing was written.
+        """
+        if sequence >= self.sequence:
+            return 0, 0
+        rows = self._table[: self._len]
+        rows = rows[(rows["written"] > sequence) & (rows["count"] > 0)]
+        if not len(rows):
+            return 0, 0
+        lo = int(rows["first"].min())
+        hi = int((rows["first"] + rows["count"]).max())
+        return lo, hi
+
+    def _new_id(self) -> int:
+        if self._free_ids:
+            return self._free_ids.pop()
+        if self._len == len(self._table):
+            grown = np.zeros(2 * len(self._table), dtype=_SHAPE_DTYPE)
+            grown[: self._len] = self._table
+            self._table = grown
+        self._keys.append(None)
+        self._len += 1
+        return self._len - 1
+
+    def _allocate(self, count: int) -> int:
+        """First fit among freed ranges, else grow the arena."""
+        if count == 0:
+            return 0
+        for i, (start, size) in enumerate(self._free_ranges):
+            if size >= count:
+                if size == count:
+                    del self._free_ranges[i]
+                else:
+                    self._free_ranges[i] = (start + count, size - count)
+                return start
+
+        start = self.vertex_count
+        self.vertex_count += count
+        if self.vertex_count > len(self._vertices):
+            grown = np.zeros(
+                (max(self.vertex_count, 2 * len(self._vertices)), 2), np.float32
+            )
+            grown[:start] = self._vertices[:start]
+            self._vertices = grown
+        return start
+
+    def _deallocate(self, start: int, count: int) -> None:
+        """Return a range, merging it with free neighbours."""
+        if count == 0:
+            return
+        ranges = self._free_ranges
+        i = bisect.bisect(ranges, (start, count))
+        if i and ranges[i - 1][0] + ranges[i - 1][1] == start:
+            i -= 1
+            start, count = ranges[i][0], ranges[i][1] + count
+            del ranges[i]
+        if i < len(ranges) and start + count == ranges[i][0]:
+            count += ranges[i][1]
+            del ranges[i]
+
+        if start + count == self.vertex_count:
+            self.vertex_count = start  # the arena's tail is free
+        else:
+            ranges.insert(i, (start, count))
@@ -0,0 +1,462 @@
+# sparrow/graphics/ecs/render_mirror.py
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union, overload
+
+import numpy as np
+
+from sparrow.core.components import (
+    EID,
+    Mesh,
+    PolygonRenderable,
+    RenderLayer,
+    Transform,
+)
+from sparrow.core.world import World
+from sparrow.graphics.ecs.frame_submit import (
+    POLYGON_INSTANCE_DTYPE,
+    DrawItem,
+    InstanceUpdate,
+    PolygonDrawItem,
+)
+from sparrow.graphics.ecs.polygon_shapes import PolygonShapes
+from sparrow.math import batch_transform_to_matrix
+from sparrow.types import EntityId
+
+
+def dirty_ranges(
+    mask: np.ndarray, *, max_gap: int = 0
+) -> List[Tuple[int, int]]:
+    """
+    Collapse a boolean slot mask into half-open (start, stop) runs.
+
+    Args:
+        mask: Boolean array, True for slots that changed.
+        max_gap: Runs separated by at most this many clean slots are merged,
+            trading a few redundant bytes for fewer sub-range writes.
+
+    Returns:
+        Sorted, non-overlapping (start, stop) pairs.
+    """
+    idx = np.flatnonzero(mask)
+    if idx.size == 0:
+        return []
+
+    breaks = np.flatnonzero(np.diff(idx) > max_gap + 1)
+    starts = np.concatenate((idx[:1], idx[breaks + 1]))
+    stops = np.concatenate((idx[breaks], idx[-1:])) + 1
+    return list(zip(starts.tolist(), stops.tolist()))
+
+
+_Column = Tuple[Tuple[int, ...], float, Any]
+
+
+def _layer_orders(world: World) -> np.ndarray:
+    """RenderLayer order indexed by entity id; 0 for entities without one."""
+    ids, orders = [], []
+    for _, (layers, eids) in world.get_batch(RenderLayer, EID):
+        ids.append(eids["id"])
+        orders.append(layers["order"])
+    if not ids:
+        return np.zeros(0, dtype=np.int32)
+    all_ids = np.concatenate(ids)
+    out = np.zeros(int(all_ids.max()) + 1, dtype=np.int32)
+    out[all_ids] = np.concatenate(orders)
+    return out
+
+
+class _SlotTable:
+    """
+    Dense slot allocation for a set of entities.
+
+    Live slots are always [0, count). Removal swaps the last slot into the
+    hole, so a slot index is only stable while no entity is despawned; every
+    slot whose content moved is flagged dirty.
+
+    Each slot keeps a shadow copy of the component rows it was last synced
+    from. Systems mutate component columns in place, so comparing against
+    the shadow is how changes are detected.
+    """
+
+    def __init__(
+        self,
+        dtypes: Dict[str, np.dtype],
+        capacity: int = 256,
+        *,
+        columns: Optional[Dict[str, _Column]] = None,
+    ):
+        self.count = 0
+        self.eids = np.zeros(capacity, dtype=np.int64)
+        self.shadow = {
+            name: np.zeros(capacity, dtype=dtype)
+            for name, dtype in dtypes.items()
+        }
+        # Owner-defined per-slot columns (shape, fill, dtype) that follow
+        # their slot on removal; fresh slots start at the fill value.
+        self._fills = dict(columns or {})
+        self.columns = {
+            name: np.full((capacity,) + shape, fill, dtype=dtype)
+            for name, (shape, fill, dtype) in self._fills.items()
+        }
+        self.dirty = np.zeros(capacity, dtype=bool)
+        self._seen = np.zeros(capacity, dtype=bool)
+        self._slot_of = np.full(capacity, -1, dtype=np.int64)
+
+    @property
+    def capacity(self) -> int:
+        return len(self.eids)
+
+    def slot_of(self, eid: EntityId) -> int:
+        if eid >= len(self._slot_of):
+            return -1
+        return int(self._slot_of[eid])
+
+    def lookup(self, ids: np.ndarray) -> np.ndarray:
+        """Current slots of `ids` (-1 for entities not in the table)."""
+        out = np.full(ids.shape, -1, dtype=np.int64)
+        known = ids < len(self._slot_of)
+        out[known] = self._slot_of[ids[known]]
+        return out
+
+    def begin(self) -> None:
+        self._seen[: self.count] = False
+
+    def update(self, ids: np.ndarray, rows: Dict[str, np.ndarray]) -> None:
+        """Sync one archetype batch; flags new and changed slots dirty."""
+        if ids.size == 0:
+            return
+
+        top = int(ids.max()) + 1
+        if top > len(self._slot_of):
+            grown = np.full(max(top, 2 * len(self._slot_of)), -1, np.int64)
+            grown[: len(self._slot_of)] = self._slot_of
+            self._slot_of = grown
+
+        slots = self._slot_of[ids]
+        new = slots < 0
+        n_new = int(np.count_nonzero(new))
+        if n_new:
+            self._reserve(self.count + n_new)
+            fresh = np.arange(self.count, self.count + n_new)
+            slots[new] = fresh
+            self._slot_of[ids[new]] = fresh
+            self.eids[fresh] = ids[new]
+            for name, (_, fill, _) in self._fills.items():
+                self.columns[name][fresh] = fill
+            self.count += n_new
+
+        changed = new
+        for name, raw in rows.items():
+            changed = changed | (self.shadow[name][slots] != raw)
+
+        if changed.any():
+            hit = slots[changed]
+            for name, raw in rows.items():
+                self.shadow[name][hit] = raw[changed]
+            self.dirty[hit] = True
+
+        self._seen[slots] = True
+
+    def unseen(self) -> np.ndarray:
+        """Slots end() is about to drop."""
+        return np.flatnonzero(~self._seen[: self.count])
+
+    def end(self) -> int:
+        """Drop slots not seen since begin(). Returns the number removed."""
+        dead = self.unseen()
+        # Descending order keeps the swap source (the last slot) alive.
+        for slot in dead[::-1].tolist():
+            self._remove(slot)
+        return len(dead)
+
+    def _remove(self, slot: int) -> None:
+        last = self.count - 1
+        self._slot_of[self.eids[slot]] = -1
+
+        if slot != last:
+            self.eids[slot] = self.eids[last]
+            for arr in self.shadow.values():
+                arr[slot] = arr[last]
+            for arr in self.columns.values():
+                arr[slot] = arr[last]
+            self._slot_of[self.eids[slot]] = slot
+            self.dirty[slot] = True
+
+        self.dirty[last] = False
+        self.count = last
+
+    def _reserve(self, needed: int) -> None:
+        if needed <= self.capacity:
+            return
+
+        new_cap = max(needed, 2 * self.capacity)
+        n = self.count
+
+        def grow(arr: np.ndarray, fill=0) -> np.ndarray:
+            out = np.full((new_cap,) + arr.shape[1:], fill, dtype=arr.dtype)
+            out[:n] = arr[:n]
+            return out
+
+        self.eids = grow(self.eids)
+        self.shadow = {k: grow(v) for k, v in self.shadow.items()}
+        self.columns = {k: grow(v) for k, v in self.columns.items()}
+        self.dirty = grow(self.dirty, False)
+        self._seen = grow(self._seen, False)
+
+
+class RenderMirror:
+    """
+    Persistent render-side copy of renderable ECS state.
+
+    Instead of rebuilding every DrawItem and PolygonDrawItem each frame,
+    the mirror keeps them per slot and only rebuilds the ones whose
+    Transform / Mesh / PolygonRenderable / RenderLayer rows changed,
+    spawned or moved slot because of a despawn. Mesh model matrices are
+    kept in a dense per-slot array and handed to the renderer as an
+    InstanceUpdate so the GPU copy can be patched with sub-range writes.
+
+    Polygons are mirrored as POLYGON_INSTANCE_DTYPE records (2D affine,
+    color, stroke width, shape, layer) plus a world-space bounding circle
+    for view culling, all refreshed with array operations. Outlines live in
+    a shared, reference-counted PolygonShapes registry and are only
+    resolved when an entity's vertex list is replaced or its closed flag
+    flips (vertex lists are compared, not deep-copied), so in-place edits
+    of a list are not picked up. PolygonDrawItems are only built if
+    something indexes `polygons`.
+
+    Entities are identified through their EID component.
+    """
+
+    def __init__(self, *, merge_gap: int = 8) -> None:
+        self.merge_gap = merge_gap
+
+        self._meshes = _SlotTable(
+            {
+                "transform": np.dtype(Transform.__soa_dtype__),
+                "mesh": np.dtype(Mesh.__soa_dtype__),
+            }
+        )
+        self._models = np.zeros((self._meshes.capacity, 4, 4), np.float32)
+        self._draws: List[Optional[DrawItem]] = []
+
+        self._polys = _SlotTable(
+            {
+                "transform": np.dtype(Transform.__soa_dtype__),
+                "poly": np.dtype(PolygonRenderable.__soa_dtype__),
+                # RenderLayer order; 0 without the component.
+                "layer": np.dtype(np.int32),
+            },
+            columns={
+                # PolygonShapes id; -1 until (re)resolved.
+                "shape": ((), -1, np.int32),
+                "model": ((4, 4), 0.0, np.float32),
+                "instance": ((), 0, POLYGON_INSTANCE_DTYPE),
+                # World-space circle and stroke: cx, cy, radius, width.
+                "bounds": ((4,), 0.0, np.float32),
+            },
+        )
+        self._polygons: List[Optional[PolygonDrawItem]] = []
+        self.shapes = PolygonShapes()
+
+        self._sequence = 0
+        self.last_dirty_draws = 0
+        self.last_dirty_polygons = 0
+
+    @property
+    def draws(self) -> Sequence[DrawItem]:
+        return self._draws  # type: ignore[return-value]
+
+    @property
+    def polygons(self) -> PolygonView:
+        return PolygonView(self, np.arange(self._polys.count))
+
+    @property
+    def polygon_bounds(self) -> np.ndarray:
+        """(N, 4) world bounding circles (cx, cy, r, stroke) per polygon."""
+        return self._polys.columns["bounds"][: self._polys.count]
+
+    @property
+    def polygon_instances(self) -> np.ndarray:
+        """(N,) POLYGON_INSTANCE_DTYPE records per polygon."""
+        return self._polys.columns["instance"][: self._polys.count]
+
+    def mesh_slot(self, eid: EntityId) -> int:
+        """Instance slot currently holding `eid`, or -1."""
+        return self._meshes.slot_of(eid)
+
+    def sync(self, world: World) -> InstanceUpdate:
+        """
+        Bring the mirror up to date with `world`.
+
+        Returns:
+            The instance update describing which model slots changed since
+            the previous sync.
+        """
+        update = self._sync_meshes(world)
+        self._sync_polygons(world)
+        return update
+
+    def _sync_meshes(self, world: World) -> InstanceUpdate:
+        table = self._meshes
+        table.begin()
+        for _, (meshes, transforms, eids) in world.get_batch(
+            Mesh, Transform, EID
+        ):
+            table.update(eids["id"], {"transform": transforms, "mesh": meshes})
+        table.end()
+
+        if len(self._models) < table.capacity:
+            grown = np.zeros((table.capacity, 4, 4), np.float32)
+            grown[: len(self._models)] = self._models
+            self._models = grown
+
+        n = table.count
+        del self._draws[n:]
+        self._draws.extend([None] * (n - len(self._draws)))
+
+        dirty = np.flatnonzero(table.dirty[:n])
+        if dirty.size:
+            tr = table.shadow["transform"][dirty]
+            self._models[dirty] = batch_transform_to_matrix(
+                tr["pos"], tr["rot"], tr["scale"]
+            )
+
+            mesh_rows = table.shadow["mesh"]
+            for slot in dirty.tolist():
+                self._draws[slot] = DrawItem(
+                    mesh_rows["mesh_id"][slot],
+                    mesh_rows["material_id"][slot],
+                    self._models[slot],
+                    int(table.eids[slot]),
+                    instance=slot,
+                )
+
+        ranges = dirty_ranges(table.dirty[:n], max_gap=self.merge_gap)
+        table.dirty[:n] = False
+        self.last_dirty_draws = int(dirty.size)
+
+        base = self._sequence
+        self._sequence += 1
+        return InstanceUpdate(
+            sequence=self._sequence,
+            base_sequence=base,
+            models=self._models[:n],
+            dirty=ranges,
+        )
+
+    def _sync_polygons(self, world: World) -> None:
+        table = self._polys
+        orders = _layer_orders(world)
+        table.begin()
+        for _, (polys, transforms, eids) in world.get_batch(
+            PolygonRenderable, Transform, EID
+        ):
+            ids = eids["id"]
+            # Shapes only depend on the outline, not on the per-frame
+            # color/width animation.
+            prev = table.lookup(ids)
+            known = prev >= 0
+            shadow = table.shadow["poly"][prev[known]]
+            reshaped = (shadow["vertices"] != polys["vertices"][known]) | (
+                shadow["closed"][:, 0] != polys["closed"][known, 0]
+            )
+            stale = prev[known][reshaped]
+            self.shapes.release_many(table.columns["shape"][stale].tolist())
+            table.columns["shape"][stale] = -1
+
+            layers = np.zeros(len(ids), dtype=np.int32)
+            has_order = ids < len(orders)
+            layers[has_order] = orders[ids[has_order]]
+            table.update(
+                ids, {"transform": transforms, "poly": polys, "layer": layers}
+            )
+        dead = table.unseen()
+        self.shapes.release_many(table.columns["shape"][dead].tolist())
+        table.end()
+
+        n = table.count
+        del self._polygons[n:]
+        self._polygons.extend([None] * (n - len(self._polygons)))
+
+        dirty = np.flatnonzero(table.dirty[:n])
+        self.last_dirty_polygons = int(dirty.size)
+        if dirty.size == 0:
+            return
+
+        rows = table.shadow["poly"]
+        shape = table.columns["shape"]
+        for slot in dirty[shape[dirty] < 0].tolist():
+            shape[slot] = self.shapes.acquire(
+                rows["vertices"][slot], bool(rows["closed"][slot, 0])
+            )
+
+        tr = table.shadow["transform"][dirty]
+        models = batch_transform_to_matrix(tr["pos"], tr["rot"], tr["scale"])
+        table.columns["model"][dirty] = models
+
+        width = rows["stroke_width"][dirty, 0]
+        inst = table.columns["instance"]
+        inst["affine"][dirty] = models[:, :2][:, :, (0, 1, 3)]
+        inst["color"][dirty] = rows["color"][dirty]
+        inst["width"][dirty] = width
+        inst["shape"][dirty] = shape[dirty]
+        inst["layer"][dirty] = table.shadow["layer"][dirty]
+
+        axis_scale = np.linalg.norm(models[:, :2, :2], axis=1).max(axis=1)
+        bounds = table.columns["bounds"]
+        bounds[dirty, 0] = models[:, 0, 3]
+        bounds[dirty, 1] = models[:, 1, 3]
+        bounds[dirty, 2] = self.shapes.radius[shape[dirty]] * axis_scale
+        bounds[dirty, 3] = width
+
+        for slot in dirty.tolist():
+            self._polygons[slot] = None
+        table.dirty[:n] = False
+
+    def _polygon_item(self, slot: int) -> PolygonDrawItem:
+        item = self._polygons[slot]
+        if item is None:
+            table = self._polys
+            row = table.shadow["poly"][slot]
+            item = self._polygons[slot] = PolygonDrawItem(
+                vertices=row["vertices"],
+                color=tuple(row["color"].tolist()),
+                model=table.columns["model"][slot].copy(),
+                stroke_width=float(row["stroke_width"][0]),
+                closed=bool(row["closed"][0]),
+                layer=int(table.shadow["layer"][slot]),
+            )
+        return item
+
+
+class PolygonView(Sequence[PolygonDrawItem]):
+    """
+    Lazy sequence of a RenderMirror's polygons, in slot order.
+
+    Items are built on first access and cached until their slot changes.
+    Like every mirror view, it is only valid until the next sync.
+    """
+
+    def __init__(self, mirror: RenderMirror, slots: np.ndarray) -> None:
+        self._mirror = mirror
+        self.slots = slots
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    @overload
+    def __getitem__(self, index: int) -> PolygonDrawItem: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> PolygonView: ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[PolygonDrawItem, PolygonView]:
+        if isinstance(index, slice):
+            return PolygonView(self._mirror, self.slots[index])
+        return self._mirror._polygon_item(int(self.slots[index]))
+
+    def take(self, indices: np.ndarray) -> PolygonView:
+        """Subset by position, without building any item."""
+        return PolygonView(self._mirror, self.slots[indices])
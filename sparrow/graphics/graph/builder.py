@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict
+from typing import Dict, Set
 
 from sparrow.graphics.graph.pass_base import RenderPass
 from sparrow.graphics.graph.resources import BufferDesc, FramebufferDesc, TextureDesc
@@ -26,6 +26,22 @@ class RenderGraphBuilder:
     buffers: Dict[ResourceId, BufferDesc] = field(default_factory=dict)
     framebuffers: Dict[ResourceId, FramebufferDesc] = field(default_factory=dict)
     passes: Dict[PassId, RenderPass] = field(default_factory=dict)
+    exports: Set[ResourceId] = field(default_factory=set)
+
+    def copy(self) -> RenderGraphBuilder:
+        """
+        Copy the builder's tables; descriptors and pass objects are shared.
+
+        Sharing pass objects lets an incremental compile keep passes that
+        an edit did not touch.
+        """
+        return RenderGraphBuilder(
+            textures=dict(self.textures),
+            buffers=dict(self.buffers),
+            framebuffers=dict(self.framebuffers),
+            passes=dict(self.passes),
+            exports=set(self.exports),
+        )
 
     def add_texture(self, rid: ResourceId, desc: TextureDesc) -> ResourceId:
         """Register or replace a texture resource description."""
@@ -40,6 +56,15 @@ class RenderGraphBuilder:
         """Register or replace a buffer resource description."""
         self.framebuffers[rid] = desc
 
+    def export_resource(self, rid: ResourceId) -> None:
+        """
+        Mark a resource as a graph output.
+
+        Passes writing exported resources are kept even when no pass reads
+        them, so code outside the graph can consume the results.
+        """
+        self.exports.add(rid)
+
     def add_pass(self, pid: PassId, pass_obj: RenderPass) -> PassId:
         """Add a new pass. Raises if pid already exists (use replace_pass)."""
         if pid in self.passes:
@@ -64,6 +89,8 @@ class RenderGraphBuilder:
 
     def remove_resource(self, rid: ResourceId) -> None:
         """Remove a resource (must not be referenced by remaining passes)."""
+        self.exports.discard(rid)
+
         if rid in self.textures:
             del self.textures[rid]
             return
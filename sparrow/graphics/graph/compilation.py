@@ -1,9 +1,11 @@
 # sparrow/graphics/graph/compilation.py
 from __future__ import annotations
 
+import copy
 import heapq
 from collections import defaultdict
-from typing import Dict, List, Mapping, Sequence, Set
+from dataclasses import dataclass, fields, replace
+from typing import AbstractSet, Any, Dict, List, Mapping, Sequence, Set, Tuple
 
 import moderngl
 
@@ -14,6 +16,7 @@ from sparrow.graphics.graph.pass_base import (
     RenderPass,
     RenderServices,
 )
+from sparrow.graphics.graph.pass_culling import live_passes
 from sparrow.graphics.graph.render_graph import CompiledRenderGraph
 from sparrow.graphics.graph.resources import (
     BufferDesc,
@@ -76,6 +79,44 @@ def _validate_resource_references(
         raise KeyError()
 
 
+def _validate_bypasses(
+    *, builder: RenderGraphBuilder, pass_infos: Mapping[PassId, PassBuildInfo]
+) -> None:
+    """
+    Validate every pass's `bypass`: each entry copies a texture the pass
+    reads into a texture it writes, of the same size and format.
+
+    Raises:
+        ValueError: If a bypass does not fit its pass.
+    """
+    errors: List[str] = []
+    for pid, info in pass_infos.items():
+        uses = _uses_for_pass(info)
+        reads = {use.resource for use in uses if _is_read(use.access)}
+        writes = {use.resource for use in uses if _is_write(use.access)}
+        for dst, src in builder.passes[pid].bypass.items():
+            if dst not in writes or src not in reads:
+                errors.append(
+                    f"Pass '{pid}' bypass '{src}' -> '{dst}' is not a read -> write"
+                )
+                continue
+            a, b = builder.textures.get(src), builder.textures.get(dst)
+            if a is None or b is None or _texture_format(a) != _texture_format(b):
+                errors.append(
+                    f"Pass '{pid}' bypass '{src}' -> '{dst}' needs matching textures"
+                )
+
+    if errors:
+        raise ValueError(
+            "Invalid pass bypass:\n" + "\n".join(f"- {e}" for e in errors)
+        )
+
+
+def _texture_format(desc: TextureDesc) -> TextureDesc:
+    """`desc` without the fields a copy does not care about."""
+    return replace(desc, label="", persistent=False)
+
+
 def _build_dependency_dag(
     *, pass_infos: Mapping[PassId, PassBuildInfo]
 ) -> Dict[PassId, Set[PassId]]:
@@ -160,23 +201,194 @@ def _toposort(*, adjacency: Mapping[PassId, Set[PassId]]) -> List[PassId]:
     return out
 
 
+@dataclass(slots=True)
+class _AliasSlot:
+    """One physical texture allocation while planning aliases."""
+
+    owner: ResourceId
+    last_use: int
+
+
+def _texture_lifetimes(
+    *,
+    order: Sequence[PassId],
+    pass_infos: Mapping[PassId, PassBuildInfo],
+    textures: Mapping[ResourceId, TextureDesc],
+    exports: AbstractSet[ResourceId] = frozenset(),
+) -> Dict[ResourceId, Tuple[int, int]]:
+    """
+    Find the first and last pass (index into `order`) using each transient texture.
+
+    A texture is transient when it is not `persistent`, not exported, and
+    its first use writes it without reading: its contents are produced and
+    consumed within one frame. Textures read before being written (history,
+    imported data), exported textures (read after the frame) and textures
+    no pass uses are left out.
+
+    So are textures that several passes write without reading (a scene
+    and an overlay drawn over it). Per-frame culling (`live_passes`) makes
+    sure a read texture's only producer ran, or its bypass copy did; with
+    several producers it only makes sure one of them ran, and the later
+    ones would otherwise draw over another texture's memory when the first
+    is disabled.
+    """
+    lifetimes: Dict[ResourceId, Tuple[int, int]] = {}
+    carried: Set[ResourceId] = set()
+
+    producers: Dict[ResourceId, int] = defaultdict(int)
+    for pid in order:
+        writes = pass_infos[pid].writes
+        for rid in {use.resource for use in writes if use.access == "write"}:
+            producers[rid] += 1
+    carried.update(rid for rid, count in producers.items() if count > 1)
+
+    for i, pid in enumerate(order):
+        for use in _uses_for_pass(pass_infos[pid]):
+            rid = use.resource
+            desc = textures.get(rid)
+            if desc is None or desc.persistent or rid in exports or rid in carried:
+                continue
+
+            if rid in lifetimes:
+                lifetimes[rid] = (lifetimes[rid][0], i)
+            elif _is_read(use.access):
+                carried.add(rid)
+            else:
+                lifetimes[rid] = (i, i)
+
+    return lifetimes
+
+
+def _plan_texture_aliases(
+    *,
+    order: Sequence[PassId],
+    pass_infos: Mapping[PassId, PassBuildInfo],
+    textures: Mapping[ResourceId, TextureDesc],
+    exports: AbstractSet[ResourceId] = frozenset(),
+) -> Dict[ResourceId, ResourceId]:
+    """
+    Assign every texture to the texture whose allocation backs it.
+
+    Transient textures with identical descriptors (ignoring labels) share
+    an allocation when their lifetimes in `order` do not overlap. Each
+    texture is greedily placed, in order of first use, into the allocation
+    that was freed earliest.
+
+    Returns:
+        Mapping from texture id to the id owning its physical allocation.
+        Owners map to themselves.
+    """
+    lifetimes = _texture_lifetimes(
+        order=order, pass_infos=pass_infos, textures=textures, exports=exports
+    )
+    aliases: Dict[ResourceId, ResourceId] = {rid: rid for rid in textures}
+
+    pools: Dict[TextureDesc, List[_AliasSlot]] = defaultdict(list)
+    for rid in sorted(lifetimes, key=lambda r: (lifetimes[r], str(r))):
+        first, last = lifetimes[rid]
+        pool = pools[replace(textures[rid], label="")]
+
+        free = [slot for slot in pool if slot.last_use < first]
+        if free:
+            slot = min(free, key=lambda s: s.last_use)
+            slot.last_use = last
+            aliases[rid] = slot.owner
+        else:
+            pool.append(_AliasSlot(owner=rid, last_use=last))
+
+    return aliases
+
+
 def _allocate_textures(
-    *, gl: moderngl.Context, textures: Mapping[ResourceId, TextureDesc]
+    *,
+    gl: moderngl.Context,
+    textures: Mapping[ResourceId, TextureDesc],
+    aliases: Mapping[ResourceId, ResourceId],
+    previous: Mapping[ResourceId, GraphResource[object]],
 ) -> Dict[ResourceId, TextureResource]:
-    return {rid: allocate_texture(gl, desc) for rid, desc in textures.items()}
+    """
+    Allocate one texture per alias owner; aliased textures share its handle.
+
+    Physical textures of `previous` with an identical descriptor (ignoring
+    labels) are reused instead of allocating, preferring the one that
+    backed the same id before.
+    """
+    spare: Dict[TextureDesc, List[Tuple[Set[ResourceId], TextureResource]]] = (
+        defaultdict(list)
+    )
+    by_handle: Dict[int, Tuple[Set[ResourceId], TextureResource]] = {}
+    for rid, res in previous.items():
+        if not isinstance(res, TextureResource):
+            continue
+        entry = by_handle.get(id(res.handle))
+        if entry is None:
+            entry = by_handle[id(res.handle)] = (set(), res)
+            spare[replace(res.desc, label="")].append(entry)
+        entry[0].add(rid)
+
+    out: Dict[ResourceId, TextureResource] = {}
+    for rid, desc in textures.items():
+        if aliases.get(rid, rid) != rid:
+            continue
+
+        candidates = spare.get(replace(desc, label=""))
+        if candidates:
+            entry = next((e for e in candidates if rid in e[0]), candidates[0])
+            candidates.remove(entry)
+            physical = entry[1]
+            out[rid] = replace(physical, desc=desc, label=desc.label or physical.label)
+        else:
+            out[rid] = allocate_texture(gl, desc)
+
+    for rid, desc in textures.items():
+        owner = aliases.get(rid, rid)
+        if owner != rid:
+            physical = out[owner]
+            out[rid] = replace(physical, desc=desc, label=desc.label or physical.label)
+
+    return out
+
+
+def _graph_outputs(
+    *,
+    builder: RenderGraphBuilder,
+    pass_infos: Mapping[PassId, PassBuildInfo],
+) -> Set[PassId]:
+    """
+    Passes whose results are observable outside the graph.
+
+    These are passes drawing to the screen and passes writing an exported
+    resource.
+    """
+    outputs: Set[PassId] = set()
+    for pid, info in pass_infos.items():
+        if builder.passes[pid].writes_screen or any(
+            _is_write(use.access) and use.resource in builder.exports
+            for use in _uses_for_pass(info)
+        ):
+            outputs.add(pid)
+    return outputs
 
 
 def _allocate_buffers(
-    *, gl: moderngl.Context, buffers: Mapping[ResourceId, BufferDesc]
+    *,
+    gl: moderngl.Context,
+    buffers: Mapping[ResourceId, BufferDesc],
+    previous: Mapping[ResourceId, GraphResource[object]],
 ) -> Dict[ResourceId, BufferResource]:
     """
-    Allocate buffers from BufferDesc.
+    Allocate buffers from BufferDesc, reusing unchanged ones from `previous`.
 
     Note:
         This assumes BufferDesc has at least: size: int, label: str.
     """
     out: Dict[ResourceId, BufferResource] = {}
     for rid, desc in buffers.items():
+        old = previous.get(rid)
+        if isinstance(old, BufferResource) and old.desc == desc:
+            out[rid] = old
+            continue
+
         # reserve GPU storage
         size = getattr(desc, "size_bytes", None)
         if not isinstance(size, int) or size <= 0:
@@ -196,6 +408,7 @@ def _allocate_pass_framebuffers(
     builder: RenderGraphBuilder,
     pass_infos: Mapping[PassId, PassBuildInfo],
     textures: Mapping[ResourceId, TextureResource],
+    previous: Mapping[ResourceId, GraphResource[object]],
 ) -> Dict[ResourceId, FramebufferResource]:
     """
     Allocate per-pass framebuffers based on declared writes.
@@ -204,7 +417,8 @@ def _allocate_pass_framebuffers(
       - stage == "color" and access includes write => color attachment
       - stage == "depth" and access includes write => depth attachment (single)
 
-    A pass with no color/depth writes receives no framebuffer.
+    A pass with no color/depth writes receives no framebuffer. Framebuffers
+    of `previous` whose attachments are the same textures are reused.
     """
     fbos: Dict[ResourceId, FramebufferResource] = {}
 
@@ -232,6 +446,20 @@ def _allocate_pass_framebuffers(
         color_tex = [textures[rid] for rid in color_rids]
         depth_tex = textures[depth_rid] if depth_rid is not None else None
 
+        fbo_id = get_pass_fbo_id(pid)
+        old = previous.get(fbo_id)
+        if (
+            isinstance(old, FramebufferResource)
+            and old.desc.color_attachments == tuple(color_rids)
+            and old.desc.depth_attachment == depth_rid
+            and all(
+                _handle(previous, rid) is _handle(textures, rid)
+                for rid in (*color_rids, depth_rid)
+            )
+        ):
+            fbos[fbo_id] = old
+            continue
+
         fbo = allocate_framebuffer(
             gl,
             color_attachments=color_tex,
@@ -240,11 +468,140 @@ def _allocate_pass_framebuffers(
             depth_attachment_id=depth_rid,
             label=f"fbo:{pid}",
         )
-        fbos[get_pass_fbo_id(pid)] = fbo
+        fbos[fbo_id] = fbo
 
     return fbos
 
 
+def _handle(
+    resources: Mapping[ResourceId, GraphResource[object]], rid: ResourceId | None
+) -> object:
+    res = resources.get(rid) if rid is not None else None
+    return getattr(res, "handle", None)
+
+
+_PassConfig = Tuple[type, Dict[str, Any]]
+
+
+def _pass_config(pass_obj: RenderPass) -> _PassConfig:
+    """
+    Snapshot of a pass's type and public fields.
+
+    Values are deep-copied, so later in-place edits of the pass (or of a
+    list it holds) do not change the snapshot. Values that cannot be
+    copied are kept as they are.
+    """
+    values: Dict[str, Any] = {}
+    for f in fields(pass_obj):
+        if f.name.startswith("_"):
+            continue
+        value = getattr(pass_obj, f.name)
+        try:
+            value = copy.deepcopy(value)
+        except (TypeError, copy.Error):  # e.g. GL handles
+            pass
+        values[f.name] = value
+    return type(pass_obj), values
+
+
+def _same_pass_config(config: _PassConfig | None, pass_obj: RenderPass) -> bool:
+    """Whether `pass_obj` is of the snapshot's type with equal public fields."""
+    if config is None or type(pass_obj) is not config[0]:
+        return False
+
+    for name, value in config[1].items():
+        try:
+            if getattr(pass_obj, name) != value:
+                return False
+        except ValueError:  # ambiguous comparison, e.g. numpy arrays
+            return False
+    return True
+
+
+def _adopt_previous_passes(
+    *, builder: RenderGraphBuilder, previous: CompiledRenderGraph
+) -> None:
+    """
+    Swap passes equal to a compiled pass of `previous` for that pass.
+
+    Rebuilding a pipeline creates fresh pass objects; adopting the compiled
+    ones lets unchanged passes skip `on_graph_compiled`. Both must still
+    match the configuration the old pass was compiled with.
+    """
+    for pid, pass_obj in builder.passes.items():
+        old = previous.passes.get(pid)
+        if old is not None and old is not pass_obj:
+            config = previous.pass_configs.get(pid)
+            if _same_pass_config(config, pass_obj) and _same_pass_config(
+                config, old
+            ):
+                builder.passes[pid] = old
+
+
+def _unchanged_passes(
+    *,
+    order: Sequence[PassId],
+    builder: RenderGraphBuilder,
+    pass_infos: Mapping[PassId, PassBuildInfo],
+    resources: Mapping[ResourceId, GraphResource[object]],
+    services: RenderServices,
+    previous: CompiledRenderGraph,
+) -> Set[PassId]:
+    """
+    Passes of `previous` that stay compiled as they are.
+
+    A pass is kept if it is the same object, compiled against the same
+    services, its public fields still match the snapshot taken when it was
+    compiled (passes shared with a cloned builder may be edited in place),
+    and every resource it uses (and its framebuffer) still has the same
+    handle.
+    """
+    if services is not previous.services:
+        return set()
+
+    keep: Set[PassId] = set()
+    for pid in order:
+        pass_obj = builder.passes[pid]
+        if pass_obj is not previous.passes.get(pid):
+            continue
+        if not _same_pass_config(previous.pass_configs.get(pid), pass_obj):
+            continue
+
+        rids = [use.resource for use in _uses_for_pass(pass_infos[pid])]
+        rids.append(get_pass_fbo_id(pid))
+        if all(_handle(resources, r) is _handle(previous.resources, r) for r in rids):
+            keep.add(pid)
+    return keep
+
+
+def _retire_previous(
+    *,
+    previous: CompiledRenderGraph,
+    keep: Set[PassId],
+    resources: Mapping[ResourceId, GraphResource[object]],
+) -> None:
+    """
+    Tear down what the new graph does not take over from `previous`.
+
+    Passes not kept are destroyed, and handles the new graph does not use
+    are released.
+    """
+    for pid in previous.pass_order:
+        if pid not in keep:
+            previous.passes[pid].on_graph_destroyed()
+
+    in_use = {id(h) for h in (_handle(resources, rid) for rid in resources)}
+    released: Set[int] = set()
+    for res in previous.resources.values():
+        handle = getattr(res, "handle", None)
+        if handle is None or id(handle) in in_use or id(handle) in released:
+            continue
+        released.add(id(handle))
+        handle.release()
+
+    previous.release_frame_buffer()
+
+
 def _call_on_graph_compiled(
     *,
     gl: moderngl.Context,
@@ -267,16 +624,32 @@ def compile_render_graph(
     gl: moderngl.Context,
     builder: RenderGraphBuilder,
     services: RenderServices,
+    previous: CompiledRenderGraph | None = None,
 ) -> CompiledRenderGraph:
     """
     Compile a RenderGraphBuilder into an executable CompiledRenderGraph.
 
     Responsibilities:
-        - allocate textures/buffers/fbos
+        - cull passes and resources that do not reach the screen or an
+          exported resource
+        - allocate textures/buffers/fbos, aliasing transient textures whose
+          lifetimes do not overlap
         - validate pass resource uses
         - compute pass order (topological sort)
         - call pass.on_graph_compiled
+
+    When `previous` is given the compile is incremental: textures, buffers
+    and framebuffers with unchanged descriptors are taken over instead of
+    reallocated, and passes equal to a compiled pass of `previous` (same
+    type and public fields as when it was compiled) replace their entry in
+    `builder` and skip `on_graph_compiled` if their resources kept the same
+    handles. Everything else of `previous` is released; it must not be used
+    or destroyed afterwards.
     """
+    if previous is not None:
+        _adopt_previous_passes(builder=builder, previous=previous)
+    prev_resources = previous.resources if previous is not None else {}
+
     # Collect build info for each pass
     pass_infos: Dict[PassId, PassBuildInfo] = {}
     for pid, p in builder.passes.items():
@@ -289,19 +662,43 @@ def compile_render_graph(
         pass_infos[pid] = info
 
     _validate_resource_references(builder=builder, pass_infos=pass_infos)
+    _validate_bypasses(builder=builder, pass_infos=pass_infos)
 
     adjacency = _build_dependency_dag(pass_infos=pass_infos)
 
     order = _toposort(adjacency=adjacency)
 
-    tex_resources = _allocate_textures(gl=gl, textures=builder.textures)
-    buf_resources = _allocate_buffers(gl=gl, buffers=builder.buffers)
+    # Drop passes that feed no output, and resources only they use.
+    outputs = _graph_outputs(builder=builder, pass_infos=pass_infos)
+    order_all = order
+    order = live_passes(order=order_all, pass_infos=pass_infos, outputs=outputs)
+    live_infos = {pid: pass_infos[pid] for pid in order}
+
+    used: Set[ResourceId] = set(builder.exports)
+    for info in live_infos.values():
+        used.update(use.resource for use in _uses_for_pass(info))
+    textures = {rid: d for rid, d in builder.textures.items() if rid in used}
+    buffers = {rid: d for rid, d in builder.buffers.items() if rid in used}
+
+    aliases = _plan_texture_aliases(
+        order=order,
+        pass_infos=live_infos,
+        textures=textures,
+        exports=builder.exports,
+    )
+    tex_resources = _allocate_textures(
+        gl=gl, textures=textures, aliases=aliases, previous=prev_resources
+    )
+    buf_resources = _allocate_buffers(
+        gl=gl, buffers=buffers, previous=prev_resources
+    )
     fbo_resources = _allocate_pass_framebuffers(
         gl=gl,
         order=order,
         builder=builder,
         pass_infos=pass_infos,
         textures=tex_resources,
+        previous=prev_resources,
     )
 
     resources: Dict[ResourceId, GraphResource[object]] = {}
@@ -309,9 +706,21 @@ def compile_render_graph(
     resources.update(fbo_resources)
     resources.update(buf_resources)
 
+    keep: Set[PassId] = set()
+    if previous is not None:
+        keep = _unchanged_passes(
+            order=order,
+            builder=builder,
+            pass_infos=pass_infos,
+            resources=resources,
+            services=services,
+            previous=previous,
+        )
+        _retire_previous(previous=previous, keep=keep, resources=resources)
+
     _call_on_graph_compiled(
         gl=gl,
-        order=order,
+        order=[pid for pid in order if pid not in keep],
         passes=builder.passes,
         resources=resources,
         services=services,
@@ -320,7 +729,11 @@ def compile_render_graph(
     return CompiledRenderGraph(
         gl=gl,
         pass_order=order,
-        passes=dict(builder.passes),
+        passes={pid: builder.passes[pid] for pid in order},
+        pass_configs={pid: _pass_config(builder.passes[pid]) for pid in order},
         resources=resources,
         services=services,
+        pass_infos=live_infos,
+        outputs=frozenset(outputs),
+        culled_passes=tuple(pid for pid in order_all if pid not in live_infos),
     )
@@ -0,0 +1,44 @@
+# sparrow/graphics/graph/frame_constants.py
+from __future__ import annotations
+
+import numpy as np
+
+from sparrow.graphics.ecs.frame_submit import RenderFrameInput
+
+# Uniform block binding of `FrameConstants` (shaders/default/frame_constants.glsl).
+FRAME_CONSTANTS_BINDING = 0
+
+# std140 `FrameConstants` (160 bytes). Matrices are stored column-major.
+FRAME_CONSTANTS_DTYPE = np.dtype(
+    [
+        ("view_proj", "f4", (4, 4)),
+        ("inv_view_proj", "f4", (4, 4)),
+        ("camera_pos", "f4", (3,)),
+        ("frame_index", "i4"),
+        ("resolution", "f4", (2,)),
+        ("dt_seconds", "f4"),
+        ("pad", "f4"),
+    ]
+)
+
+
+def build_frame_constants(
+    frame: RenderFrameInput, viewport_width: int, viewport_height: int
+) -> np.ndarray:
+    """
+    Pack the per-frame constants shared by all passes.
+
+    Returns:
+        A one-element FRAME_CONSTANTS_DTYPE array, ready to upload.
+    """
+    cam = frame.camera
+    view_proj = np.asarray(cam.view_proj, dtype=np.float64)
+
+    out = np.zeros(1, dtype=FRAME_CONSTANTS_DTYPE)
+    out["view_proj"] = view_proj.T
+    out["inv_view_proj"] = np.linalg.inv(view_proj).T
+    out["camera_pos"] = cam.position_ws
+    out["frame_index"] = frame.frame_index
+    out["resolution"] = (viewport_width, viewport_height)
+    out["dt_seconds"] = frame.dt_seconds
+    return out
@@ -11,6 +11,7 @@ from typing import (
     Mapping,
     Optional,
     Sequence,
+    Tuple,
 )
 
 import moderngl
@@ -20,10 +21,13 @@ from sparrow.graphics.assets.material_manager import MaterialManager
 from sparrow.graphics.assets.mesh_manager import MeshManager
 from sparrow.graphics.assets.texture_manager import TextureManager
 from sparrow.graphics.ecs.frame_submit import RenderFrameInput
+from sparrow.graphics.graph.frame_constants import build_frame_constants
 from sparrow.graphics.graph.resources import GraphResource
+from sparrow.graphics.renderer.instance_store import InstanceStore
+from sparrow.graphics.renderer.stream_buffer import StreamingBuffer
 from sparrow.graphics.renderer.settings import RendererSettings
 from sparrow.graphics.shaders.shader_manager import ShaderManager
-from sparrow.graphics.util.ids import PassId, ResourceId, TextureId, get_pass_fbo_id
+from sparrow.graphics.util.ids import PassId, ResourceId, get_pass_fbo_id
 
 
 @dataclass(frozen=True, slots=True)
@@ -73,6 +77,10 @@ class RenderServices:
         mesh_manager: Provides VAOs/VBOs/IBOs.
         material_manager: Provides material parameters and texture bindings.
         texture_manager: Provides non-graph textures (asset textures, cubemaps, etc.).
+        instances: Persistent per-instance model matrices, if the renderer
+            keeps them on the GPU.
+        stream: Ring buffer for per-frame dynamic uploads (vertex, instance,
+            indirect, uniform and storage data).
         extras: Optional additional services keyed by name.
     """
 
@@ -80,6 +88,8 @@ class RenderServices:
     mesh_manager: MeshManager
     material_manager: MaterialManager
     texture_manager: TextureManager
+    instances: Optional[InstanceStore] = None
+    stream: Optional[StreamingBuffer] = None
     extras: Mapping[str, Any] = field(default_factory=dict)
 
 
@@ -97,6 +107,13 @@ class PassExecutionContext:
         services: Typed access to shared managers/services.
         viewport_width: Current window framebuffer width in pixels.
         viewport_height: Current window framebuffer height in pixels.
+        prepared: Payloads returned by `RenderPass.prepare()` for this frame,
+            keyed by pass id.
+        frame_constants: The frame's FRAME_CONSTANTS_DTYPE record, already
+            bound as the `FrameConstants` uniform block by the graph.
+        render_scale: Fraction of each graph render target's width and
+            height drawn this frame (dynamic resolution). Passes render into
+            the top-left `render_size()` region; the present pass upscales.
 
     Notes:
         Most passes should render to graph-owned textures sized at the renderer's
@@ -112,6 +129,34 @@ class PassExecutionContext:
     services: RenderServices
     viewport_width: int
     viewport_height: int
+    prepared: Mapping[PassId, Any] = field(default_factory=dict)
+    frame_constants: Optional[np.ndarray] = None
+    render_scale: float = 1.0
+
+    def render_size(self, width: int, height: int) -> Tuple[int, int]:
+        """Region of a `width` x `height` graph target drawn this frame."""
+        if self.render_scale >= 1.0:
+            return width, height
+        return (
+            max(1, round(width * self.render_scale)),
+            max(1, round(height * self.render_scale)),
+        )
+
+    def uv_scale(self, width: int, height: int) -> Tuple[float, float]:
+        """UV extent of `render_size()` within a `width` x `height` target."""
+        w, h = self.render_size(width, height)
+        return w / width, h / height
+
+
+# Plain uniforms that mirror a FrameConstants field, for shaders that do not
+# include frame_constants.glsl.
+_FRAME_UNIFORM_FIELDS = {
+    "u_camera_pos": "camera_pos",
+    "u_inv_view_proj": "inv_view_proj",
+    "u_view_proj": "view_proj",
+    "u_resolution": "resolution",
+    "u_frame_index": "frame_index",
+}
 
 
 class PassFeatures(Flag):
@@ -130,8 +175,12 @@ class RenderPass(ABC):
     Contract:
         - `build()` declares the pass id/name and resource reads/writes.
         - `on_graph_compiled()` is called after resources exist; compile shaders, cache locations.
+        - `prepare()` optionally builds CPU-side upload data for a frame. It may
+          run on a worker thread and must not touch GL.
         - `execute()` issues GPU commands for a single frame.
         - `on_graph_destroyed()` releases pass-owned state (if any).
+        - Passes that contribute neither to the screen nor to an exported
+          resource are culled at compile time; `enabled` culls per frame.
 
     Passes should be small and composable. heavy scene processing belongs in ECS
     extraction systems, not in `execute()`.
@@ -141,9 +190,13 @@ class RenderPass(ABC):
     settings: RendererSettings
 
     features: PassFeatures = PassFeatures.NONE
+    # Disabled passes are skipped, along with passes that only feed them,
+    # without recompiling the graph (see `bypass`).
+    enabled: bool = True
 
     _program: Optional[moderngl.Program | moderngl.ComputeShader] = None
     _uniforms: dict[str, moderngl.Uniform] = field(default_factory=dict)
+    _frame_uniforms: dict[str, moderngl.Uniform] = field(default_factory=dict)
 
     _sky_lut_binding: int = 5
 
@@ -161,6 +214,29 @@ class RenderPass(ABC):
         """
         return None
 
+    @property
+    def bypass(self) -> Mapping[ResourceId, ResourceId]:
+        """
+        Outputs the graph copies from an input while the pass is disabled.
+
+        Maps a texture the pass writes to a texture it reads with the same
+        size and format, e.g. a post effect's output to its input. An
+        output without an entry may not be read by enabled passes while
+        the pass is disabled, unless another pass also writes it.
+        """
+        return {}
+
+    @property
+    def writes_screen(self) -> bool:
+        """
+        Whether the pass draws to the default framebuffer.
+
+        Screen passes are graph outputs and are never culled. Passes that
+        only write graph resources (compute passes, for example) should
+        return False so they are culled when nothing consumes their outputs.
+        """
+        return self.output_target is None
+
     def _get_uniform(self, name: str) -> moderngl.Uniform | None:
         if not self._program:
             return None
@@ -196,27 +272,37 @@ class RenderPass(ABC):
         if not self._program:
             return
 
+        # Camera, resolution and frame index live in the FrameConstants
+        # block; only shaders that declare them as plain uniforms get them
+        # written per pass.
+        frame_names = []
         if PassFeatures.CAMERA in self.features:
-            for name in ["u_camera_pos", "u_inv_view_proj", "u_view_proj"]:
-                if name in self._program:
-                    self._uniforms[name] = self._program[name]
+            frame_names += ["u_camera_pos", "u_inv_view_proj", "u_view_proj"]
+        if PassFeatures.RESOLUTION in self.features:
+            frame_names.append("u_resolution")
+        if PassFeatures.TIME in self.features:
+            frame_names.append("u_frame_index")
+        for name in frame_names:
+            uniform = self._get_uniform(name)
+            if uniform is not None:
+                self._frame_uniforms[name] = uniform
 
         if PassFeatures.SUN in self.features:
             for name in [
                 "u_sun_direction",
                 "u_sun_color",
                 "u_sky_lut",
-                "u_sky_max_mip",
                 "u_sun_radiance",
             ]:
                 if name in self._program:
                     self._uniforms[name] = self._program[name]
 
-        if PassFeatures.RESOLUTION in self.features and "u_resolution" in self._program:
-            self._uniforms["u_resolution"] = self._program["u_resolution"]
-
-        if PassFeatures.TIME in self.features and "u_frame_index" in self._program:
-            self._uniforms["u_frame_index"] = self._program["u_frame_index"]
+            # Constant for the lifetime of the graph (settings are frozen).
+            sky_max_mip = self._get_uniform("u_sky_max_mip")
+            if sky_max_mip is not None:
+                res = self.settings.resolution
+                h, w = res.logical_height, res.logical_width
+                sky_max_mip.value = float(floor(log2(max(h, w))))
 
     def execute_base(self, exec_ctx: PassExecutionContext) -> None:
         """
@@ -231,17 +317,14 @@ class RenderPass(ABC):
         services = exec_ctx.services
         frame = exec_ctx.frame
 
-        # Update camera
-        if PassFeatures.CAMERA in self.features:
-            cam = exec_ctx.frame.camera
-            if "u_camera_pos" in self._uniforms:
-                self._uniforms["u_camera_pos"].value = tuple(cam.position_ws)
-            if "u_inv_view_proj" in self._uniforms:
-                inv_vp = np.linalg.inv(cam.view_proj).astype(np.float32)
-                self._uniforms["u_inv_view_proj"].write(inv_vp.T.tobytes())
-            if "u_view_proj" in self._uniforms:
-                vp = cam.view_proj.astype(np.float32)
-                self._uniforms["u_view_proj"].write(vp.T.tobytes())
+        if self._frame_uniforms:
+            constants = exec_ctx.frame_constants
+            if constants is None:
+                constants = build_frame_constants(
+                    frame, exec_ctx.viewport_width, exec_ctx.viewport_height
+                )
+            for name, uniform in self._frame_uniforms.items():
+                uniform.write(constants[_FRAME_UNIFORM_FIELDS[name]].tobytes())
 
         # Directional lighting updates
         if PassFeatures.SUN in self.features:
@@ -252,34 +335,33 @@ class RenderPass(ABC):
                 self._uniforms["u_sun_color"].value = tuple(sun.color)
 
             if "u_sky_lut" in self._uniforms:
-                tex_id = TextureId("engine.sky_lut")
-                sky_handle = services.texture_manager.get(tex_id)
+                sky_handle = services.texture_manager.sky_lut()
                 sky_handle.texture.use(location=self._sky_lut_binding)
                 self._uniforms["u_sky_lut"].value = self._sky_lut_binding
 
-            if "u_sky_max_mip" in self._uniforms:
-                h, w = (
-                    self.settings.resolution.logical_height,
-                    self.settings.resolution.logical_width,
-                )
-
-                max_mips = floor(log2(max(h, w)))
-                self._uniforms["u_sky_max_mip"].value = float(max_mips)
-
             if "u_sun_radiance" in self._uniforms:
                 self._uniforms["u_sun_radiance"].value = (10.0, 10.0, 10.0)
 
-        if (
-            PassFeatures.RESOLUTION in self.features
-            and "u_resolution" in self._uniforms
-        ):
-            self._uniforms["u_resolution"].value = (
-                exec_ctx.viewport_width,
-                exec_ctx.viewport_height,
-            )
-
-        if PassFeatures.TIME in self.features and "u_frame_index" in self._uniforms:
-            self._uniforms["u_frame_index"].value = frame.frame_index
+    def prepare(self, frame: RenderFrameInput) -> Any:
+        """
+        Build CPU-side data (packed vertex/instance bytes, etc.) for `frame`.
+
+        Runs before `execute()`, possibly on a render-prep thread while the
+        main thread simulates the next step, so it must only read `frame` and
+        immutable pass state. The result is handed back to `execute()` through
+        `exec_ctx.prepared[self.pass_id]`.
+
+        Returns:
+            Any payload, or None if the pass has nothing to prepare.
+        """
+        return None
+
+    def prepared_for(self, exec_ctx: PassExecutionContext) -> Any:
+        """Payload prepared for this frame, preparing inline if missing."""
+        payload = exec_ctx.prepared.get(self.pass_id)
+        if payload is None:
+            payload = self.prepare(exec_ctx.frame)
+        return payload
 
     def execute(self, exec_ctx: PassExecutionContext) -> None:
         """Execute the pass for the current frame."""
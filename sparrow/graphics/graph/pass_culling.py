@@ -0,0 +1,116 @@
+# sparrow/graphics/graph/pass_culling.py
+from __future__ import annotations
+
+from typing import AbstractSet, Dict, List, Mapping, Optional, Sequence, Set
+
+from sparrow.graphics.graph.pass_base import PassBuildInfo
+from sparrow.graphics.util.ids import PassId, ResourceId
+
+
+def live_passes(
+    *,
+    order: Sequence[PassId],
+    pass_infos: Mapping[PassId, PassBuildInfo],
+    outputs: AbstractSet[PassId],
+    disabled: AbstractSet[PassId] = frozenset(),
+    bypass: Optional[Mapping[PassId, Mapping[ResourceId, ResourceId]]] = None,
+) -> List[PassId]:
+    """
+    Select the passes of `order` that contribute to the graph's outputs.
+
+    Walks `order` (a topological order) backwards. Output passes are live;
+    any other pass is live if it writes a resource that a later live pass
+    reads or writes. Writes count too so that a pass drawing on top of an
+    earlier pass's target keeps that pass alive.
+
+    Disabled passes do not run. Where a live pass needs one of their
+    outputs, the output is copied from the input `bypass` names for it,
+    which keeps that input's producers live; the disabled pass stays in the
+    result to mark where the copy happens.
+
+    Args:
+        order: Topologically sorted pass ids.
+        pass_infos: Build info of every pass in `order`.
+        outputs: Passes whose effects are observable (screen or exported
+            resources).
+        disabled: Passes switched off for this frame.
+        bypass: Per pass, written resource -> read resource to copy it
+            from while the pass is disabled.
+
+    Returns:
+        The live passes, in `order`.
+
+    Raises:
+        ValueError: If a live pass reads a resource that would only have
+            been written by a disabled pass without a bypass for it.
+    """
+    bypass = bypass or {}
+    needed: Set[ResourceId] = set()
+    live: List[PassId] = []
+    # Needed outputs of disabled passes nothing copies: resource -> pass.
+    skipped: Dict[ResourceId, PassId] = {}
+
+    for pid in reversed(order):
+        info = pass_infos[pid]
+        uses = tuple(info.reads) + tuple(info.writes)
+
+        if pid in disabled:
+            copies = bypass.get(pid, {})
+            wanted = {
+                use.resource
+                for use in uses
+                if use.access != "read" and use.resource in needed
+            }
+            for rid in wanted:
+                if rid in copies:
+                    needed.add(copies[rid])
+                else:
+                    skipped.setdefault(rid, pid)
+            if wanted & copies.keys():
+                live.append(pid)
+            continue
+
+        if pid not in outputs and not any(
+            use.access != "read" and use.resource in needed for use in uses
+        ):
+            continue
+
+        live.append(pid)
+        needed.update(use.resource for use in uses)
+
+    live.reverse()
+    if skipped:
+        _check_skipped_outputs(
+            live=live,
+            pass_infos=pass_infos,
+            disabled=disabled,
+            bypass=bypass,
+            skipped=skipped,
+        )
+    return live
+
+
+def _check_skipped_outputs(
+    *,
+    live: Sequence[PassId],
+    pass_infos: Mapping[PassId, PassBuildInfo],
+    disabled: AbstractSet[PassId],
+    bypass: Mapping[PassId, Mapping[ResourceId, ResourceId]],
+    skipped: Mapping[ResourceId, PassId],
+) -> None:
+    """Raise if a running pass reads a skipped output no other pass wrote."""
+    written: Set[ResourceId] = set()
+    for pid in live:
+        if pid in disabled:
+            written.update(bypass.get(pid, {}))
+            continue
+
+        info = pass_infos[pid]
+        for use in info.reads:
+            rid = use.resource
+            if rid in skipped and rid not in written:
+                raise ValueError(
+                    f"Pass '{pid}' reads '{rid}', which disabled pass "
+                    f"'{skipped[rid]}' writes without a bypass"
+                )
+        written.update(use.resource for use in info.writes)
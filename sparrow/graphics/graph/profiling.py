@@ -0,0 +1,154 @@
+# sparrow/graphics/graph/profiling.py
+from __future__ import annotations
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterator, List, Optional
+
+import moderngl
+
+from sparrow.graphics.renderer.gpu_timer import GpuTimer
+from sparrow.graphics.util.ids import PassId
+
+
+@dataclass(frozen=True, slots=True)
+class PassTiming:
+    """
+    Rolling timing of one pass.
+
+    Attributes:
+        cpu_ms: Mean CPU time of `execute()` (command submission).
+        gpu_ms: Mean GPU time, or None if GPU timing is unavailable or no
+            result has been read back yet.
+        cpu_max_ms: Worst CPU time in the window.
+        samples: Frames in the CPU window.
+    """
+
+    cpu_ms: float
+    gpu_ms: Optional[float]
+    cpu_max_ms: float
+    samples: int
+
+
+class GraphProfiler:
+    """
+    Per-pass CPU and GPU timings, kept in ring buffers keyed by PassId.
+
+    GPU times come from one `GpuTimer` per pass and are read back
+    `latency + 1` frames late, so profiling never waits on the GPU. GPU
+    timing is skipped when there is no context or it lacks timer queries;
+    CPU timings are always recorded.
+    """
+
+    def __init__(
+        self,
+        gl: Optional[moderngl.Context],
+        *,
+        history: int = 120,
+        latency: int = 3,
+        gpu: bool = True,
+    ) -> None:
+        if history < 1:
+            raise ValueError("history must be at least 1")
+        self._gl = gl
+        self._history = history
+        self._latency = latency
+        self._gpu_enabled = gpu and gl is not None and _has_timer_queries(gl)
+
+        self._cpu: Dict[PassId, Deque[float]] = {}
+        self._gpu: Dict[PassId, Deque[float]] = {}
+        self._timers: Dict[PassId, GpuTimer] = {}
+        self._frame_gpu_ms: Optional[float] = None
+
+    @property
+    def gpu_enabled(self) -> bool:
+        return self._gpu_enabled
+
+    @contextmanager
+    def measure(self, pid: PassId) -> Iterator[None]:
+        """Time the `with` block as one execution of pass `pid`."""
+        timer = self._timer(pid)
+        start = time.perf_counter()
+        if timer is None:
+            yield
+        else:
+            with timer.measure():
+                yield
+        cpu_ms = (time.perf_counter() - start) * 1000.0
+
+        ring = self._cpu.get(pid)
+        if ring is None:
+            ring = self._cpu[pid] = deque(maxlen=self._history)
+        ring.append(cpu_ms)
+
+    def end_frame(self) -> None:
+        """Collect GPU results that became available this frame."""
+        arrived: List[float] = []
+        for pid, timer in self._timers.items():
+            gpu_ms = timer.poll()
+            if gpu_ms is None:
+                continue
+            ring = self._gpu.get(pid)
+            if ring is None:
+                ring = self._gpu[pid] = deque(maxlen=self._history)
+            ring.append(gpu_ms)
+            arrived.append(gpu_ms)
+
+        if arrived:
+            self._frame_gpu_ms = sum(arrived)
+
+    def poll_frame_gpu_ms(self) -> Optional[float]:
+        """
+        Return the GPU time of the newest fully read-back frame, once.
+
+        Returns:
+            The summed GPU time of all passes of that frame, or None if no
+            new frame completed since the last call.
+        """
+        result, self._frame_gpu_ms = self._frame_gpu_ms, None
+        return result
+
+    def breakdown(self) -> Dict[PassId, PassTiming]:
+        """Rolling per-pass timings over the last `history` frames."""
+        out: Dict[PassId, PassTiming] = {}
+        for pid, cpu in self._cpu.items():
+            gpu = self._gpu.get(pid)
+            out[pid] = PassTiming(
+                cpu_ms=sum(cpu) / len(cpu),
+                gpu_ms=sum(gpu) / len(gpu) if gpu else None,
+                cpu_max_ms=max(cpu),
+                samples=len(cpu),
+            )
+        return out
+
+    def reset(self) -> None:
+        """Forget recorded timings (pending GPU queries stay in flight)."""
+        self._cpu.clear()
+        self._gpu.clear()
+        self._frame_gpu_ms = None
+
+    def release(self) -> None:
+        for timer in self._timers.values():
+            timer.release()
+        self._timers.clear()
+        self.reset()
+
+    def _timer(self, pid: PassId) -> Optional[GpuTimer]:
+        if not self._gpu_enabled:
+            return None
+
+        timer = self._timers.get(pid)
+        if timer is None:
+            assert self._gl is not None
+            timer = self._timers[pid] = GpuTimer(self._gl, self._latency)
+        return timer
+
+
+def _has_timer_queries(gl: moderngl.Context) -> bool:
+    try:
+        gl.query(time=True)
+    except moderngl.Error:
+        return False
+    return True
@@ -1,27 +1,57 @@
 # sparrow/graphics/graph/render_graph.py
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import AbstractSet, Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
 import moderngl
+import numpy as np
 
 from sparrow.graphics.ecs.frame_submit import RenderFrameInput
+from sparrow.graphics.graph.frame_constants import (
+    FRAME_CONSTANTS_BINDING,
+    FRAME_CONSTANTS_DTYPE,
+    build_frame_constants,
+)
 from sparrow.graphics.graph.pass_base import (
+    PassBuildInfo,
     PassExecutionContext,
     RenderPass,
     RenderServices,
 )
+from sparrow.graphics.graph.pass_culling import live_passes
+from sparrow.graphics.graph.profiling import GraphProfiler
 from sparrow.graphics.graph.resources import GraphResource
 from sparrow.graphics.util.ids import PassId, ResourceId
 
 
+@dataclass(frozen=True, slots=True)
+class PreparedFrame:
+    """
+    CPU-side work for one frame, produced by `CompiledRenderGraph.prepare()`.
+
+    Attributes:
+        graph: Graph the payloads were built for.
+        frame: Frame input the payloads describe.
+        payloads: Per-pass results of `RenderPass.prepare()`.
+    """
+
+    graph: CompiledRenderGraph
+    frame: RenderFrameInput
+    payloads: Mapping[PassId, Any]
+
+
 @dataclass(slots=True)
 class CompiledRenderGraph:
     """
     Executable render graph with a deterministic pass order and allocated resources.
 
     Instances should be treated as immutable except for per-frame execution.
+
+    `pass_order` holds the passes that survived compile-time culling. Each
+    frame only the subset reachable from enabled outputs runs; disabled
+    passes whose outputs are still needed are replaced by their bypass
+    copies (see `active_pass_order()`).
     """
 
     gl: moderngl.Context
@@ -30,17 +60,100 @@ class CompiledRenderGraph:
     resources: Mapping[ResourceId, GraphResource[object]]
     services: RenderServices  # shader/mesh/material managers
 
-    def execute(self, frame: RenderFrameInput) -> None:
+    pass_infos: Mapping[PassId, PassBuildInfo] = field(default_factory=dict)
+    # Type and public fields of each pass when it was compiled, see
+    # compilation._pass_config.
+    pass_configs: Mapping[PassId, Tuple[type, Dict[str, Any]]] = field(
+        default_factory=dict
+    )
+    outputs: AbstractSet[PassId] = frozenset()
+    culled_passes: Tuple[PassId, ...] = ()
+
+    # Records per-pass timings in execute() when set.
+    profiler: Optional[GraphProfiler] = None
+
+    # Fallback home of the FrameConstants block without a streaming buffer.
+    _frame_buffer: Optional[moderngl.Buffer] = None
+
+    # Enabled flags the active order was last culled for.
+    _enabled_key: Optional[Tuple[bool, ...]] = None
+    _active_order: List[PassId] = field(default_factory=list)
+    # Pixel buffers bypass copies go through, per source texture.
+    _bypass_buffers: Dict[ResourceId, moderngl.Buffer] = field(
+        default_factory=dict
+    )
+
+    def active_pass_order(self) -> Sequence[PassId]:
+        """
+        Passes to run this frame.
+
+        Re-culls only when a pass's `enabled` flag changed since last call.
+        Disabled passes are listed only where their bypass copies an output
+        a running pass needs; passes that then feed no enabled output are
+        dropped.
+
+        Raises:
+            ValueError: If an enabled pass would read the output of a
+                disabled pass that has no bypass for it.
+        """
+        key = tuple(self.passes[pid].enabled for pid in self.pass_order)
+        if key != self._enabled_key:
+            if self.pass_infos:
+                disabled = {
+                    pid for pid, on in zip(self.pass_order, key) if not on
+                }
+                order = live_passes(
+                    order=self.pass_order,
+                    pass_infos=self.pass_infos,
+                    outputs=self.outputs,
+                    disabled=disabled,
+                    bypass={pid: self.passes[pid].bypass for pid in disabled},
+                )
+            else:
+                order = [pid for pid, on in zip(self.pass_order, key) if on]
+            self._active_order = order
+            self._enabled_key = key
+        return self._active_order
+
+    def prepare(self, frame: RenderFrameInput) -> PreparedFrame:
+        """
+        Run every pass's CPU-side `prepare()` for `frame`.
+
+        Issues no GL calls, so it can run on a worker thread.
+        """
+        payloads: Dict[PassId, Any] = {}
+        for pid in self.active_pass_order():
+            if not self.passes[pid].enabled:
+                continue
+            payload = self.passes[pid].prepare(frame)
+            if payload is not None:
+                payloads[pid] = payload
+
+        return PreparedFrame(graph=self, frame=frame, payloads=payloads)
+
+    def execute(
+        self,
+        frame: RenderFrameInput,
+        prepared: Optional[PreparedFrame] = None,
+        render_scale: float = 1.0,
+    ) -> None:
         """
         Execute all passes for the given frame.
 
         This does not do scene extraction; it assumes the caller has already
-        assembled RenderFrameInput from ECS.
+        assembled RenderFrameInput from ECS. Payloads in `prepared` are used
+        when they were built by this graph; passes prepare inline otherwise.
+        `render_scale` is the dynamic-resolution fraction of the render
+        targets to draw into. With a `profiler` attached, each pass's
+        `execute()` is timed.
         """
         vp_w, vp_h = frame.viewport_width, frame.viewport_height
         if vp_w is None or vp_h is None:
             raise ValueError("viewport_width and viewport_frame must not be None")
 
+        constants = build_frame_constants(frame, vp_w, vp_h)
+        self._bind_frame_constants(constants)
+
         exec_ctx = PassExecutionContext(
             gl=self.gl,
             frame=frame,
@@ -48,19 +161,78 @@ class CompiledRenderGraph:
             services=self.services,
             viewport_width=vp_w,
             viewport_height=vp_h,
+            frame_constants=constants,
+            render_scale=render_scale,
         )
+        if prepared is not None and prepared.graph is self:
+            exec_ctx.prepared = prepared.payloads
 
-        for pid in self.pass_order:
-            self.passes[pid].execute(exec_ctx)
+        profiler = self.profiler
+        if profiler is None:
+            for pid in self.active_pass_order():
+                self._run_pass(pid, exec_ctx)
+            return
+
+        for pid in self.active_pass_order():
+            with profiler.measure(pid):
+                self._run_pass(pid, exec_ctx)
+        profiler.end_frame()
+
+    def _run_pass(self, pid: PassId, exec_ctx: PassExecutionContext) -> None:
+        pass_obj = self.passes[pid]
+        if pass_obj.enabled:
+            pass_obj.execute(exec_ctx)
+            return
+
+        # Disabled but needed: stand in with the bypass copies. They go
+        # through a GPU buffer, which copies texels exactly (blits may not).
+        for dst, src in pass_obj.bypass.items():
+            source = self.resources[src].handle
+            buffer = self._bypass_buffers.get(src)
+            if buffer is None:
+                texel = source.components * int(source.dtype[1:])
+                buffer = self.gl.buffer(reserve=source.width * source.height * texel)
+                self._bypass_buffers[src] = buffer
+            source.read_into(buffer)
+            self.resources[dst].handle.write(buffer)
+
+    def _bind_frame_constants(self, constants: np.ndarray) -> None:
+        """Upload the frame's constants once and bind them for every pass."""
+        stream = self.services.stream
+        if stream is not None:
+            alloc = stream.upload(constants)
+            alloc.bind_to_uniform_block(FRAME_CONSTANTS_BINDING)
+            return
+
+        if self._frame_buffer is None:
+            self._frame_buffer = self.gl.buffer(
+                reserve=FRAME_CONSTANTS_DTYPE.itemsize, dynamic=True
+            )
+        self._frame_buffer.write(constants.tobytes())
+        self._frame_buffer.bind_to_uniform_block(FRAME_CONSTANTS_BINDING)
+
+    def release_frame_buffer(self) -> None:
+        """Release the fallback FrameConstants buffer, if one was created."""
+        if self._frame_buffer is not None:
+            self._frame_buffer.release()
+            self._frame_buffer = None
 
     def destroy(self) -> None:
         """Destroy GPU resources and notify passes for cleanup."""
+        self.release_frame_buffer()
+        for buffer in self._bypass_buffers.values():
+            buffer.release()
+        self._bypass_buffers.clear()
+
         for pid in self.pass_order:
             self.passes[pid].on_graph_destroyed()
 
+        # Aliased textures share handles; release each one once.
+        released: set[int] = set()
         for res in self.resources.values():
             handle = getattr(res, "handle", None)
-            if handle is not None:
+            if handle is not None and id(handle) not in released:
+                released.add(id(handle))
                 try:
                     handle.release()
                 except Exception:
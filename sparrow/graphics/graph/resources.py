@@ -23,7 +23,9 @@ class TextureDesc:
     """
     Declarative texture specification.
 
-    The graph owns allocation and may reallocate on resize.
+    The graph owns allocation and may reallocate on resize. Textures whose
+    lifetimes within a frame do not overlap may share one allocation unless
+    `persistent` is set.
     """
 
     width: int
@@ -35,6 +37,7 @@ class TextureDesc:
     mipmaps: bool = False
     label: str = ""
     depth: bool = False  # For depth textures
+    persistent: bool = False  # Contents survive between frames; never aliased
 
 
 @dataclass(frozen=True, slots=True)
@@ -0,0 +1,222 @@
+# sparrow/graphics/helpers/bvh.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# std430 `BvhNode` of raytrace.comp (32 bytes). Interior nodes have
+# count == 0 and their children at left_first and left_first + 1; leaves
+# cover primitives [left_first, left_first + count) of the reordered list.
+BVH_NODE_DTYPE = np.dtype(
+    [
+        ("lo", "f4", (3,)),
+        ("left_first", "i4"),
+        ("hi", "f4", (3,)),
+        ("count", "i4"),
+    ]
+)
+
+# std430 `BvhInstance` of raytrace.comp (80 bytes): one TLAS primitive.
+BVH_INSTANCE_DTYPE = np.dtype(
+    [
+        ("inv_model", "f4", (4, 4)),  # column-major world -> model
+        ("triangle_first", "i4"),  # first packed triangle of the instance
+        ("node_first", "i4"),  # root of the instance's BLAS
+        ("pad", "i4", (2,)),
+    ]
+)
+
+_TRAVERSAL_COST = 1.0  # relative to one primitive test
+
+# Deepest leaf build_bvh() produces (the root is depth 0). raytrace.comp
+# sizes its traversal stacks from it: pushing both children and popping
+# one holds at most BVH_MAX_DEPTH + 1 entries.
+BVH_MAX_DEPTH = 48
+
+
+@dataclass(frozen=True, slots=True)
+class Bvh:
+    """
+    Flattened bounding volume hierarchy.
+
+    Attributes:
+        nodes: (M,) BVH_NODE_DTYPE, root first.
+        order: (N,) primitive index per leaf slot; leaves address
+            primitives through this permutation.
+    """
+
+    nodes: np.ndarray
+    order: np.ndarray
+
+    @property
+    def bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Root (lo, hi); degenerate (+inf, -inf) for an empty hierarchy."""
+        if len(self.nodes) == 0:
+            inf = np.full(3, np.inf, dtype=np.float32)
+            return inf, -inf
+        return self.nodes["lo"][0], self.nodes["hi"][0]
+
+
+def triangle_bounds(triangles: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-triangle AABBs of (T, 3, 3+) corner arrays."""
+    corners = triangles[:, :3, :3]
+    return corners.min(axis=1), corners.max(axis=1)
+
+
+def transformed_bounds(
+    lo: np.ndarray, hi: np.ndarray, models: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    World AABBs of model-space boxes under (N, 4, 4) model matrices.
+
+    Args:
+        lo: (N, 3) model-space minimum.
+        hi: (N, 3) model-space maximum.
+        models: (N, 4, 4) matrices (translation in column 3).
+    """
+    center = (lo + hi) * 0.5
+    extent = (hi - lo) * 0.5
+    rot = models[:, :3, :3]
+    world_center = np.einsum("nij,nj->ni", rot, center) + models[:, :3, 3]
+    world_extent = np.einsum("nij,nj->ni", np.abs(rot), extent)
+    return world_center - world_extent, world_center + world_extent
+
+
+def build_bvh(
+    lo: np.ndarray,
+    hi: np.ndarray,
+    *,
+    leaf_size: int = 4,
+    bins: int = 16,
+    max_depth: int = BVH_MAX_DEPTH,
+) -> Bvh:
+    """
+    Build a BVH over primitive AABBs with the binned surface area heuristic.
+
+    At every node, primitive centroids are binned along each axis and the
+    bin boundary with the lowest SAH cost is chosen; a node becomes a leaf
+    when splitting is not cheaper than testing its primitives directly,
+    when it holds at most `leaf_size` of them, or at `max_depth`.
+
+    Args:
+        lo: (N, 3) primitive minimum corners.
+        hi: (N, 3) primitive maximum corners.
+        leaf_size: Primitive count at which nodes always become leaves.
+        bins: SAH bins per axis.
+        max_depth: Depth at which nodes always become leaves; skewed inputs
+            (e.g. exponentially spaced primitives) would go deeper.
+
+    Returns:
+        The flattened hierarchy; children of a node are adjacent.
+    """
+    lo = np.asarray(lo, dtype=np.float64).reshape(-1, 3)
+    hi = np.asarray(hi, dtype=np.float64).reshape(-1, 3)
+    n = len(lo)
+    order = np.arange(n, dtype=np.int64)
+    if n == 0:
+        return Bvh(np.zeros(0, dtype=BVH_NODE_DTYPE), order)
+
+    centroids = (lo + hi) * 0.5
+    nodes = np.zeros(max(1, 2 * n - 1), dtype=BVH_NODE_DTYPE)
+    used = 1
+
+    stack: List[Tuple[int, int, int, int]] = [(0, 0, n, 0)]
+    while stack:
+        index, start, end, depth = stack.pop()
+        prims = order[start:end]
+        node_lo = lo[prims].min(axis=0)
+        node_hi = hi[prims].max(axis=0)
+        node = nodes[index]
+        node["lo"] = node_lo
+        node["hi"] = node_hi
+
+        split = None
+        if end - start > leaf_size and depth < max_depth:
+            split = _best_split(
+                lo[prims], hi[prims], centroids[prims], node_lo, node_hi, bins
+            )
+
+        if split is None:
+            node["left_first"] = start
+            node["count"] = end - start
+            continue
+
+        left_mask = split
+        order[start:end] = np.concatenate(
+            (prims[left_mask], prims[~left_mask])
+        )
+        mid = start + int(np.count_nonzero(left_mask))
+
+        node["left_first"] = used
+        node["count"] = 0
+        stack.append((used + 1, mid, end, depth + 1))
+        stack.append((used, start, mid, depth + 1))
+        used += 2
+
+    return Bvh(nodes[:used].copy(), order)
+
+
+def _best_split(
+    lo: np.ndarray,
+    hi: np.ndarray,
+    centroids: np.ndarray,
+    node_lo: np.ndarray,
+    node_hi: np.ndarray,
+    bins: int,
+) -> Optional[np.ndarray]:
+    """Left-side mask of the cheapest SAH split, or None to keep a leaf."""
+    count = len(lo)
+    c_lo = centroids.min(axis=0)
+    extent = centroids.max(axis=0) - c_lo
+    splittable = extent > 0.0
+    if not splittable.any():
+        return None
+
+    # Bin all three axes at once: row `axis * bins + b` of the bin tables.
+    scale = np.where(splittable, bins / np.where(splittable, extent, 1.0), 0.0)
+    which = np.minimum(((centroids - c_lo) * scale).astype(np.int64), bins - 1)
+    keys = (which + np.arange(3) * bins).ravel()
+
+    counts = np.bincount(keys, minlength=3 * bins).reshape(3, bins)
+    bin_lo = np.full((3 * bins, 3), np.inf)
+    bin_hi = np.full((3 * bins, 3), -np.inf)
+    np.minimum.at(bin_lo, keys, np.repeat(lo, 3, axis=0))
+    np.maximum.at(bin_hi, keys, np.repeat(hi, 3, axis=0))
+    bin_lo = bin_lo.reshape(3, bins, 3)
+    bin_hi = bin_hi.reshape(3, bins, 3)
+
+    # Split i puts bins [0, i] left and (i, bins) right.
+    left_n = np.cumsum(counts, axis=1)[:, :-1]
+    right_n = count - left_n
+    left_area = _area(
+        np.minimum.accumulate(bin_lo, axis=1)[:, :-1],
+        np.maximum.accumulate(bin_hi, axis=1)[:, :-1],
+    )
+    right_area = _area(
+        np.minimum.accumulate(bin_lo[:, ::-1], axis=1)[:, ::-1][:, 1:],
+        np.maximum.accumulate(bin_hi[:, ::-1], axis=1)[:, ::-1][:, 1:],
+    )
+
+    valid = (left_n > 0) & (right_n > 0) & splittable[:, None]
+    if not valid.any():
+        return None
+
+    node_area = max(float(_area(node_lo, node_hi)), 1e-30)
+    cost = np.where(
+        valid,
+        _TRAVERSAL_COST + (left_n * left_area + right_n * right_area) / node_area,
+        np.inf,
+    )
+    axis, i = np.unravel_index(int(np.argmin(cost)), cost.shape)
+    if cost[axis, i] >= count:  # a leaf is cheaper
+        return None
+    return which[:, axis] <= i
+
+
+def _area(lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    d = np.maximum(hi - lo, 0.0)
+    return 2.0 * (
+        d[..., 0] * d[..., 1] + d[..., 1] * d[..., 2] + d[..., 2] * d[..., 0]
+    )
@@ -0,0 +1,191 @@
+# sparrow/graphics/helpers/instancing.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Sequence
+
+import moderngl
+import numpy as np
+
+from sparrow.graphics.assets.mesh_manager import InstanceLayout, MeshManager
+from sparrow.graphics.ecs.frame_submit import DrawItem
+from sparrow.graphics.graph.pass_base import RenderServices
+from sparrow.graphics.util.ids import MaterialId, MeshId
+
+INSTANCE_ATTRIBUTE = "in_instance"
+
+# glDraw*Indirect command, padded to the DrawElementsIndirectCommand size
+# so arrays and indexed meshes can share one command buffer:
+#   arrays:  count, instance_count, first,       base_instance, (pad)
+#   indexed: count, instance_count, first_index, base_vertex,   base_instance
+_COMMAND_WORDS = 5
+
+
+@dataclass(frozen=True, slots=True)
+class DrawGroup:
+    """A run of instances sharing one mesh and one material."""
+
+    mesh_id: MeshId
+    material_id: MaterialId
+    first: int  # first instance within InstanceBatch.slots
+    count: int
+
+
+@dataclass(frozen=True, slots=True)
+class InstanceBatch:
+    """
+    Draws grouped by (mesh, material), ready for instanced submission.
+
+    Attributes:
+        slots: (N,) uint32 InstanceStore slot per instance, grouped.
+        groups: Contiguous runs of `slots`, in first-submission order.
+        transient: Positions in `slots` whose draws have no persistent slot.
+        transient_models: (K, 4, 4) matrices for those positions.
+    """
+
+    slots: np.ndarray
+    groups: Sequence[DrawGroup]
+    transient: np.ndarray
+    transient_models: np.ndarray
+
+
+def build_instance_batch(
+    draws: Sequence[DrawItem], *, sorted_runs: bool = False
+) -> InstanceBatch:
+    """
+    Group draws by (mesh, material), keeping submission order inside groups.
+
+    With `sorted_runs` the draws are already in render-queue order (see
+    renderer.render_queue): each run of equal (mesh, material) becomes its
+    own group, so the order between groups is kept as well.
+
+    Pure CPU work; safe to call from `RenderPass.prepare()`.
+    """
+    n = len(draws)
+    group_of: Dict[tuple[Hashable, Hashable], int] = {}
+    keys: List[tuple[Hashable, Hashable]] = []
+
+    def group_index(draw: DrawItem) -> int:
+        key = (draw.mesh_id, draw.material_id)
+        idx = group_of.get(key)
+        if idx is None:
+            idx = group_of[key] = len(keys)
+            keys.append(key)
+        return idx
+
+    which = np.fromiter((group_index(d) for d in draws), np.int64, count=n)
+    slots = np.fromiter((d.instance for d in draws), np.int64, count=n)
+
+    if sorted_runs:
+        order = np.arange(n)
+        run_start = np.ones(n, dtype=bool)
+        run_start[1:] = which[1:] != which[:-1]
+        starts = np.flatnonzero(run_start)
+        counts = np.diff(np.append(starts, n))
+        keys = [keys[k] for k in which[starts].tolist()]
+    else:
+        order = np.argsort(which, kind="stable")
+        counts = np.bincount(which, minlength=len(keys))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    slots = slots[order]
+
+    groups = [
+        DrawGroup(MeshId(mesh), MaterialId(material), int(s), int(c))
+        for (mesh, material), s, c in zip(keys, starts.tolist(), counts.tolist())
+    ]
+
+    transient = np.flatnonzero(slots < 0)
+    transient_models = np.zeros((len(transient), 4, 4), dtype=np.float32)
+    for i, pos in enumerate(order[transient].tolist()):
+        transient_models[i] = draws[pos].model
+
+    return InstanceBatch(
+        slots=slots.astype(np.uint32),
+        groups=groups,
+        transient=transient,
+        transient_models=transient_models,
+    )
+
+
+class InstancedDrawer:
+    """
+    Per-pass instanced submission through the streaming buffer.
+
+    Each frame, `upload()` streams every group's slot indices and one
+    indirect command per group, whose base_instance points at the group's
+    run. `draw()` then issues a single instanced draw per group. The
+    vertex shader reads `in_instance` and fetches its model matrix from
+    the InstanceStore SSBO.
+    """
+
+    def __init__(self, mesh_manager: MeshManager) -> None:
+        self._mesh_manager = mesh_manager
+        self._buffer: moderngl.Buffer | None = None
+        self._command_buffer: moderngl.Buffer | None = None
+        self._first_command = 0
+        self.layout: InstanceLayout | None = None
+
+    def upload(self, batch: InstanceBatch, services: RenderServices) -> None:
+        """Resolve transient slots, stream instances and draw commands."""
+        store = services.instances
+        stream = services.stream
+        if store is None or stream is None:
+            raise RuntimeError(
+                "Instanced passes require RenderServices.instances and "
+                "RenderServices.stream"
+            )
+
+        slots = batch.slots
+        if len(batch.transient):
+            first = store.push_transient(batch.transient_models)
+            slots = slots.copy()
+            slots[batch.transient] = first + np.arange(
+                len(batch.transient), dtype=np.uint32
+            )
+        store.bind()
+
+        slot_alloc = stream.upload(slots, alignment=4)
+        base = slot_alloc.index(4)
+
+        commands = np.zeros((len(batch.groups), _COMMAND_WORDS), np.uint32)
+        for i, group in enumerate(batch.groups):
+            mesh = self._mesh_manager.get(group.mesh_id)
+            commands[i, 0] = mesh.draw_count
+            commands[i, 1] = group.count
+            # base_instance sits in word 3 for arrays, word 4 for elements.
+            commands[i, 4 if mesh.ibo is not None else 3] = base + group.first
+
+        command_alloc = stream.upload(commands, alignment=_COMMAND_WORDS * 4)
+        self._command_buffer = command_alloc.buffer
+        self._first_command = command_alloc.index(_COMMAND_WORDS * 4)
+
+        if slot_alloc.buffer is not self._buffer:
+            # The stream was reallocated; VAOs bound to the old one are stale.
+            if self._buffer is not None:
+                self._mesh_manager.release_instance_vaos(self._buffer)
+            self._buffer = slot_alloc.buffer
+            self.layout = InstanceLayout(
+                buffer=self._buffer,
+                format="1u /i",
+                attributes=(INSTANCE_ATTRIBUTE,),
+            )
+
+    def vao_for(
+        self, mesh_id: MeshId, program: moderngl.Program
+    ) -> moderngl.VertexArray:
+        return self._mesh_manager.vao_for(mesh_id, program, self.layout)
+
+    def draw(self, vao: moderngl.VertexArray, group_index: int) -> None:
+        assert self._command_buffer is not None
+        vao.render_indirect(
+            self._command_buffer,
+            moderngl.TRIANGLES,
+            count=1,
+            first=self._first_command + group_index,
+        )
+
+    def release(self) -> None:
+        if self._buffer is not None:
+            self._mesh_manager.release_instance_vaos(self._buffer)
+        self._buffer = self._command_buffer = None
+        self.layout = None
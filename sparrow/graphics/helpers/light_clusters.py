@@ -0,0 +1,235 @@
+# sparrow/graphics/helpers/light_clusters.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import moderngl
+import numpy as np
+
+from sparrow.graphics.ecs.frame_submit import CameraData, LightPoint
+from sparrow.graphics.renderer.stream_buffer import StreamingBuffer
+
+# Storage buffer bindings shared by every shader that shades clustered lights.
+LIGHT_BINDING = 11
+CLUSTER_BINDING = 12
+LIGHT_INDEX_BINDING = 13
+
+# std430 `PointLight` (32 bytes): position/radius, color/intensity.
+POINT_LIGHT_DTYPE = np.dtype(
+    [
+        ("position", "f4", (3,)),
+        ("radius", "f4"),
+        ("color", "f4", (3,)),
+        ("intensity", "f4"),
+    ]
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ClusterGrid:
+    """Froxel grid: screen tiles times exponential view-depth slices."""
+
+    tiles_x: int = 16
+    tiles_y: int = 9
+    slices: int = 24
+
+    @property
+    def count(self) -> int:
+        return self.tiles_x * self.tiles_y * self.slices
+
+
+@dataclass(frozen=True, slots=True)
+class LightClusters:
+    """
+    Lights binned into the froxels of one camera.
+
+    Cluster `(x, y, z)` is row `(z * tiles_y + y) * tiles_x + x` of
+    `clusters`, which holds the (offset, count) of its run in `indices`.
+
+    Attributes:
+        grid: Froxel grid dimensions.
+        lights: (L,) POINT_LIGHT_DTYPE records.
+        clusters: (C, 2) uint32 offset and count per cluster.
+        indices: (K,) uint32 light indices, grouped by cluster.
+        view_depth: (4,) row such that depth = dot(view_depth, (p_ws, 1)).
+        depth_scale: Slice of a depth d is floor(log(d) * scale + bias).
+        depth_bias: See `depth_scale`.
+    """
+
+    grid: ClusterGrid
+    lights: np.ndarray
+    clusters: np.ndarray
+    indices: np.ndarray
+    view_depth: np.ndarray
+    depth_scale: float
+    depth_bias: float
+
+    def lights_at(self, x: int, y: int, z: int) -> np.ndarray:
+        """Light indices of one cluster."""
+        g = self.grid
+        offset, count = self.clusters[(z * g.tiles_y + y) * g.tiles_x + x]
+        return self.indices[offset : offset + count]
+
+
+def build_light_clusters(
+    lights: Sequence[LightPoint],
+    camera: CameraData,
+    grid: ClusterGrid = ClusterGrid(),
+) -> LightClusters:
+    """
+    Assign point lights to the froxels their spheres may touch.
+
+    Each sphere is bounded by its view-space AABB, clamped to the
+    near/far planes. The AABB's corners are projected to find the covered
+    tiles and its depth range gives the covered slices; the light is
+    listed in every cluster of that box. Lights with radius <= 0 have
+    unbounded range and are listed everywhere.
+    """
+    near = max(float(camera.near), 1e-4)
+    far = max(float(camera.far), near * (1.0 + 1e-4))
+    depth_scale = grid.slices / np.log(far / near)
+    depth_bias = -np.log(near) * depth_scale
+    view = np.asarray(camera.view, dtype=np.float64)
+    view_depth = (-view[2]).astype(np.float32)
+
+    records = np.zeros(len(lights), dtype=POINT_LIGHT_DTYPE)
+    if not lights:
+        return LightClusters(
+            grid,
+            records,
+            np.zeros((grid.count, 2), dtype=np.uint32),
+            np.zeros(0, dtype=np.uint32),
+            view_depth,
+            float(depth_scale),
+            float(depth_bias),
+        )
+
+    for i, light in enumerate(lights):
+        records[i] = (
+            light.position_ws,
+            light.radius,
+            light.color_rgb[:3],
+            light.intensity,
+        )
+
+    radius = records["radius"].astype(np.float64)
+    center = records["position"].astype(np.float64) @ view[:3, :3].T + view[:3, 3]
+    depth = -center[:, 2]
+    bounded = radius > 0.0
+
+    z_near = np.where(bounded, np.maximum(depth - radius, near), near)
+    z_far = np.where(bounded, np.minimum(depth + radius, far), far)
+    visible = z_near <= z_far
+
+    s0 = _slice_of(z_near, depth_scale, depth_bias, grid.slices)
+    s1 = _slice_of(z_far, depth_scale, depth_bias, grid.slices)
+
+    x0, x1, y0, y1 = _tile_rect(
+        center, np.where(bounded, radius, 0.0), z_near, z_far, camera, grid
+    )
+    x0 = np.where(bounded, x0, 0)
+    y0 = np.where(bounded, y0, 0)
+    x1 = np.where(bounded, x1, grid.tiles_x - 1)
+    y1 = np.where(bounded, y1, grid.tiles_y - 1)
+    visible &= (x0 <= x1) & (y0 <= y1)
+
+    nx = np.where(visible, x1 - x0 + 1, 0)
+    ny = np.where(visible, y1 - y0 + 1, 0)
+    nz = np.where(visible, s1 - s0 + 1, 0)
+    volume = nx * ny * nz
+
+    # One entry per (light, cluster) pair, expanded without Python loops.
+    light_of = np.repeat(np.arange(len(lights)), volume)
+    local = np.arange(len(light_of)) - np.repeat(np.cumsum(volume) - volume, volume)
+    rx = np.repeat(nx, volume)
+    ry = np.repeat(ny, volume)
+    ix = local % rx
+    iy = (local // rx) % ry
+    iz = local // (rx * ry)
+    cluster = (
+        (np.repeat(s0, volume) + iz) * grid.tiles_y + np.repeat(y0, volume) + iy
+    ) * grid.tiles_x + np.repeat(x0, volume) + ix
+
+    order = np.argsort(cluster, kind="stable")
+    counts = np.bincount(cluster, minlength=grid.count)
+    table = np.empty((grid.count, 2), dtype=np.uint32)
+    table[:, 0] = np.cumsum(counts) - counts
+    table[:, 1] = counts
+
+    return LightClusters(
+        grid,
+        records,
+        table,
+        light_of[order].astype(np.uint32),
+        view_depth,
+        float(depth_scale),
+        float(depth_bias),
+    )
+
+
+def upload_light_clusters(
+    clusters: LightClusters,
+    stream: StreamingBuffer,
+    program: moderngl.Program,
+    viewport: Tuple[int, int],
+) -> None:
+    """Stream the cluster buffers and set the lookup uniforms of `program`."""
+    stream.upload(clusters.lights).bind_to_storage_buffer(LIGHT_BINDING)
+    stream.upload(clusters.clusters).bind_to_storage_buffer(CLUSTER_BINDING)
+    stream.upload(clusters.indices).bind_to_storage_buffer(LIGHT_INDEX_BINDING)
+
+    g = clusters.grid
+    values = {
+        "u_cluster_grid": (g.tiles_x, g.tiles_y, g.slices),
+        "u_cluster_tile_size": (
+            max(viewport[0], 1) / g.tiles_x,
+            max(viewport[1], 1) / g.tiles_y,
+        ),
+        "u_cluster_depth": (clusters.depth_scale, clusters.depth_bias),
+        "u_cluster_view_depth": tuple(float(v) for v in clusters.view_depth),
+    }
+    for name, value in values.items():
+        if name in program:
+            program[name].value = value
+
+
+def _slice_of(
+    depth: np.ndarray, scale: float, bias: float, slices: int
+) -> np.ndarray:
+    s = np.floor(np.log(np.maximum(depth, 1e-6)) * scale + bias)
+    return np.clip(s, 0, slices - 1).astype(np.int64)
+
+
+def _tile_rect(
+    center: np.ndarray,
+    radius: np.ndarray,
+    z_near: np.ndarray,
+    z_far: np.ndarray,
+    camera: CameraData,
+    grid: ClusterGrid,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Inclusive tile ranges covered by the clamped view-space AABBs."""
+    sx = np.array([-1.0, 1.0, -1.0, 1.0, -1.0, 1.0, -1.0, 1.0])
+    sy = np.array([-1.0, -1.0, 1.0, 1.0, -1.0, -1.0, 1.0, 1.0])
+    near_corner = np.array([True] * 4 + [False] * 4)
+
+    corners = np.empty((len(center), 8, 3))
+    corners[..., 0] = center[:, None, 0] + sx * radius[:, None]
+    corners[..., 1] = center[:, None, 1] + sy * radius[:, None]
+    corners[..., 2] = np.where(near_corner, -z_near[:, None], -z_far[:, None])
+
+    proj = np.asarray(camera.proj, dtype=np.float64)
+    clip_xy = corners @ proj[:2, :3].T + proj[:2, 3]
+    w = np.maximum(corners @ proj[3, :3] + proj[3, 3], 1e-9)
+    ndc = clip_xy / w[..., None]
+    lo = ndc.min(axis=1)
+    hi = ndc.max(axis=1)
+
+    tiles = np.array([grid.tiles_x, grid.tiles_y])
+    first = np.floor((lo * 0.5 + 0.5) * tiles).astype(np.int64)
+    last = np.floor((hi * 0.5 + 0.5) * tiles).astype(np.int64)
+    # Off-screen boxes end up with first > last after clamping.
+    first = np.maximum(first, 0)
+    last = np.minimum(last, tiles - 1)
+    return first[:, 0], last[:, 0], first[:, 1], last[:, 1]
@@ -0,0 +1,137 @@
+# sparrow/graphics/helpers/sky_lut_cache.py
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from sparrow.graphics.helpers.nishita import generate_nishita_sky_lut
+from sparrow.graphics.helpers.spectral_sky import generate_spectral_sky_lut
+from sparrow.graphics.util.blob_file import Buffer, read_blob_file, write_blob_file
+
+# A blob file holding the float32 pixels; the header records the key.
+_MAGIC = b"SPRSKY02"
+
+LutData = Buffer
+
+
+def _plain(value: Any) -> Any:
+    """Arguments as JSON values; numpy scalars and tuples included."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, (tuple, list, np.ndarray)):
+        return [_plain(v) for v in value]
+    return value
+
+
+class SkyLutCache:
+    """
+    Memoizes the sky LUT generators, in memory and optionally on disk.
+
+    A LUT is keyed by its generator, every argument (defaults included)
+    and the generator module's source, so editing the model invalidates
+    old entries. The newest `capacity` LUTs stay in an in-process LRU,
+    which suits time-of-day animation revisiting the same sun positions;
+    with a `directory`, results persist as raw float32 files that later
+    runs memory-map instead of ray marching again.
+    """
+
+    def __init__(
+        self, directory: Optional[str] = None, *, capacity: int = 8
+    ) -> None:
+        if capacity < 1:
+            raise ValueError("SkyLutCache capacity must be at least 1")
+        self._directory = Path(directory) if directory is not None else None
+        self._capacity = capacity
+        self._lru: OrderedDict[str, LutData] = OrderedDict()
+        self._source_digests: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    def spectral(self, **params: Any) -> LutData:
+        """`generate_spectral_sky_lut(**params)`, cached."""
+        return self.get(generate_spectral_sky_lut, **params)
+
+    def nishita(self, **params: Any) -> LutData:
+        """`generate_nishita_sky_lut(**params)`, cached."""
+        return self.get(generate_nishita_sky_lut, **params)
+
+    def get(self, generator: Callable[..., bytes], **params: Any) -> LutData:
+        """
+        Return `generator(**params)`, generating it only on a miss.
+
+        Raises:
+            TypeError: If `params` do not match the generator's signature.
+        """
+        bound = inspect.signature(generator).bind(**params)
+        bound.apply_defaults()
+        key_fields = {
+            "generator": f"{generator.__module__}.{generator.__qualname__}",
+            "source": self._source_digest(generator),
+            "params": _plain(dict(bound.arguments)),
+        }
+        key = hashlib.sha256(
+            json.dumps(key_fields, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+        data = self._lru.get(key)
+        if data is not None:
+            self._lru.move_to_end(key)
+            return data
+
+        data = self._load(key, key_fields)
+        if data is None:
+            data = generator(*bound.args, **bound.kwargs)
+            self._store(key, key_fields, data)
+
+        self._lru[key] = data
+        if len(self._lru) > self._capacity:
+            self._lru.popitem(last=False)
+        return data
+
+    def clear(self) -> None:
+        """Forget the in-memory entries; files on disk are kept."""
+        self._lru.clear()
+
+    def _source_digest(self, generator: Callable[..., bytes]) -> str:
+        module = generator.__module__
+        digest = self._source_digests.get(module)
+        if digest is None:
+            try:
+                source = Path(sys.modules[module].__file__ or "").read_bytes()
+            except (KeyError, OSError):
+                source = generator.__code__.co_code
+            digest = hashlib.sha256(source).hexdigest()
+            self._source_digests[module] = digest
+        return digest
+
+    def _path(self, key: str) -> Optional[Path]:
+        if self._directory is None:
+            return None
+        return self._directory / f"{key[:32]}.lut"
+
+    def _load(self, key: str, key_fields: Dict[str, Any]) -> Optional[LutData]:
+        path = self._path(key)
+        if path is None:
+            return None
+        entry = read_blob_file(path, _MAGIC)
+        if entry is None:
+            return None
+        header, blobs = entry
+        if header.get("key") != key_fields or len(blobs) != 1:
+            return None
+        return blobs[0]
+
+    def _store(self, key: str, key_fields: Dict[str, Any], data: LutData) -> None:
+        path = self._path(key)
+        if path is not None:
+            write_blob_file(path, _MAGIC, {"key": key_fields}, [data])
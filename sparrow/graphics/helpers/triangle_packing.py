@@ -0,0 +1,165 @@
+# sparrow/graphics/helpers/triangle_packing.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from sparrow.graphics.assets.material_manager import MaterialManager
+from sparrow.graphics.assets.mesh_manager import MeshManager
+from sparrow.graphics.ecs.frame_submit import DrawItem
+from sparrow.graphics.util.ids import MaterialId, MeshId
+
+# std430 `Triangle` of raytrace.comp, one float32 (4, 4) block per triangle:
+#   v0 (xyz, metallic), v1 (xyz, roughness), v2 (xyz, 0), albedo (rgb, 0)
+TRIANGLE_FLOATS = 16
+TRIANGLE_STRIDE = TRIANGLE_FLOATS * 4
+
+
+def pack_triangles(
+    out: np.ndarray,
+    local: np.ndarray,
+    model: np.ndarray,
+    material: np.ndarray,
+) -> None:
+    """
+    Write world-space triangles of one instance in the `Triangle` layout.
+
+    Args:
+        out: (T, 4, 4) float32 destination rows.
+        local: (T, 3, 3) model-space corners (MeshManager.triangles).
+        model: (4, 4) model matrix.
+        material: (6,) metallic, roughness, albedo rgb, 0.
+    """
+    m = np.asarray(model, dtype=np.float32)
+    out[:, :3, :3] = np.einsum("ij,tvj->tvi", m[:3, :3], local) + m[:3, 3]
+    out[:, 0, 3] = material[0]
+    out[:, 1, 3] = material[1]
+    out[:, 2, 3] = 0.0
+    out[:, 3, :] = material[2:]
+
+
+@dataclass(slots=True)
+class _PackedInstance:
+    mesh_id: str
+    model: np.ndarray  # copy; DrawItem.model may be a view that changes
+    material: np.ndarray
+    first: int
+    count: int
+
+    def matches(self, draw: DrawItem, material: np.ndarray) -> bool:
+        return (
+            self.mesh_id == draw.mesh_id
+            and np.array_equal(self.model, draw.model)
+            and np.array_equal(self.material, material)
+        )
+
+
+class TrianglePacker:
+    """
+    Persistent world-space triangle array for a list of draws.
+
+    Triangles of draw `i` follow those of draw `i - 1`. Each frame only the
+    draws whose mesh, model matrix, material parameters or position in the
+    array changed are re-transformed; `pack()` reports their rows so only
+    those ranges need to be uploaded again.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.triangles = np.zeros((capacity, 4, 4), dtype=np.float32)
+        self.count = 0
+        self.sequence = 0  # number of pack() calls so far
+        self._instances: List[_PackedInstance] = []
+
+    def pack(
+        self,
+        draws: Sequence[DrawItem],
+        meshes: MeshManager,
+        materials: MaterialManager,
+    ) -> List[Tuple[int, int]]:
+        """
+        Bring the array up to date with `draws`.
+
+        Returns:
+            Merged half-open triangle ranges that were rewritten. A consumer
+            that missed the previous pack() must re-upload everything.
+        """
+        material_rows: Dict[str, np.ndarray] = {}
+        local_of = []
+        total = 0
+        for draw in draws:
+            local = meshes.triangles(MeshId(draw.mesh_id))
+            local_of.append(local)
+            total += len(local)
+
+        if total > len(self.triangles):
+            capacity = max(total, 2 * len(self.triangles))
+            grown = np.zeros((capacity, 4, 4), dtype=np.float32)
+            grown[: self.count] = self.triangles[: self.count]
+            self.triangles = grown
+
+        dirty: List[Tuple[int, int]] = []
+        first = 0
+        for i, (draw, local) in enumerate(zip(draws, local_of)):
+            material = material_rows.get(draw.material_id)
+            if material is None:
+                material = material_rows[draw.material_id] = _material_row(
+                    materials, MaterialId(draw.material_id)
+                )
+
+            count = len(local)
+            prev = self._instances[i] if i < len(self._instances) else None
+            unchanged = (
+                prev is not None
+                and prev.first == first
+                and prev.count == count
+                and prev.matches(draw, material)
+            )
+            if not unchanged:
+                pack_triangles(
+                    self.triangles[first : first + count],
+                    local,
+                    draw.model,
+                    material,
+                )
+                entry = _PackedInstance(
+                    draw.mesh_id,
+                    np.array(draw.model, dtype=np.float32),
+                    material,
+                    first,
+                    count,
+                )
+                if prev is None:
+                    self._instances.append(entry)
+                else:
+                    self._instances[i] = entry
+                if dirty and dirty[-1][1] == first:
+                    dirty[-1] = (dirty[-1][0], first + count)
+                elif count:
+                    dirty.append((first, first + count))
+            first += count
+
+        del self._instances[len(draws) :]
+        self.count = total
+        self.sequence += 1
+        return dirty
+
+    def firsts(self) -> np.ndarray:
+        """First triangle row of each draw of the last pack(), in order."""
+        return np.fromiter(
+            (entry.first for entry in self._instances),
+            dtype=np.int32,
+            count=len(self._instances),
+        )
+
+
+def _material_row(
+    materials: MaterialManager, material_id: MaterialId
+) -> np.ndarray:
+    material = materials.get(material_id)
+    row = np.zeros(6, dtype=np.float32)
+    row[0] = material.metallic
+    row[1] = material.roughness
+    row[2:5] = material.albedo[:3]
+    return row
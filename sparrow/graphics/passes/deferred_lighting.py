@@ -1,9 +1,8 @@
 # sparrow/graphics/passes/deferred_lighting.py
 from __future__ import annotations
 
-import struct
-from dataclasses import dataclass
-from typing import Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Mapping
 
 import moderngl
 
@@ -22,36 +21,17 @@ from sparrow.graphics.graph.resources import (
     expect_resource,
 )
 from sparrow.graphics.helpers.fullscreen import create_fullscreen_triangle
+from sparrow.graphics.helpers.light_clusters import (
+    ClusterGrid,
+    build_light_clusters,
+    upload_light_clusters,
+)
 from sparrow.graphics.renderer.settings import DeferredRendererSettings
 from sparrow.graphics.shaders.program_types import ShaderStages
 from sparrow.graphics.shaders.shader_manager import ShaderRequest
 from sparrow.graphics.util.ids import PassId, ResourceId, ShaderId
 
 
-def _pack_vec4_array(
-    values: Sequence[tuple[float, float, float, float]], *, max_len: int
-) -> bytes:
-    """
-    Pack a list of vec4 into tightly packed float32 bytes, padded to max_len.
-
-    Args:
-        values: Vec4 tuples.
-        max_len: Fixed array length expected by shader.
-
-    Returns:
-        Bytes suitable for moderngl.Uniform.write().
-    """
-    out = bytearray()
-    n = min(len(values), max_len)
-    for i in range(n):
-        x, y, z, w = values[i]
-        out += struct.pack("4f", float(x), float(y), float(z), float(w))
-    # pad remaining
-    for _ in range(max_len - n):
-        out += struct.pack("4f", 0.0, 0.0, 0.0, 0.0)
-    return bytes(out)
-
-
 @dataclass(kw_only=True)
 class DeferredLightingPass(RenderPass):
     """
@@ -73,16 +53,11 @@ class DeferredLightingPass(RenderPass):
     g_depth: ResourceId
 
     features: PassFeatures = PassFeatures.CAMERA | PassFeatures.SUN | PassFeatures.TIME
+    cluster_grid: ClusterGrid = field(default_factory=ClusterGrid)
 
     _vao: moderngl.VertexArray | None = None
     _fs_vbo: moderngl.Buffer | None = None
 
-    _u_light_count: moderngl.Uniform | None = None
-    _u_light_pos_radius: moderngl.Uniform | None = None
-    _u_light_color_intensity: moderngl.Uniform | None = None
-
-    _max_lights: int = 64
-
     @property
     def output_target(self) -> ResourceId | None:
         return self.light_accum
@@ -127,17 +102,6 @@ class DeferredLightingPass(RenderPass):
         vbo = create_fullscreen_triangle(ctx)
         vao = ctx.vertex_array(prog, [(vbo, "2f", "in_pos")])
 
-        # Cache uniforms with explicit type asserts to satisfy type checkers/stubs
-        u_light_count = prog.get("u_light_count", None)
-        u_light_pos_radius = prog.get("u_light_pos_radius", None)
-        u_light_color_intensity = prog.get("u_light_color_intensity", None)
-        if not isinstance(u_light_count, moderngl.Uniform):
-            raise RuntimeError("Missing uniform u_light_count")
-        if not isinstance(u_light_pos_radius, moderngl.Uniform):
-            raise RuntimeError("Missing uniform u_light_pos_radius")
-        if not isinstance(u_light_color_intensity, moderngl.Uniform):
-            raise RuntimeError("Missing uniform u_light_color_intensity")
-
         for name in ["u_g_albedo", "u_g_normal", "u_g_orm", "u_g_depth"]:
             if name not in prog or not isinstance(prog[name], moderngl.Uniform):
                 raise RuntimeError(f"Missing uniform {name}")
@@ -155,10 +119,6 @@ class DeferredLightingPass(RenderPass):
         self._vao = vao
         self._fs_vbo = vbo
 
-        self._u_light_count = u_light_count
-        self._u_light_pos_radius = u_light_pos_radius
-        self._u_light_color_intensity = u_light_color_intensity
-
     def execute(self, exec_ctx: PassExecutionContext) -> None:
         self.execute_base(exec_ctx)
 
@@ -173,8 +133,9 @@ class DeferredLightingPass(RenderPass):
         out_fbo = out_fbo_res.handle
         out_fbo.use()
 
-        # Ensure viewport matches internal target
-        gl.viewport = (0, 0, out_fbo.size[0], out_fbo.size[1])
+        # Ensure viewport matches the drawn region of the internal target
+        render_size = exec_ctx.render_size(*out_fbo.size)
+        gl.viewport = (0, 0, *render_size)
 
         # State: lighting pass is screen-space
         gl.disable(moderngl.CULL_FACE | moderngl.BLEND)
@@ -200,41 +161,18 @@ class DeferredLightingPass(RenderPass):
         # Program + uniforms
         assert self._vao is not None
         assert isinstance(self._program, moderngl.Program)
-        assert self._u_light_count is not None
-        assert self._u_light_pos_radius is not None
-        assert self._u_light_color_intensity is not None
-
-        lights = exec_ctx.frame.point_lights
-        n = min(len(lights), self._max_lights)
-        self._u_light_count.value = n
-
-        pos_radius: list[tuple[float, float, float, float]] = []
-        col_int: list[tuple[float, float, float, float]] = []
-        for i in range(n):
-            lp = lights[i]
-            pos_radius.append(
-                (
-                    float(lp.position_ws[0]),
-                    float(lp.position_ws[1]),
-                    float(lp.position_ws[2]),
-                    float(lp.radius),
-                )
-            )
-            col_int.append(
-                (
-                    float(lp.color_rgb[0]),
-                    float(lp.color_rgb[1]),
-                    float(lp.color_rgb[2]),
-                    float(lp.intensity),
-                )
-            )
-
-        self._u_light_pos_radius.write(
-            _pack_vec4_array(pos_radius, max_len=self._max_lights)
-        )
-        self._u_light_color_intensity.write(
-            _pack_vec4_array(col_int, max_len=self._max_lights)
+
+        # Point lights, binned into froxels of this view
+        stream = exec_ctx.services.stream
+        if stream is None:
+            raise RuntimeError("DeferredLightingPass requires RenderServices.stream")
+        frame = exec_ctx.frame
+        clusters = build_light_clusters(
+            frame.point_lights, frame.camera, self.cluster_grid
         )
+        upload_light_clusters(clusters, stream, self._program, render_size)
+        if "u_uv_scale" in self._program:
+            self._program["u_uv_scale"].value = exec_ctx.uv_scale(*out_fbo.size)
 
         self._vao.render(mode=moderngl.TRIANGLES)
 
@@ -247,6 +185,3 @@ class DeferredLightingPass(RenderPass):
         self._program = None
         self._vao = None
         self._fs_vbo = None
-        self._u_light_count = None
-        self._u_light_pos_radius = None
-        self._u_light_color_intensity = None
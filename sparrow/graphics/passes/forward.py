@@ -1,13 +1,12 @@
 # sparrow/graphics/passes/forward.py
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Mapping, Optional
 
 import moderngl
-import numpy as np
 
-from sparrow.graphics.ecs.frame_submit import LightPoint
+from sparrow.graphics.ecs.frame_submit import RenderFrameInput
 from sparrow.graphics.graph.pass_base import (
     PassBuildInfo,
     PassExecutionContext,
@@ -21,16 +20,20 @@ from sparrow.graphics.graph.resources import (
     GraphResource,
     expect_resource,
 )
+from sparrow.graphics.helpers.instancing import (
+    InstanceBatch,
+    InstancedDrawer,
+    build_instance_batch,
+)
+from sparrow.graphics.helpers.light_clusters import (
+    ClusterGrid,
+    build_light_clusters,
+    upload_light_clusters,
+)
 from sparrow.graphics.renderer.settings import ForwardRendererSettings
 from sparrow.graphics.shaders.program_types import ShaderStages
 from sparrow.graphics.shaders.shader_manager import ShaderRequest
-from sparrow.graphics.util.ids import (
-    MaterialId,
-    MeshId,
-    PassId,
-    ResourceId,
-    ShaderId,
-)
+from sparrow.graphics.util.ids import PassId, ResourceId, ShaderId
 
 
 @dataclass(kw_only=True)
@@ -42,10 +45,9 @@ class ForwardPass(RenderPass):
     depth_tex: ResourceId
 
     features: PassFeatures = PassFeatures.CAMERA
+    cluster_grid: ClusterGrid = field(default_factory=ClusterGrid)
 
-    _u_model: moderngl.Uniform | None = None
-    _u_light_color: moderngl.Uniform | None = None
-    _u_light_pos: moderngl.Uniform | None = None
+    _drawer: InstancedDrawer | None = None
 
     _u_mat_albedo: moderngl.Uniform | None = None
     _u_mat_roughness: moderngl.Uniform | None = None
@@ -102,10 +104,6 @@ class ForwardPass(RenderPass):
                 "ForwardPass requires a graphics Program, not a ComputeShader"
             )
 
-        self._u_model: moderngl.Uniform = prog.get("u_model", None)
-        self._u_light_color: moderngl.Uniform = prog.get("u_light_color", None)
-        self._u_light_pos: moderngl.Uniform = prog.get("u_light_pos", None)
-
         self._u_mat_albedo: moderngl.Uniform = prog.get(
             "u_material.albedo", None
         )
@@ -116,11 +114,18 @@ class ForwardPass(RenderPass):
             "u_material.metallic", None
         )
 
+        self._drawer = InstancedDrawer(services.mesh_manager)
+
         self._program = prog
         super().on_graph_compiled(
             ctx=ctx, resources=resources, services=services
         )
 
+    def prepare(self, frame: RenderFrameInput) -> InstanceBatch:
+        return build_instance_batch(
+            frame.draws, sorted_runs=frame.draw_sort_keys is not None
+        )
+
     def execute(self, exec_ctx: PassExecutionContext) -> None:
         self.execute_base(exec_ctx)
 
@@ -133,67 +138,62 @@ class ForwardPass(RenderPass):
             )
             fbo = fbo_res.handle
             fbo.use()
+            viewport = exec_ctx.render_size(*fbo.size)
         else:
             gl.screen.use()
+            viewport = (exec_ctx.viewport_width, exec_ctx.viewport_height)
 
-        gl.viewport = (0, 0, exec_ctx.viewport_width, exec_ctx.viewport_height)
+        gl.viewport = (0, 0, *viewport)
 
         gl.enable(moderngl.DEPTH_TEST)
         gl.clear()
 
         assert isinstance(self._program, moderngl.Program)
-        assert self._u_model
-
-        light_color = (0.0, 0.0, 0.0)
-        light_pos = (0.0, 0.0, 0.0)
-        if exec_ctx.frame.point_lights:
-            li: LightPoint = exec_ctx.frame.point_lights[0]
-            light_color = (
-                li.color_rgb[0],
-                li.color_rgb[1],
-                li.color_rgb[2],
-            )
-            light_pos = (
-                li.position_ws[0],
-                li.position_ws[1],
-                li.position_ws[2],
-            )
-            light_intensity: float = li.intensity
+        assert self._drawer is not None
 
-        if self._u_light_color:
-            self._u_light_color.value = [
-                c * light_intensity for c in light_color
-            ]
-
-        if self._u_light_pos:
-            self._u_light_pos.value = light_pos
-
-        for draw in exec_ctx.frame.draws:
-            mesh_id = MeshId(draw.mesh_id)
-            material_id = MaterialId(draw.material_id)
-            material = services.material_manager.get(material_id)
-
-            self._u_model.write(draw.model.astype(np.float32).T.tobytes())
-
-            if self._u_mat_albedo is not None:
-                color = getattr(material, "albedo", (1.0, 1.0, 1.0))
-                self._u_mat_albedo.value = color
-            if self._u_mat_roughness:
-                self._u_mat_roughness.value = getattr(
-                    material, "roughness", 0.5
-                )
-
-            if self._u_mat_metallic:
-                self._u_mat_metallic.value = getattr(material, "metallic", 0.0)
-
-            vao = services.mesh_manager.vao_for(mesh_id, self._program)
-            vao.render()
+        if services.stream is None:
+            raise RuntimeError("ForwardPass requires RenderServices.stream")
+        frame = exec_ctx.frame
+        clusters = build_light_clusters(
+            frame.point_lights, frame.camera, self.cluster_grid
+        )
+        upload_light_clusters(clusters, services.stream, self._program, viewport)
+
+        batch: InstanceBatch = self.prepared_for(exec_ctx)
+        self._drawer.upload(batch, services)
+
+        # Groups arrive in queue order; only touch state when it changes.
+        material_id = mesh_id = None
+        vao = None
+        for i, group in enumerate(batch.groups):
+            if group.material_id != material_id:
+                material_id = group.material_id
+                material = services.material_manager.get(material_id)
+
+                if self._u_mat_albedo is not None:
+                    color = getattr(material, "albedo", (1.0, 1.0, 1.0))
+                    self._u_mat_albedo.value = color
+                if self._u_mat_roughness:
+                    self._u_mat_roughness.value = getattr(
+                        material, "roughness", 0.5
+                    )
+
+                if self._u_mat_metallic:
+                    self._u_mat_metallic.value = getattr(
+                        material, "metallic", 0.0
+                    )
+
+            if group.mesh_id != mesh_id:
+                mesh_id = group.mesh_id
+                vao = self._drawer.vao_for(mesh_id, self._program)
+            assert vao is not None
+            self._drawer.draw(vao, i)
 
     def on_graph_destroyed(self) -> None:
         self._program = None
-        self._u_model = None
-        self._u_light_color = None
-        self._u_light_pos = None
+        if self._drawer is not None:
+            self._drawer.release()
+            self._drawer = None
         self._u_mat_albedo = None
         self._u_mat_roughness = None
         self._u_mat_metallic = None
@@ -5,9 +5,9 @@ from dataclasses import dataclass
 from typing import Mapping, Optional
 
 import moderngl
-import numpy as np
 
 from sparrow.graphics.assets.material_manager import Material
+from sparrow.graphics.ecs.frame_submit import RenderFrameInput
 from sparrow.graphics.graph.pass_base import (
     PassBuildInfo,
     PassExecutionContext,
@@ -20,15 +20,14 @@ from sparrow.graphics.graph.resources import (
     GraphResource,
     expect_resource,
 )
+from sparrow.graphics.helpers.instancing import (
+    InstanceBatch,
+    InstancedDrawer,
+    build_instance_batch,
+)
 from sparrow.graphics.shaders.program_types import ShaderStages
 from sparrow.graphics.shaders.shader_manager import ShaderRequest
-from sparrow.graphics.util.ids import (
-    MaterialId,
-    MeshId,
-    PassId,
-    ResourceId,
-    ShaderId,
-)
+from sparrow.graphics.util.ids import PassId, ResourceId, ShaderId
 
 
 @dataclass(slots=True)
@@ -57,9 +56,8 @@ class ForwardUnlitPass(RenderPass):
     depth_target: Optional[ResourceId] = None
 
     _program: moderngl.Program | None = None
-    _u_view_proj: moderngl.Uniform | None = None
-    _u_model: moderngl.Uniform | None = None
     _u_albedo: moderngl.Uniform | None = None
+    _drawer: InstancedDrawer | None = None
     _fbo_rid: ResourceId | None = None
 
     @property
@@ -106,26 +104,12 @@ class ForwardUnlitPass(RenderPass):
 
         self._program = prog_handle.program
 
-        self._u_view_proj = self._program["u_view_proj"]
-        self._u_model = self._program["u_model"]
-        self._u_albedo = self._program["u_albedo"]
-
-        if (
-            self._u_view_proj is None
-            or self._u_model is None
-            or self._u_albedo is None
-        ):
-            missing = [
-                name
-                for name, u in (
-                    ("u_view_proj", self._u_view_proj),
-                    ("u_model", self._u_model),
-                    ("u_albedo", self._u_albedo),
-                )
-                if u is None
-            ]
+        # u_view_proj comes from the graph's FrameConstants block.
+        self._u_albedo = self._program.get("u_albedo", None)
+
+        if self._u_albedo is None:
             raise RuntimeError(
-                f"ForwardPass missing required uniforms: {missing}"
+                "ForwardPass missing required uniforms: ['u_albedo']"
             )
 
         if self.color_target:
@@ -137,13 +121,19 @@ class ForwardUnlitPass(RenderPass):
         else:
             self._fbo_rid = None
 
+        self._drawer = InstancedDrawer(services.mesh_manager)
+
+    def prepare(self, frame: RenderFrameInput) -> InstanceBatch:
+        return build_instance_batch(
+            frame.draws, sorted_runs=frame.draw_sort_keys is not None
+        )
+
     def execute(self, exec_ctx: PassExecutionContext) -> None:
         if self._program is None:
             raise RuntimeError("ForwardPass not compiled (missing program)")
 
         gl = exec_ctx.gl
         services = exec_ctx.services
-        frame = exec_ctx.frame
 
         if self.output_target is None:
             gl.screen.use()
@@ -164,40 +154,37 @@ class ForwardUnlitPass(RenderPass):
             fbo = fbo_res.handle
             fbo.use()
 
-            gl.viewport = (
-                0,
-                0,
-                exec_ctx.viewport_width,
-                exec_ctx.viewport_height,
-            )
+            gl.viewport = (0, 0, *exec_ctx.render_size(*fbo.size))
             fbo.clear()
 
         gl.enable(moderngl.DEPTH_TEST)
         gl.disable(moderngl.BLEND)
 
-        assert self._u_view_proj is not None
-        self._u_view_proj.write(
-            frame.camera.view_proj.astype(np.float32).T.tobytes()
-        )
-
-        assert self._u_model is not None
         assert self._u_albedo is not None
-
-        for di in frame.draws:
-            mesh_id = MeshId(di.mesh_id)
-            mat_id = MaterialId(di.material_id)
-
-            mat: Material = services.material_manager.get(mat_id)
-
-            self._u_model.write(di.model.astype(np.float32).T.tobytes())
-            self._u_albedo.value = mat.albedo
-
-            vao = services.mesh_manager.vao_for(mesh_id, self._program)
-            vao.render(mode=moderngl.TRIANGLES)
+        assert self._drawer is not None
+
+        batch: InstanceBatch = self.prepared_for(exec_ctx)
+        self._drawer.upload(batch, services)
+
+        # Groups arrive in queue order; only touch state when it changes.
+        material_id = mesh_id = None
+        vao = None
+        for i, group in enumerate(batch.groups):
+            if group.material_id != material_id:
+                material_id = group.material_id
+                mat: Material = services.material_manager.get(material_id)
+                self._u_albedo.value = mat.albedo
+
+            if group.mesh_id != mesh_id:
+                mesh_id = group.mesh_id
+                vao = self._drawer.vao_for(mesh_id, self._program)
+            assert vao is not None
+            self._drawer.draw(vao, i)
 
     def on_graph_destroyed(self) -> None:
         self._program = None
-        self._u_view_proj = None
-        self._u_model = None
         self._u_albedo = None
+        if self._drawer is not None:
+            self._drawer.release()
+            self._drawer = None
         self._fbo_rid = None
@@ -32,6 +32,14 @@ class FraunhoferBloomPass(RenderPass):
 
     _program: moderngl.ComputeShader | None = None
 
+    @property
+    def writes_screen(self) -> bool:
+        return False  # compute only
+
+    @property
+    def bypass(self) -> Mapping[ResourceId, ResourceId]:
+        return {self.output_bloom: self.input_hdr}  # disabled: no bloom
+
     def build(self) -> PassBuildInfo:
         return PassBuildInfo(
             pass_id=self.pass_id,
@@ -82,7 +90,9 @@ class FraunhoferBloomPass(RenderPass):
         if "u_aperture" in self._program:
             self._program["u_aperture"] = 1
 
-        w, h = out_tex.desc.width, out_tex.desc.height
+        w, h = exec_ctx.render_size(out_tex.desc.width, out_tex.desc.height)
+        if "u_render_size" in self._program:
+            self._program["u_render_size"] = (w, h)
         gw, gh = 16, 16
 
         nx = int(math.ceil(w / gw))
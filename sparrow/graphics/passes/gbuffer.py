@@ -5,8 +5,8 @@ from dataclasses import dataclass
 from typing import Mapping
 
 import moderngl
-import numpy as np
 
+from sparrow.graphics.ecs.frame_submit import RenderFrameInput
 from sparrow.graphics.graph.pass_base import (
     PassBuildInfo,
     PassExecutionContext,
@@ -20,16 +20,15 @@ from sparrow.graphics.graph.resources import (
     GraphResource,
     expect_resource,
 )
+from sparrow.graphics.helpers.instancing import (
+    InstanceBatch,
+    InstancedDrawer,
+    build_instance_batch,
+)
 from sparrow.graphics.renderer.settings import DeferredRendererSettings
 from sparrow.graphics.shaders.program_types import ShaderStages
 from sparrow.graphics.shaders.shader_manager import ShaderRequest
-from sparrow.graphics.util.ids import (
-    MaterialId,
-    MeshId,
-    PassId,
-    ResourceId,
-    ShaderId,
-)
+from sparrow.graphics.util.ids import PassId, ResourceId, ShaderId
 
 
 @dataclass(kw_only=True)
@@ -54,7 +53,7 @@ class GBufferPass(RenderPass):
 
     features: PassFeatures = PassFeatures.CAMERA
 
-    _u_model: moderngl.Uniform | None = None
+    _drawer: InstancedDrawer | None = None
     _u_albedo: moderngl.Uniform | None = None
     _u_roughness: moderngl.Uniform | None = None
     _u_metalness: moderngl.Uniform | None = None
@@ -102,19 +101,26 @@ class GBufferPass(RenderPass):
         if not isinstance(prog, moderngl.Program):
             raise RuntimeError("GBufferPass requires a graphics Program")
 
-        if "u_model" not in prog:
-            raise RuntimeError("Missing uniform u_model")
-        self._u_model: moderngl.Uniform = prog["u_model"]
+        if "in_instance" not in prog:
+            raise RuntimeError("Missing instance attribute in_instance")
 
         self._u_albedo: moderngl.Uniform = prog.get("u_albedo", None)
         self._u_roughness: moderngl.Uniform = prog.get("u_roughness", None)
         self._u_metalness: moderngl.Uniform = prog.get("u_metalness", None)
 
+        self._drawer = InstancedDrawer(services.mesh_manager)
+
         self._program = prog
         super().on_graph_compiled(
             ctx=ctx, resources=resources, services=services
         )
 
+    def prepare(self, frame: RenderFrameInput) -> InstanceBatch:
+        """Group the draw list into instanced (mesh, material) batches."""
+        return build_instance_batch(
+            frame.draws, sorted_runs=frame.draw_sort_keys is not None
+        )
+
     def execute(self, exec_ctx: PassExecutionContext) -> None:
         """Render draw list into the GBuffer framebuffer."""
         self.execute_base(exec_ctx)
@@ -127,39 +133,54 @@ class GBufferPass(RenderPass):
         fbo = fbo_res.handle
         fbo.use()
 
-        gl.viewport = (0, 0, fbo.size[0], fbo.size[1])
+        gl.viewport = (0, 0, *exec_ctx.render_size(*fbo.size))
 
         gl.enable(moderngl.DEPTH_TEST)
         gl.disable(moderngl.BLEND)
         gl.clear()
 
         assert isinstance(self._program, moderngl.Program)
-        assert self._u_model is not None
+        assert self._drawer is not None
 
         services = exec_ctx.services
 
-        for draw in exec_ctx.frame.draws:
-            mesh_id = MeshId(draw.mesh_id)
-            material_id = MaterialId(draw.material_id)
-
-            material = services.material_manager.get(material_id)
-
-            self._u_model.write(draw.model.astype(np.float32).T.tobytes())
-
-            if self._u_albedo is not None and hasattr(material, "albedo"):
-                self._u_albedo.value = material.albedo
-            if self._u_roughness is not None and hasattr(material, "roughness"):
-                self._u_roughness.value = material.roughness
-            if self._u_metalness is not None and hasattr(material, "metalness"):
-                self._u_metalness.value = material.metalness
-
-            vao = services.mesh_manager.vao_for(mesh_id, self._program)
-            vao.render()
+        batch: InstanceBatch = self.prepared_for(exec_ctx)
+        self._drawer.upload(batch, services)
+
+        # Groups arrive in queue order; only touch state when it changes.
+        material_id = mesh_id = None
+        vao = None
+        for i, group in enumerate(batch.groups):
+            if group.material_id != material_id:
+                material_id = group.material_id
+                material = services.material_manager.get(material_id)
+
+                if self._u_albedo is not None and hasattr(material, "albedo"):
+                    albedo = tuple(material.albedo)
+                    if len(albedo) == 3:
+                        albedo += (1.0,)
+                    self._u_albedo.value = albedo
+                if self._u_roughness is not None and hasattr(
+                    material, "roughness"
+                ):
+                    self._u_roughness.value = material.roughness
+                if self._u_metalness is not None and hasattr(
+                    material, "metalness"
+                ):
+                    self._u_metalness.value = material.metalness
+
+            if group.mesh_id != mesh_id:
+                mesh_id = group.mesh_id
+                vao = self._drawer.vao_for(mesh_id, self._program)
+            assert vao is not None
+            self._drawer.draw(vao, i)
 
     def on_graph_destroyed(self) -> None:
         """Release any cached state owned by the pass (if applicable)."""
         self._program = None
-        self._u_model = None
+        if self._drawer is not None:
+            self._drawer.release()
+            self._drawer = None
         self._u_albedo = None
         self._u_roughness = None
         self._u_metalness = None
@@ -1,13 +1,16 @@
 # sparrow/graphics/passes/polygon_2d.py
-import struct
-from collections import defaultdict
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Sequence
 
 import moderngl
 import numpy as np
-from glm import e
 
+from sparrow.graphics.ecs.frame_submit import (
+    POLYGON_INSTANCE_DTYPE,
+    PolygonDrawItem,
+    RenderFrameInput,
+)
+from sparrow.graphics.ecs.polygon_shapes import PolygonShapes
 from sparrow.graphics.graph.pass_base import (
     PassBuildInfo,
     PassExecutionContext,
@@ -24,8 +27,44 @@ from sparrow.graphics.shaders.shader_manager import ShaderRequest
 from sparrow.graphics.util.ids import ResourceId, ShaderId
 
 
+# glDrawArraysIndirect command (count, instance_count, first, base_instance),
+# padded to the 20-byte stride moderngl uses for indirect buffers.
+_COMMAND_WORDS = 5
+
+
+@dataclass(frozen=True, slots=True)
+class PolygonBatch:
+    """
+    Per-frame polygon submission prepared off the render thread.
+
+    Attributes:
+        records: (N,) POLYGON_INSTANCE_DTYPE, sorted by layer.
+        commands: (N, 5) uint32 indirect draw commands, one per record.
+        runs: (first_command, command_count) per draw call.
+        shapes: Registry the records' shape ids refer to.
+    """
+
+    records: np.ndarray
+    commands: np.ndarray
+    runs: Sequence[tuple[int, int]]
+    shapes: PolygonShapes
+
+
 @dataclass(kw_only=True)
 class Polygon2DPass(RenderPass):
+    """
+    Draws polygon outlines from a retained shape arena.
+
+    Each distinct outline is uploaded once, in model space, into a shared
+    storage buffer. Per frame only one compact instance record per polygon
+    (2D affine, color, width) and its indirect command are written to the
+    shared streaming buffer; the vertex shader applies the
+    transform and expands every segment into a screen-space quad of the
+    polygon's stroke width, so widths are not limited by `gl.line_width`.
+    Each layer is issued as one multi-draw indirect call, split into
+    chunks of at most BATCH_SIZE vertices.
+    """
+
     color_target: Optional[ResourceId] = None
 
     features: PassFeatures = PassFeatures.CAMERA | PassFeatures.RESOLUTION
@@ -33,10 +72,20 @@ class Polygon2DPass(RenderPass):
     _program: moderngl.Program | None = None
     _fbo_rid: ResourceId | None = None
 
-    _vbo: moderngl.Buffer | None = None
+    _arena: moderngl.Buffer | None = None
+    _arena_shapes: PolygonShapes | None = None
+    _arena_sequence: int = 0  # PolygonShapes.sequence last uploaded
     _vao: moderngl.VertexArray | None = None
+    _vao_buffer: moderngl.Buffer | None = None  # stream buffer behind _vao
+
+    # Shapes of frames that carry PolygonDrawItems only, and the ids the
+    # previous such frame holds references to.
+    _shapes: PolygonShapes | None = None
+    _item_shapes: np.ndarray | None = None
 
-    BATCH_SIZE = 100_000
+    BATCH_SIZE = 100_000  # vertices per draw call
+    ARENA_BINDING = 9  # std430 storage binding of the shape arena
+    INITIAL_CAPACITY = 1024
 
     @property
     def output_target(self) -> ResourceId | None:
@@ -80,11 +129,53 @@ class Polygon2DPass(RenderPass):
         else:
             self._fbo_rid = None
 
-        self._vbo = ctx.buffer(reserve=self.BATCH_SIZE * 24, dynamic=True)
-        self._vao = ctx.vertex_array(
-            self._program,
-            [(self._vbo, "2f 4f", "in_position", "in_color")],
+        self._arena = ctx.buffer(
+            reserve=self.INITIAL_CAPACITY * 8 * 8, dynamic=True
         )
+        self._arena_shapes = None
+        self._arena_sequence = 0
+
+    def prepare(self, frame: RenderFrameInput) -> PolygonBatch:
+        """
+        Sort instance records into per-layer runs and build one indirect
+        draw command per polygon (six vertices per outline segment).
+        """
+        records = frame.polygon_instances
+        shapes = frame.polygon_shapes
+        if records is None or shapes is None:
+            if self._shapes is None:
+                self._shapes = PolygonShapes()
+            shapes = self._shapes
+            records = _pack_items(frame.polygons, shapes)
+            # Acquire this frame's outlines before dropping the last
+            # frame's, so unchanged ones are not freed and re-uploaded.
+            if self._item_shapes is not None:
+                shapes.release_many(self._item_shapes.tolist())
+            self._item_shapes = records["shape"].copy()
+
+        first, counts = shapes.first, shapes.counts
+        records = records[counts[records["shape"]] > 0]
+        records = records[np.argsort(records["layer"], kind="stable")]
+
+        # Arena entries are LINES endpoint pairs; each pair becomes a quad.
+        n = len(records)
+        shape = records["shape"]
+        commands = np.zeros((n, _COMMAND_WORDS), dtype=np.uint32)
+        commands[:, 0] = 3 * counts[shape]
+        commands[:, 1] = 1
+        commands[:, 2] = 3 * first[shape]
+        commands[:, 3] = np.arange(n)
+
+        layer = records["layer"]
+        breaks = np.flatnonzero(layer[1:] != layer[:-1]) + 1
+        starts = np.concatenate(([0], breaks)).tolist()
+        stops = np.concatenate((breaks, [n])).tolist()
+
+        vertices = np.cumsum(commands[:, 0], dtype=np.int64)
+        runs = []
+        for start, stop in zip(starts, stops):
+            runs.extend(_chunk(vertices, start, stop, self.BATCH_SIZE))
+        return PolygonBatch(records, commands, runs, shapes)
 
     def execute(self, exec_ctx: PassExecutionContext) -> None:
         if not self._program:
@@ -93,7 +184,6 @@ class Polygon2DPass(RenderPass):
         self.execute_base(exec_ctx)
 
         gl = exec_ctx.gl
-        frame = exec_ctx.frame
 
         if self.output_target is None:
             gl.screen.use()
@@ -106,71 +196,80 @@ class Polygon2DPass(RenderPass):
 
         w, h = exec_ctx.viewport_width, exec_ctx.viewport_height
         gl.viewport = (0, 0, w, h)
-        gl.disable(moderngl.DEPTH_TEST)
+        gl.disable(moderngl.DEPTH_TEST | moderngl.CULL_FACE)
         gl.enable(moderngl.BLEND)
         gl.clear()
 
-        batches = defaultdict(bytearray)
-        vertex_counts = defaultdict(int)
-
-        for poly in frame.polygons:
-            if not poly.vertices:
-                continue
+        batch: PolygonBatch = self.prepared_for(exec_ctx)
+        if not batch.runs:
+            return
 
-            mat = poly.model.T
-            local_verts = np.array(
-                [[v.x, v.y, 0.0, 1.0] for v in poly.vertices], dtype="f4"
+        stream = exec_ctx.services.stream
+        if stream is None:
+            raise RuntimeError("Polygon2DPass requires RenderServices.stream")
+
+        assert self._arena
+        self._sync_arena(batch.shapes)
+        self._arena.bind_to_storage_buffer(self.ARENA_BINDING)
+
+        stride = POLYGON_INSTANCE_DTYPE.itemsize
+        records = stream.upload(batch.records, alignment=stride)
+        commands = batch.commands.copy()
+        commands[:, 3] += records.index(stride)
+        command_alloc = stream.upload(commands, alignment=_COMMAND_WORDS * 4)
+        base = command_alloc.index(_COMMAND_WORDS * 4)
+
+        vao = self._vao_for(gl, records.buffer)
+        for first, count in batch.runs:
+            vao.render_indirect(
+                command_alloc.buffer,
+                moderngl.TRIANGLES,
+                count=count,
+                first=base + first,
             )
 
-            world_verts_4d = local_verts @ mat
-            world_verts = world_verts_4d[:, :2]
-
-            num_v = len(world_verts)
-            if num_v < 2:
-                continue
-
-            r, g, b, a = poly.color
-            c_bytes = struct.pack("4f", r, g, b, a)
-            key = (poly.layer, poly.stroke_width)
-            target_batch = batches[key]
-
-            for i in range(num_v - 1):
-                target_batch.extend(
-                    struct.pack("2f", world_verts[i][0], world_verts[i][1])
-                )
-                target_batch.extend(c_bytes)
-                target_batch.extend(
-                    struct.pack(
-                        "2f", world_verts[i + 1][0], world_verts[i + 1][1]
-                    )
-                )
-                target_batch.extend(c_bytes)
-                vertex_counts[key] += 2
-
-            if poly.closed:
-                # Close loop: Last -> First
-                target_batch.extend(
-                    struct.pack("2f", world_verts[-1][0], world_verts[-1][1])
-                )
-                target_batch.extend(c_bytes)
-                target_batch.extend(
-                    struct.pack("2f", world_verts[0][0], world_verts[0][1])
-                )
-                target_batch.extend(c_bytes)
-                vertex_counts[key] += 2
+    def _vao_for(
+        self, gl: moderngl.Context, buffer: moderngl.Buffer
+    ) -> moderngl.VertexArray:
+        """Instance VAO over the streaming buffer, rebuilt if it moved."""
+        if self._vao is None or self._vao_buffer is not buffer:
+            if self._vao is not None:
+                self._vao.release()
+            self._vao = gl.vertex_array(
+                self._program,
+                [
+                    (
+                        buffer,
+                        "3f 3f 4f 1f 8x /i",
+                        "in_affine_x",
+                        "in_affine_y",
+                        "in_color",
+                        "in_width",
+                    ),
+                ],
+            )
+            self._vao_buffer = buffer
+        return self._vao
 
-        sorted_keys = sorted(batches.keys(), key=lambda k: (k[0], k[1]))
+    def _sync_arena(self, shapes: PolygonShapes) -> None:
+        """Upload the arena range written since the last frame."""
+        assert self._arena
+        if shapes is not self._arena_shapes:
+            self._arena_shapes = shapes
+            self._arena_sequence = 0
 
-        for key in sorted_keys:
-            layer, width = key
-            count = vertex_counts[key]
-            if count == 0:
-                continue
+        if self._arena_sequence == shapes.sequence:
+            return
 
-            self._vbo.write(batches[key])
+        needed = shapes.vertex_count * 8
+        if needed > self._arena.size:
+            self._arena.orphan(max(needed, 2 * self._arena.size))
+            self._arena_sequence = 0
 
-            gl.line_width = width
-            self._vao.render(moderngl.LINES, vertices=count)
+        lo, hi = shapes.vertex_span_since(self._arena_sequence)
+        if hi > lo:
+            self._arena.write(shapes.packed()[lo:hi], offset=lo * 8)
+        self._arena_sequence = shapes.sequence
 
     def _ortho_projection(self, left, right, b, t, n, f):
         """Standard Ortho Matrix"""
@@ -188,7 +287,46 @@ class Polygon2DPass(RenderPass):
     def on_graph_destroyed(self) -> None:
         self._program = None
         self._fbo_rid = None
-        if self._vbo:
-            self._vbo.release()
         if self._vao:
             self._vao.release()
+        if self._arena:
+            self._arena.release()
+        self._vao = self._vao_buffer = None
+        self._arena = None
+        self._arena_shapes = None
+
+
+def _chunk(
+    vertices: np.ndarray, start: int, stop: int, limit: int
+) -> list[tuple[int, int]]:
+    """
+    Split commands [start, stop) into runs of at most `limit` vertices.
+
+    `vertices` is the inclusive running vertex total per command. A single
+    command larger than `limit` gets a run of its own.
+    """
+    runs = []
+    base = int(vertices[start - 1]) if start else 0
+    while start < stop:
+        end = int(np.searchsorted(vertices, base + limit, side="right"))
+        end = min(max(end, start + 1), stop)
+        runs.append((start, end - start))
+        base = int(vertices[end - 1])
+        start = end
+    return runs
+
+
+def _pack_items(
+    polygons: Sequence[PolygonDrawItem], shapes: PolygonShapes
+) -> np.ndarray:
+    """Instance records for frames that only carry PolygonDrawItems."""
+    records = np.zeros(len(polygons), dtype=POLYGON_INSTANCE_DTYPE)
+    for i, poly in enumerate(polygons):
+        model = np.asarray(poly.model, dtype=np.float32)
+        rec = records[i]
+        rec["affine"] = model[:2][:, (0, 1, 3)]
+        rec["color"] = poly.color
+        rec["width"] = poly.stroke_width
+        rec["shape"] = shapes.acquire(poly.vertices, poly.closed)
+        rec["layer"] = poly.layer
+    return records
@@ -1,11 +1,12 @@
 # sparrow/graphics/passes/raytrace.py
-import struct
-from collections.abc import Mapping
-from dataclasses import dataclass
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
 
 import moderngl
 import numpy as np
 
+from sparrow.graphics.assets.mesh_manager import MeshManager
+from sparrow.graphics.ecs.frame_submit import DrawItem
 from sparrow.graphics.graph.pass_base import (
     PassBuildInfo,
     PassExecutionContext,
@@ -19,16 +20,21 @@ from sparrow.graphics.graph.resources import (
     TextureResource,
     expect_resource,
 )
+from sparrow.graphics.helpers.bvh import (
+    BVH_INSTANCE_DTYPE,
+    BVH_MAX_DEPTH,
+    BVH_NODE_DTYPE,
+    build_bvh,
+    transformed_bounds,
+)
+from sparrow.graphics.helpers.triangle_packing import (
+    TRIANGLE_STRIDE,
+    TrianglePacker,
+)
 from sparrow.graphics.renderer.settings import RaytracingRendererSettings
 from sparrow.graphics.shaders.program_types import ShaderStages
-from sparrow.graphics.shaders.shader_manager import ShaderRequest
-from sparrow.graphics.util.ids import (
-    MaterialId,
-    MeshId,
-    PassId,
-    ResourceId,
-    ShaderId,
-)
+from sparrow.graphics.shaders.shader_manager import ShaderDefine, ShaderRequest
+from sparrow.graphics.util.ids import MeshId, PassId, ResourceId, ShaderId
 
 
 @dataclass(kw_only=True)
@@ -41,8 +47,22 @@ class RaytracingPass(RenderPass):
         PassFeatures.CAMERA | PassFeatures.SUN | PassFeatures.TIME
     )
 
+    _packer: TrianglePacker = field(default_factory=TrianglePacker)
     _triangle_buffer: moderngl.Buffer | None = None
-    _light_buffer: moderngl.Buffer | None = None
+    _uploaded_sequence: int = -1
+
+    _blas_buffer: moderngl.Buffer | None = None
+    _blas_roots: dict[str, int] = field(default_factory=dict)
+    _tlas: tuple[np.ndarray, np.ndarray] | None = None  # (nodes, instances)
+    _mesh_revision: int = 0
+
+    # Frames averaged into the output at `_accum_size`; restarts on resize.
+    _accum_frames: int = 0
+    _accum_size: tuple[int, int] | None = None
+
+    @property
+    def writes_screen(self) -> bool:
+        return False  # compute only
 
     def build(self) -> PassBuildInfo:
         return PassBuildInfo(
@@ -66,6 +86,7 @@ class RaytracingPass(RenderPass):
             stages=ShaderStages(
                 compute="sparrow/graphics/shaders/default/raytrace.comp"
             ),
+            defines=(ShaderDefine("BVH_STACK_SIZE", str(BVH_MAX_DEPTH + 1)),),
             label="Raytrace",
         )
         self._program = services.shader_manager.get(req).program
@@ -85,15 +106,33 @@ class RaytracingPass(RenderPass):
 
         self._update_buffers(exec_ctx)
 
-        w, h = exec_ctx.viewport_width, exec_ctx.viewport_height
+        w, h = exec_ctx.render_size(*out_res.handle.size)
+        if "u_render_size" in self._program:
+            self._program["u_render_size"].value = (w, h)
+        if "u_accum_frames" in self._program:
+            self._program["u_accum_frames"].value = self._accumulate((w, h))
         gw, gh = 16, 16
         nx = (w + gw - 1) // gw
         ny = (h + gh - 1) // gh
 
         self._program.run(nx, ny, 1)
 
+    def _accumulate(self, size: tuple[int, int]) -> int:
+        """
+        Count one more frame of temporal accumulation at `size`.
+
+        Returns the number of frames already averaged into the output. A
+        changed render size (dynamic resolution) restarts the average: the
+        texels it held belonged to a different pixel grid.
+        """
+        if size != self._accum_size:
+            self._accum_size = size
+            self._accum_frames = 0
+        frames = self._accum_frames
+        self._accum_frames += 1
+        return frames
+
     def _update_buffers(self, exec_ctx: PassExecutionContext) -> None:
-        triangle_data = []
         services = exec_ctx.services
         assert self._program
 
@@ -110,106 +149,171 @@ class RaytracingPass(RenderPass):
                 "u_denoiser_enabled"
             ].value = self.settings.denoiser_enabled
 
-        for draw in exec_ctx.frame.draws:
-            mesh_id = MeshId(draw.mesh_id)
-            mesh_handle = services.mesh_manager.get(mesh_id)
-            mesh_data = mesh_handle.data
-
-            material_id = MaterialId(draw.material_id)
-            material = services.material_manager.get(material_id)
-
-            # 1. Parse vertices (assuming 8 floats: pos, normal, uv)
-            raw_verts = np.frombuffer(mesh_data.vertices, dtype=np.float32)
-            positions = raw_verts.reshape(-1, 8)[:, :3]
-
-            # 2. Check for indices
-            if mesh_data.indices is not None:
-                # Assuming 32-bit unsigned integers for indices
-                indices = np.frombuffer(mesh_data.indices, dtype=np.uint32)
-
-                # Iterate through indices in steps of 3
-                for i in range(0, len(indices), 3):
-                    idx0, idx1, idx2 = (
-                        indices[i],
-                        indices[i + 1],
-                        indices[i + 2],
-                    )
-
-                    v0_local = np.append(positions[idx0], 1.0)
-                    v1_local = np.append(positions[idx1], 1.0)
-                    v2_local = np.append(positions[idx2], 1.0)
-
-                    # Transform and pack as before
-                    v0_world = (draw.model @ v0_local)[:3]
-                    v1_world = (draw.model @ v1_local)[:3]
-                    v2_world = (draw.model @ v2_local)[:3]
-                    triangle_data.extend(
-                        [*v0_world, 0.0, *v1_world, 0.0, *v2_world, 0.0]
-                    )
-            else:
-                # Fallback for non-indexed geometry
-                for i in range(0, len(positions), 3):
-                    v0_local = np.append(positions[i], 1.0)
-                    v1_local = np.append(positions[i + 1], 1.0)
-                    v2_local = np.append(positions[i + 2], 1.0)
-
-                    mat_color_vec4 = getattr(
-                        material, "albedo", (1.0, 1.0, 1.0)
-                    )
-                    albedo_rgb = mat_color_vec4[:3]
-                    metalness = getattr(material, "metalness", 0.0)
-                    roughness = getattr(material, "roughness", 0.5)
-
-                    v0_world = (draw.model @ v0_local)[:3]
-                    v1_world = (draw.model @ v1_local)[:3]
-                    v2_world = (draw.model @ v2_local)[:3]
-                    triangle_data.extend(
-                        [
-                            *v0_world,
-                            metalness,
-                            *v1_world,
-                            roughness,
-                            *v2_world,
-                            0.0,
-                            *albedo_rgb,
-                            0.0,
-                        ]
-                    )
-
-        if triangle_data:
-            raw_data = struct.pack(f"{len(triangle_data)}f", *triangle_data)
-            if (
-                self._triangle_buffer is None
-                or self._triangle_buffer.size < len(raw_data)
-            ):
-                if self._triangle_buffer:
-                    self._triangle_buffer.release()
-                self._triangle_buffer = exec_ctx.gl.buffer(raw_data)
-            else:
-                self._triangle_buffer.write(raw_data)
-
-            self._triangle_buffer.bind_to_storage_buffer(binding=1)
-            self._program["u_triangle_count"].value = len(triangle_data) // 16
+        stream = services.stream
+        if stream is None:
+            raise RuntimeError("RaytracingPass requires RenderServices.stream")
+
+        self._upload_triangles(exec_ctx)
 
         # Lights
-        light_data = []
-        for light in exec_ctx.frame.point_lights:
-            light_data.extend(
-                [*light.position_ws, 0.0, *light.color_rgb, light.intensity]
+        lights = exec_ctx.frame.point_lights
+        if lights:
+            light_data = np.zeros((len(lights), 8), dtype=np.float32)
+            for i, light in enumerate(lights):
+                light_data[i, :3] = light.position_ws
+                light_data[i, 4:7] = light.color_rgb
+                light_data[i, 7] = light.intensity
+
+            stream.upload(light_data).bind_to_storage_buffer(2)
+            self._program["u_light_count"].value = len(lights)
+
+    def _upload_triangles(self, exec_ctx: PassExecutionContext) -> None:
+        """
+        Repack changed instances and patch the retained triangle SSBO.
+
+        Static geometry is neither re-transformed nor re-uploaded; the
+        buffer is only rewritten in full when it has to grow or when a
+        packed frame was never uploaded.
+        """
+        assert self._program
+        services = exec_ctx.services
+        if services.mesh_manager.revision != self._mesh_revision:
+            # A placeholder was replaced: packed triangles and BLASes are stale.
+            self._mesh_revision = services.mesh_manager.revision
+            self._packer = TrianglePacker()
+            self._uploaded_sequence = -1
+            self._blas_roots = {}
+            self._tlas = None
+
+        packer = self._packer
+        dirty = packer.pack(
+            exec_ctx.frame.draws,
+            services.mesh_manager,
+            services.material_manager,
+        )
+
+        data = packer.triangles
+        nbytes = packer.count * TRIANGLE_STRIDE
+        full = packer.sequence != self._uploaded_sequence + 1
+
+        buffer = self._triangle_buffer
+        if buffer is None or buffer.size < max(nbytes, 1):
+            if buffer is not None:
+                buffer.release()
+            buffer = self._triangle_buffer = exec_ctx.gl.buffer(
+                reserve=max(data.nbytes, TRIANGLE_STRIDE), dynamic=True
             )
+            full = True
+
+        if full:
+            if nbytes:
+                buffer.write(data[: packer.count])
+        else:
+            for start, stop in dirty:
+                buffer.write(data[start:stop], offset=start * TRIANGLE_STRIDE)
+        self._uploaded_sequence = packer.sequence
 
-        if light_data:
-            raw_lights = struct.pack(f"{len(light_data)}f", *light_data)
-            if self._light_buffer is None or self._light_buffer.size < len(
-                raw_lights
-            ):
-                if self._light_buffer:
-                    self._light_buffer.release()
-                self._light_buffer = exec_ctx.gl.buffer(raw_lights)
-            else:
-                self._light_buffer.write(raw_lights)
-
-            self._light_buffer.bind_to_storage_buffer(binding=2)
-            self._program["u_light_count"].value = len(
-                exec_ctx.frame.point_lights
+        buffer.bind_to_storage_buffer(1)
+
+        self._upload_bvh(exec_ctx, rebuild=full or bool(dirty))
+
+    def _upload_bvh(self, exec_ctx: PassExecutionContext, rebuild: bool) -> None:
+        """
+        Bind the two-level BVH over the packed triangles.
+
+        BLASes are built once per mesh (MeshManager.blas) and concatenated
+        into a retained SSBO that is only rewritten when a new mesh shows
+        up. The TLAS over the draws' world bounds is rebuilt only when the
+        packed instances changed, and streamed every frame.
+        """
+        assert self._program
+        services = exec_ctx.services
+        meshes = services.mesh_manager
+        draws = exec_ctx.frame.draws
+
+        mesh_ids = [draw.mesh_id for draw in draws]
+        new_meshes = [
+            m for m in dict.fromkeys(mesh_ids) if m not in self._blas_roots
+        ]
+        if new_meshes or self._blas_buffer is None:
+            self._write_blas(exec_ctx.gl, meshes, new_meshes)
+            rebuild = True
+
+        if rebuild or self._tlas is None:
+            self._tlas = self._build_tlas(draws, mesh_ids, meshes)
+        tlas_nodes, instances = self._tlas
+
+        assert self._blas_buffer is not None and services.stream is not None
+        self._blas_buffer.bind_to_storage_buffer(3)
+        services.stream.upload(tlas_nodes).bind_to_storage_buffer(4)
+        services.stream.upload(instances).bind_to_storage_buffer(6)
+        self._program["u_tlas_node_count"].value = len(tlas_nodes)
+
+    def _write_blas(
+        self, gl: moderngl.Context, meshes: MeshManager, new_meshes: list[str]
+    ) -> None:
+        roots = self._blas_roots
+        for mesh_id in new_meshes:
+            roots[mesh_id] = 0
+        chunks = []
+        offset = 0
+        for mesh_id in roots:
+            nodes = meshes.blas(MeshId(mesh_id)).nodes
+            roots[mesh_id] = offset
+            chunks.append(nodes)
+            offset += len(nodes)
+        data = (
+            np.concatenate(chunks) if chunks else np.zeros(1, BVH_NODE_DTYPE)
+        )
+
+        if self._blas_buffer is not None:
+            self._blas_buffer.release()
+        self._blas_buffer = gl.buffer(data.tobytes())
+
+    def _build_tlas(
+        self,
+        draws: Sequence[DrawItem],
+        mesh_ids: list[str],
+        meshes: MeshManager,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        count = len(draws)
+        if count == 0:
+            return (
+                np.zeros(0, dtype=BVH_NODE_DTYPE),
+                np.zeros(0, dtype=BVH_INSTANCE_DTYPE),
             )
+
+        models = np.stack(
+            [np.asarray(draw.model, dtype=np.float32) for draw in draws]
+        )
+        local_lo = np.empty((count, 3), dtype=np.float32)
+        local_hi = np.empty((count, 3), dtype=np.float32)
+        roots = np.empty(count, dtype=np.int32)
+        for i, mesh_id in enumerate(mesh_ids):
+            local_lo[i], local_hi[i] = meshes.blas(MeshId(mesh_id)).bounds
+            roots[i] = self._blas_roots[mesh_id]
+
+        tlas = build_bvh(
+            *transformed_bounds(local_lo, local_hi, models), leaf_size=2
+        )
+        order = tlas.order
+
+        instances = np.zeros(count, dtype=BVH_INSTANCE_DTYPE)
+        # GLSL reads mat4 column-major: store the transpose of the row-major
+        # inverse.
+        instances["inv_model"] = np.linalg.inv(models[order]).transpose(0, 2, 1)
+        instances["triangle_first"] = self._packer.firsts()[order]
+        instances["node_first"] = roots[order]
+        return tlas.nodes, instances
+
+    def on_graph_destroyed(self) -> None:
+        if self._triangle_buffer is not None:
+            self._triangle_buffer.release()
+        self._triangle_buffer = None
+        self._packer = TrianglePacker()
+        self._uploaded_sequence = -1
+        if self._blas_buffer is not None:
+            self._blas_buffer.release()
+        self._blas_buffer = None
+        self._blas_roots = {}
+        self._tlas = None
@@ -105,9 +105,11 @@ class TonemapPass(RenderPass):
         gl.viewport = (0, 0, exec_ctx.viewport_width, exec_ctx.viewport_height)
         gl.clear()
 
-        # bind HDR input
+        # bind HDR input; upscales the dynamic-resolution region
         tex = expect_resource(exec_ctx.resources, self.hdr_in, TextureResource)
         tex.handle.use(location=0)
+        if "u_uv_scale" in self._program:
+            self._program["u_uv_scale"].value = exec_ctx.uv_scale(*tex.handle.size)
 
         # draw to default framebuffer
         self._vao.render(mode=moderngl.TRIANGLES, vertices=3)
@@ -22,6 +22,7 @@ def build_raytracing_pipeline(
             settings.resolution.logical_height,
             4,
             "f2",
+            persistent=True,  # temporal accumulation reads last frame
         ),
     )
 
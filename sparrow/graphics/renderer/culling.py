@@ -0,0 +1,249 @@
+# sparrow/graphics/renderer/culling.py
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Dict, Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from sparrow.graphics.assets.mesh_manager import MeshManager
+from sparrow.graphics.ecs.frame_submit import (
+    DrawItem,
+    PolygonDrawItem,
+    RenderFrameInput,
+)
+
+_UNBOUNDED = 1e30
+
+
+@dataclass(frozen=True, slots=True)
+class CullStats:
+    """Visibility counters for one culled frame."""
+
+    draws_total: int = 0
+    draws_visible: int = 0
+    lights_total: int = 0
+    lights_visible: int = 0
+    polygons_total: int = 0
+    polygons_visible: int = 0
+
+    @property
+    def cull_ratio(self) -> float:
+        """Fraction of draws, lights and polygons rejected (0 = none)."""
+        total = self.draws_total + self.lights_total + self.polygons_total
+        if total == 0:
+            return 0.0
+        visible = (
+            self.draws_visible + self.lights_visible + self.polygons_visible
+        )
+        return 1.0 - visible / total
+
+
+def frustum_planes(view_proj: np.ndarray) -> np.ndarray:
+    """
+    Extract the six clip planes of a column-vector view-projection matrix.
+
+    Returns:
+        (6, 4) float64 array of normalized planes (nx, ny, nz, d) with
+        normals pointing into the frustum: left, right, bottom, top,
+        near, far.
+    """
+    m = np.asarray(view_proj, dtype=np.float64)
+    r0, r1, r2, r3 = m
+    planes = np.stack([r3 + r0, r3 - r0, r3 + r1, r3 - r1, r3 + r2, r3 - r2])
+    norms = np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+    return planes / np.maximum(norms, 1e-12)
+
+
+def aabbs_visible(
+    planes: np.ndarray,
+    local_min: np.ndarray,
+    local_max: np.ndarray,
+    models: np.ndarray,
+) -> np.ndarray:
+    """
+    Test model-space AABBs against frustum planes.
+
+    Each box is moved to world space as a center/extent pair (the extent
+    goes through |R|), which yields the tightest world AABB of the
+    transformed box without touching its eight corners.
+
+    Args:
+        planes: (6, 4) planes from frustum_planes.
+        local_min: (N, 3) model-space box minimum.
+        local_max: (N, 3) model-space box maximum.
+        models: (N, 4, 4) model matrices (translation in column 3).
+
+    Returns:
+        (N,) bool mask, True where the box intersects the frustum.
+    """
+    center = (local_min + local_max) * 0.5
+    extent = (local_max - local_min) * 0.5
+
+    rot = models[:, :3, :3]
+    world_center = np.einsum("nij,nj->ni", rot, center) + models[:, :3, 3]
+    world_extent = np.einsum("nij,nj->ni", np.abs(rot), extent)
+
+    dist = world_center @ planes[:, :3].T + planes[:, 3]
+    radius = world_extent @ np.abs(planes[:, :3]).T
+    return np.all(dist + radius >= 0.0, axis=1)
+
+
+def spheres_visible(
+    planes: np.ndarray, centers: np.ndarray, radii: np.ndarray
+) -> np.ndarray:
+    """(N,) bool mask of spheres that intersect the frustum."""
+    dist = centers @ planes[:, :3].T + planes[:, 3]
+    return np.all(dist >= -radii[:, None], axis=1)
+
+
+def ortho_view_rect(view_proj: np.ndarray) -> Optional[np.ndarray]:
+    """
+    World-space (x_min, y_min, x_max, y_max) seen by an orthographic camera.
+
+    Returns:
+        None if `view_proj` is a perspective projection.
+    """
+    m = np.asarray(view_proj, dtype=np.float64)
+    if not np.allclose(m[3], (0.0, 0.0, 0.0, 1.0)):
+        return None
+
+    ndc = np.array(
+        [
+            [-1.0, -1.0, 0.0, 1.0],
+            [1.0, -1.0, 0.0, 1.0],
+            [-1.0, 1.0, 0.0, 1.0],
+            [1.0, 1.0, 0.0, 1.0],
+        ]
+    )
+    corners = ndc @ np.linalg.inv(m).T
+    lo = corners[:, :2].min(axis=0)
+    hi = corners[:, :2].max(axis=0)
+    return np.concatenate((lo, hi))
+
+
+def circles_visible(
+    rect: np.ndarray, centers: np.ndarray, radii: np.ndarray
+) -> np.ndarray:
+    """(N,) bool mask of circles overlapping the rect (x0, y0, x1, y1)."""
+    r = radii[:, None]
+    return np.all(
+        (centers + r >= rect[:2]) & (centers - r <= rect[2:]), axis=1
+    )
+
+
+def _mesh_bounds(
+    draws: Sequence[DrawItem], meshes: MeshManager
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-draw model-space bounds; unknown meshes are never culled."""
+    lut: Dict[Hashable, int] = {}
+    mins = []
+    maxs = []
+
+    def index_of(mesh_id: Hashable) -> int:
+        idx = lut.get(mesh_id)
+        if idx is None:
+            try:
+                lo, hi = meshes.get(mesh_id).data.aabb  # type: ignore[arg-type]
+            except KeyError:
+                lo, hi = (-_UNBOUNDED,) * 3, (_UNBOUNDED,) * 3
+            idx = lut[mesh_id] = len(mins)
+            mins.append(lo)
+            maxs.append(hi)
+        return idx
+
+    which = np.fromiter(
+        (index_of(d.mesh_id) for d in draws), dtype=np.int64, count=len(draws)
+    )
+    lo = np.asarray(mins, dtype=np.float64).reshape(-1, 3)
+    hi = np.asarray(maxs, dtype=np.float64).reshape(-1, 3)
+    return lo[which], hi[which]
+
+
+def draw_models(frame: RenderFrameInput) -> np.ndarray:
+    """(N, 4, 4) model matrices of `frame.draws` (N must be at least 1)."""
+    draws = frame.draws
+    if frame.instances is not None:
+        slots = np.fromiter(
+            (d.instance for d in draws), dtype=np.int64, count=len(draws)
+        )
+        if slots.size and slots.min() >= 0:
+            return frame.instances.models[slots]
+    return np.stack([np.asarray(d.model, dtype=np.float32) for d in draws])
+
+
+def cull_frame(
+    frame: RenderFrameInput, meshes: MeshManager
+) -> Tuple[RenderFrameInput, CullStats]:
+    """
+    Drop draws, point lights and polygons that lie outside the camera view.
+
+    Polygons are only culled for orthographic cameras, against the view
+    rectangle, using the bounding circles in `frame.polygon_bounds`; their
+    `polygon_instances` records are filtered alongside. Polygon sequences
+    with a `take(indices)` method (such as the render mirror's) are
+    subset without materializing their items.
+
+    Args:
+        frame: Extracted frame input.
+        meshes: Mesh manager providing model-space AABBs.
+
+    Returns:
+        The filtered frame (draw order preserved) and visibility counters.
+    """
+    planes = frustum_planes(frame.camera.view_proj)
+
+    draws = frame.draws
+    visible_draws: Sequence[DrawItem] = draws
+    if draws:
+        lo, hi = _mesh_bounds(draws, meshes)
+        mask = aabbs_visible(planes, lo, hi, draw_models(frame))
+        visible_draws = [draws[i] for i in np.flatnonzero(mask).tolist()]
+
+    lights = frame.point_lights
+    visible_lights = lights
+    if lights:
+        centers = np.array([p.position_ws for p in lights], dtype=np.float64)
+        radii = np.array([p.radius for p in lights], dtype=np.float64)
+        mask = spheres_visible(planes, centers, radii)
+        visible_lights = [lights[i] for i in np.flatnonzero(mask).tolist()]
+
+    polygons = frame.polygons
+    visible_polygons: Sequence[PolygonDrawItem] = polygons
+    bounds = frame.polygon_bounds
+    instances = frame.polygon_instances
+    rect = ortho_view_rect(frame.camera.view_proj)
+    if polygons and bounds is not None and rect is not None:
+        # Stroke widths are in pixels; pad by half of one in world units.
+        world_per_px = 0.0
+        if frame.viewport_height:
+            world_per_px = (rect[3] - rect[1]) / frame.viewport_height
+        radii = bounds[:, 2] + 0.5 * bounds[:, 3] * world_per_px
+        mask = circles_visible(rect, bounds[:, :2], radii)
+        keep = np.flatnonzero(mask)
+        take = getattr(polygons, "take", None)
+        if take is not None:
+            visible_polygons = take(keep)
+        else:
+            visible_polygons = [polygons[i] for i in keep.tolist()]
+        bounds = bounds[keep]
+        if instances is not None:
+            instances = instances[keep]
+
+    stats = CullStats(
+        draws_total=len(draws),
+        draws_visible=len(visible_draws),
+        lights_total=len(lights),
+        lights_visible=len(visible_lights),
+        polygons_total=len(polygons),
+        polygons_visible=len(visible_polygons),
+    )
+    culled = replace(
+        frame,
+        draws=visible_draws,
+        point_lights=visible_lights,
+        polygons=visible_polygons,
+        polygon_bounds=bounds,
+        polygon_instances=instances,
+    )
+    return culled, stats
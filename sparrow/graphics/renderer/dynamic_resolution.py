@@ -0,0 +1,67 @@
+# sparrow/graphics/renderer/dynamic_resolution.py
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+from sparrow.graphics.renderer.settings import DynamicResolutionSettings
+
+
+@dataclass(slots=True)
+class DynamicResolutionController:
+    """
+    Choose the internal render scale from measured GPU frame times.
+
+    Frame times are smoothed with an exponential moving average. When the
+    average leaves the dead band around the target, the scale jumps to the
+    value predicted to hit the target, assuming cost proportional to pixel
+    count (scale squared). Scales are quantized to `settings.step` and
+    changes are spaced by `settings.cooldown_frames` so the targets do not
+    flicker between sizes.
+    """
+
+    settings: DynamicResolutionSettings
+    smoothing: float = 0.1
+
+    scale: float = 1.0
+    _average_ms: Optional[float] = None
+    _cooldown: int = 0
+
+    def __post_init__(self) -> None:
+        s = self.settings
+        if not 0.0 < s.min_scale <= s.max_scale <= 1.0:
+            raise ValueError("Render scales must satisfy 0 < min <= max <= 1")
+        self.scale = s.max_scale
+
+    def update(self, frame_ms: float) -> float:
+        """
+        Feed one GPU frame time and return the render scale to use next.
+        """
+        if self._average_ms is None:
+            self._average_ms = frame_ms
+        else:
+            self._average_ms += self.smoothing * (frame_ms - self._average_ms)
+
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return self.scale
+
+        s = self.settings
+        average = self._average_ms
+        if s.target_frame_ms * (1.0 - s.headroom) <= average <= s.target_frame_ms * (
+            1.0 + s.headroom
+        ):
+            return self.scale
+
+        ideal = self.scale * math.sqrt(s.target_frame_ms / max(average, 1e-3))
+        # Round down: undershooting the target is cheaper than a dropped frame.
+        scale = round(math.floor(ideal / s.step + 1e-6) * s.step, 6)
+        scale = min(max(scale, s.min_scale), s.max_scale)
+
+        if scale != self.scale:
+            self.scale = scale
+            self._cooldown = s.cooldown_frames
+            self._average_ms = None  # measured at the old scale
+
+        return self.scale
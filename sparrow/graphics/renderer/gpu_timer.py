@@ -0,0 +1,58 @@
+# sparrow/graphics/renderer/gpu_timer.py
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+import moderngl
+
+
+class GpuTimer:
+    """
+    Measure GPU time of a recurring span of commands with timer queries.
+
+    Each `measure()` uses one of `latency + 1` queries in turn and, before
+    reusing a query, reads the result it recorded `latency + 1` spans ago.
+    By then the GPU has finished that work, so reading does not stall the
+    pipeline.
+
+    Timer queries cannot nest: spans measured by different timers must not
+    overlap.
+    """
+
+    def __init__(self, gl: moderngl.Context, latency: int = 3) -> None:
+        if latency < 1:
+            raise ValueError("latency must be at least 1")
+        self._gl = gl
+        self._queries: List[Optional[moderngl.Query]] = [None] * (latency + 1)
+        self._next = 0
+        self._result_ms: Optional[float] = None
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        """Time the GPU work issued inside the `with` block."""
+        query = self._queries[self._next]
+        if query is None:
+            query = self._queries[self._next] = self._gl.query(time=True)
+        else:
+            self._result_ms = query.elapsed / 1e6
+        self._next = (self._next + 1) % len(self._queries)
+
+        with query:
+            yield
+
+    def poll(self) -> Optional[float]:
+        """
+        Return the newest completed measurement in milliseconds, once.
+
+        Returns:
+            The GPU time of a span `latency + 1` spans ago, or None if no
+            new result arrived since the last call.
+        """
+        result, self._result_ms = self._result_ms, None
+        return result
+
+    def release(self) -> None:
+        # moderngl queries have no release(); dropping them frees them.
+        self._queries = [None] * len(self._queries)
+        self._result_ms = None
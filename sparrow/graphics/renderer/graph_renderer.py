@@ -14,6 +14,8 @@ from sparrow.graphics.graph.builder import RenderGraphBuilder
 from sparrow.graphics.graph.compilation import compile_render_graph
 from sparrow.graphics.graph.pass_base import RenderServices
 from sparrow.graphics.graph.render_graph import CompiledRenderGraph
+from sparrow.graphics.renderer.instance_store import InstanceStore
+from sparrow.graphics.renderer.stream_buffer import StreamingBuffer
 from sparrow.graphics.renderer.settings import RendererSettings
 from sparrow.graphics.shaders.shader_manager import ShaderManager
 
@@ -31,6 +33,8 @@ class GraphRenderer:
     _mesh_mgr: MeshManager | None = None
     _material_mgr: MaterialManager | None = None
     _texture_mgr: TextureManager | None = None
+    _instances: InstanceStore | None = None
+    _stream: StreamingBuffer | None = None
 
     _graph: CompiledRenderGraph | None = None
 
@@ -40,6 +44,8 @@ class GraphRenderer:
         self._mesh_mgr = MeshManager(self.gl)
         self._material_mgr = MaterialManager()
         self._texture_mgr = TextureManager(self.gl)
+        self._instances = InstanceStore(self.gl)
+        self._stream = StreamingBuffer(self.gl)
 
     def set_pipeline(self, pipeline: PipelineFactory) -> None:
         """
@@ -54,9 +60,6 @@ class GraphRenderer:
         self._compile_and_activate(builder)
 
     def _compile_and_activate(self, builder: RenderGraphBuilder) -> None:
-        if self._graph:
-            self._graph.destroy()
-
         assert self._shader_mgr is not None
         assert self._mesh_mgr is not None
         assert self._material_mgr is not None
@@ -67,11 +70,25 @@ class GraphRenderer:
             mesh_manager=self._mesh_mgr,
             material_manager=self._material_mgr,
             texture_manager=self._texture_mgr,
+            instances=self._instances,
+            stream=self._stream,
         )
+        # Textures and buffers the new pipeline shares with the old are kept.
         self._graph = compile_render_graph(
-            gl=self.gl, builder=builder, services=services
+            gl=self.gl, builder=builder, services=services, previous=self._graph
         )
 
     def render_frame(self, frame: RenderFrameInput) -> None:
+        if self._stream is not None:
+            self._stream.begin_frame()
+
+        if self._instances is not None:
+            self._instances.begin_frame()
+            if frame.instances is not None:
+                self._instances.sync(frame.instances)
+
         if self._graph:
             self._graph.execute(frame)
+
+        if self._stream is not None:
+            self._stream.end_frame()
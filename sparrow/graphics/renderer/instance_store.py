@@ -0,0 +1,105 @@
+# sparrow/graphics/renderer/instance_store.py
+from __future__ import annotations
+
+import moderngl
+import numpy as np
+
+from sparrow.graphics.ecs.frame_submit import InstanceUpdate
+
+
+class InstanceStore:
+    """
+    Persistent GPU copy of per-instance model matrices.
+
+    Slot `i` (see DrawItem.instance) occupies bytes [64*i, 64*i + 64) as a
+    column-major mat4, ready to be bound as an SSBO / instance buffer. Each
+    frame only the slot ranges reported dirty by the extraction side are
+    rewritten; a full upload only happens on growth or when an update was
+    missed.
+
+    Draws without a slot can push their matrices into a transient region
+    after the mirrored slots; it is reset every frame.
+    """
+
+    STRIDE = 64
+    BINDING = 8  # std430 storage binding used by instanced vertex shaders
+
+    def __init__(self, gl: moderngl.Context, capacity: int = 1024) -> None:
+        self._gl = gl
+        self.capacity = max(1, capacity)
+        self.buffer = gl.buffer(reserve=self.capacity * self.STRIDE, dynamic=True)
+        self.count = 0
+        self.last_upload_bytes = 0
+        self._sequence: int | None = None
+        self._transient = 0
+
+    def sync(self, update: InstanceUpdate) -> None:
+        """Apply an incremental update from the render mirror."""
+        count = update.count
+        full = update.base_sequence != self._sequence
+
+        if count > self.capacity:
+            while self.capacity < count:
+                self.capacity *= 2
+            self.buffer.orphan(self.capacity * self.STRIDE)
+            full = True
+
+        uploaded = 0
+        if full:
+            if count:
+                uploaded = self._write(update.models, 0)
+        else:
+            for start, stop in update.dirty:
+                uploaded += self._write(update.models[start:stop], start)
+
+        self.count = count
+        self.last_upload_bytes = uploaded
+        self._sequence = update.sequence
+
+    def begin_frame(self) -> None:
+        """Drop last frame's transient matrices."""
+        self._transient = 0
+
+    def push_transient(self, models: np.ndarray) -> int:
+        """
+        Upload matrices that have no persistent slot for this frame only.
+
+        Returns:
+            Slot index of the first pushed matrix.
+        """
+        first = self.count + self._transient
+        needed = first + len(models)
+        if needed > self.capacity:
+            self._grow(needed, keep=first)
+
+        self.last_upload_bytes += self._write(models, first)
+        self._transient += len(models)
+        return first
+
+    def bind(self, binding: int = BINDING) -> None:
+        self.buffer.bind_to_storage_buffer(binding)
+
+    def invalidate(self) -> None:
+        """Force a full upload on the next sync."""
+        self._sequence = None
+
+    def release(self) -> None:
+        self.buffer.release()
+
+    def _grow(self, needed: int, *, keep: int) -> None:
+        """Reallocate to fit `needed` slots, preserving the first `keep`."""
+        while self.capacity < needed:
+            self.capacity *= 2
+
+        old = self.buffer
+        self.buffer = self._gl.buffer(
+            reserve=self.capacity * self.STRIDE, dynamic=True
+        )
+        if keep:
+            self._gl.copy_buffer(self.buffer, old, size=keep * self.STRIDE)
+        old.release()
+
+    def _write(self, models: np.ndarray, first_slot: int) -> int:
+        data = np.ascontiguousarray(models.transpose(0, 2, 1), dtype="f4")
+        self.buffer.write(data, offset=first_slot * self.STRIDE)
+        return data.nbytes
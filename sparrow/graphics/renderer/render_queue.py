@@ -0,0 +1,104 @@
+# sparrow/graphics/renderer/render_queue.py
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Dict
+
+import numpy as np
+
+from sparrow.graphics.assets.material_manager import MaterialManager
+from sparrow.graphics.assets.mesh_manager import MeshManager
+from sparrow.graphics.ecs.frame_submit import CameraData, RenderFrameInput
+from sparrow.graphics.renderer.culling import draw_models
+from sparrow.graphics.util.ids import MaterialId, MeshId
+
+# 64-bit draw key, compared as an unsigned integer (most significant first):
+#
+#   reserved:2 | material:20 | mesh:20 | depth:22
+#
+# Draws are grouped by material, then mesh (fewest state changes), and
+# front-to-back inside each group for early depth rejection. The program
+# is chosen per pass here, so it needs no bits of its own. The reserved
+# top bits stay zero: no pass blends yet, so there is no transparent
+# layer to queue back-to-front after the opaque draws.
+HANDLE_BITS = 20
+DEPTH_BITS = 22
+_HANDLE_MASK = (1 << HANDLE_BITS) - 1
+_DEPTH_MAX = (1 << DEPTH_BITS) - 1
+
+
+def depth_buckets(depth: np.ndarray, camera: CameraData) -> np.ndarray:
+    """
+    Quantize view depths to DEPTH_BITS, logarithmically between near and far.
+
+    Logarithmic buckets spend precision where nearby objects overlap most.
+    """
+    near = max(float(camera.near), 1e-4)
+    far = max(float(camera.far), near * (1.0 + 1e-4))
+    t = np.log(np.clip(depth, near, far) / near) / np.log(far / near)
+    return np.rint(t * _DEPTH_MAX).astype(np.uint64)
+
+
+def draw_sort_keys(
+    frame: RenderFrameInput,
+    meshes: MeshManager,
+    materials: MaterialManager,
+) -> np.ndarray:
+    """
+    Pack one 64-bit render-queue key per draw of `frame`.
+
+    Returns:
+        (N,) uint64 keys; sort ascending for submission order.
+    """
+    draws = frame.draws
+    if not draws:
+        return np.zeros(0, dtype=np.uint64)
+
+    mesh_index: Dict[str, int] = {}
+    material_index: Dict[str, int] = {}
+    for draw in draws:
+        if draw.mesh_id not in mesh_index:
+            mesh_index[draw.mesh_id] = meshes.index_of(MeshId(draw.mesh_id))
+        if draw.material_id not in material_index:
+            material_index[draw.material_id] = materials.index_of(
+                MaterialId(draw.material_id)
+            )
+
+    n = len(draws)
+    mesh = np.fromiter((mesh_index[d.mesh_id] for d in draws), np.uint64, n)
+    material = np.fromiter(
+        (material_index[d.material_id] for d in draws), np.uint64, n
+    )
+
+    view = np.asarray(frame.camera.view, dtype=np.float64)
+    origins = draw_models(frame)[:, :3, 3]
+    depth = depth_buckets(-(origins @ view[2, :3] + view[2, 3]), frame.camera)
+
+    mesh &= np.uint64(_HANDLE_MASK)
+    material &= np.uint64(_HANDLE_MASK)
+    return (
+        (material << np.uint64(HANDLE_BITS + DEPTH_BITS))
+        | (mesh << np.uint64(DEPTH_BITS))
+        | depth
+    )
+
+
+def sort_frame(
+    frame: RenderFrameInput,
+    meshes: MeshManager,
+    materials: MaterialManager,
+) -> RenderFrameInput:
+    """
+    Reorder `frame.draws` by their render-queue keys.
+
+    The keys are kept in `frame.draw_sort_keys`, which tells instanced
+    passes that equal (mesh, material) runs are already contiguous.
+    """
+    keys = draw_sort_keys(frame, meshes, materials)
+    order = np.argsort(keys, kind="stable")
+    draws = frame.draws
+    return replace(
+        frame,
+        draws=[draws[i] for i in order.tolist()],
+        draw_sort_keys=keys[order],
+    )
@@ -1,26 +1,37 @@
 # sparrow/graphics/renderer/deferred_renderer.py
 from __future__ import annotations
 
-from copy import deepcopy
-from dataclasses import dataclass
-from typing import Callable, Optional
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, Dict, Optional
 
 import moderngl
 
 from sparrow.debug.dump import dump_render_graph_state
 from sparrow.graphics.assets.material_manager import MaterialManager
 from sparrow.graphics.assets.mesh_manager import MeshManager
+from sparrow.graphics.assets.streaming import AssetLoader
 from sparrow.graphics.assets.texture_manager import TextureManager
 from sparrow.graphics.ecs.frame_submit import RenderFrameInput
 from sparrow.graphics.graph.builder import RenderGraphBuilder
 from sparrow.graphics.graph.compilation import compile_render_graph
 from sparrow.graphics.graph.pass_base import RenderServices
-from sparrow.graphics.graph.render_graph import CompiledRenderGraph
+from sparrow.graphics.graph.profiling import GraphProfiler, PassTiming
+from sparrow.graphics.graph.render_graph import CompiledRenderGraph, PreparedFrame
+from sparrow.graphics.helpers.sky_lut_cache import SkyLutCache
 from sparrow.graphics.pipelines.blit import build_blit_pipeline
 from sparrow.graphics.pipelines.deferred import build_deferred_pipeline
 from sparrow.graphics.pipelines.forward import build_forward_pipeline
 from sparrow.graphics.pipelines.polygon import build_polygon_pipeline
 from sparrow.graphics.pipelines.raytracing import build_raytracing_pipeline
+from sparrow.graphics.renderer.culling import CullStats, cull_frame
+from sparrow.graphics.renderer.dynamic_resolution import (
+    DynamicResolutionController,
+)
+from sparrow.graphics.renderer.gpu_timer import GpuTimer
+from sparrow.graphics.renderer.render_queue import sort_frame
+from sparrow.graphics.renderer.instance_store import InstanceStore
+from sparrow.graphics.renderer.stream_buffer import StreamingBuffer
 from sparrow.graphics.renderer.settings import (
     BlitRendererSettings,
     DeferredRendererSettings,
@@ -29,7 +40,12 @@ from sparrow.graphics.renderer.settings import (
     RaytracingRendererSettings,
     RendererSettings,
 )
-from sparrow.graphics.shaders.shader_manager import ShaderManager
+from sparrow.graphics.shaders.shader_manager import (
+    ShaderManager,
+    ShaderVariantManifest,
+    ShaderWarmUp,
+)
+from sparrow.graphics.util.ids import PassId
 
 EventSink = Callable[[object], None]  # ECS event bus: emit(event)
 
@@ -45,33 +61,95 @@ class Renderer:
     gl: moderngl.Context
     settings: RendererSettings
     emit_event: Optional[EventSink] = None
+    # Print dump_render_graph_state after every graph compile.
+    dump_graph_on_compile: bool = False
 
     _shader_mgr: ShaderManager | None = None
     _mesh_mgr: MeshManager | None = None
     _material_mgr: MaterialManager | None = None
     _texture_mgr: TextureManager | None = None
+    _sky_luts: SkyLutCache | None = None
+    _instances: InstanceStore | None = None
+    _stream: StreamingBuffer | None = None
+    _cull_stats: CullStats = CullStats()
+    _resolution: DynamicResolutionController | None = None
+    _frame_timer: GpuTimer | None = None
+    _profiler: GraphProfiler | None = None
+    _shader_warm_up: ShaderWarmUp | None = None
+    _assets: AssetLoader | None = None
 
     _builder: RenderGraphBuilder | None = None
     _graph: CompiledRenderGraph | None = None
+    _services: RenderServices | None = None
+    _setup_pipeline: Optional[Callable[[RenderGraphBuilder], None]] = None
 
     def initialize(
         self,
         setup_pipeline: Optional[Callable[[RenderGraphBuilder], None]] = None,
     ) -> None:
         """Initialize managers and build the default render graph."""
-        self._shader_mgr = ShaderManager(self.gl, include_paths=[])
+        shaders = self.settings.shaders
+        self._shader_mgr = ShaderManager(
+            self.gl, include_paths=[], source_cache_dir=shaders.source_cache_dir
+        )
         self._mesh_mgr = MeshManager(self.gl)
         self._material_mgr = MaterialManager()
-        self._texture_mgr = TextureManager(self.gl)
+        streaming = self.settings.streaming
+        self._sky_luts = SkyLutCache(streaming.sky_lut_cache_dir)
+        self._texture_mgr = TextureManager(
+            self.gl, cache_dir=streaming.texture_cache_dir, sky_luts=self._sky_luts
+        )
+        self._instances = InstanceStore(self.gl)
+        self._stream = StreamingBuffer(self.gl)
+
+        dynamic = self.settings.resolution.dynamic
+        if dynamic.enabled:
+            self._resolution = DynamicResolutionController(dynamic)
+            self._frame_timer = GpuTimer(self.gl)
+
+        self._warm_up_shaders()
+
+        self._setup_pipeline = setup_pipeline
+        self._activate_builder(self._build_pipeline(), reason="initial")
+
+    def _warm_up_shaders(self) -> None:
+        """Compile the variants of the saved manifest before they are needed."""
+        shaders = self.settings.shaders
+        path = shaders.manifest_path
+        if path is None or not Path(path).exists():
+            return  # first run: the manifest is written on exit
+        assert self._shader_mgr is not None
+
+        requests = ShaderVariantManifest.load(path).requests
+        if shaders.warm_up_budget_ms is None:
+            self._shader_mgr.warm_up(requests)
+        else:
+            self._shader_warm_up = self._shader_mgr.begin_warm_up(requests)
 
+    def save_shader_manifest(self, path: str | None = None) -> None:
+        """
+        Write the shader variants compiled so far.
+
+        Args:
+            path: Destination; defaults to `settings.shaders.manifest_path`.
+
+        Raises:
+            ValueError: If no path is given or configured.
+        """
+        path = path or self.settings.shaders.manifest_path
+        if path is None:
+            raise ValueError("No shader manifest path configured")
+        self.shader_manager.manifest.save(path)
+
+    def _build_pipeline(self) -> RenderGraphBuilder:
         builder = RenderGraphBuilder()
 
-        if setup_pipeline:
-            setup_pipeline(builder)
+        if self._setup_pipeline:
+            self._setup_pipeline(builder)
         else:
             self._default_pipeline_setup(builder)
 
-        self._activate_builder(builder, reason="initial")
+        return builder
 
     def _default_pipeline_setup(self, builder: RenderGraphBuilder) -> None:
         if isinstance(self.settings, DeferredRendererSettings):
@@ -105,57 +183,208 @@ class Renderer:
         configure(base)
         self._activate_builder(base, reason=reason)
 
-    def render_frame(self, frame: RenderFrameInput) -> None:
+    def resize(self, width: int, height: int) -> None:
+        """
+        Change the logical resolution and rebuild the pipeline for it.
+
+        The graph is recompiled incrementally: only resolution-dependent
+        resources and the passes using them are recreated. Custom
+        `setup_pipeline` callables should size their resources from
+        `renderer.settings`. Graph edits made after `initialize()` are
+        replaced by the rebuilt pipeline.
+        """
+        res = self.settings.resolution
+        if (width, height) == (res.logical_width, res.logical_height):
+            return
+        if width <= 0 or height <= 0:
+            raise ValueError(f"Invalid render resolution {width}x{height}")
+
+        resolution = replace(res, logical_width=width, logical_height=height)
+        self.settings = replace(self.settings, resolution=resolution)
+        self._activate_builder(self._build_pipeline(), reason="resized")
+
+    def set_pass_enabled(self, pid: PassId, enabled: bool) -> None:
+        """
+        Enable or disable a pass without recompiling the graph.
+
+        Passes that only feed disabled passes stop running as well. A
+        disabled pass whose outputs enabled passes still read is replaced
+        by its `bypass` copies, which keep its inputs' producers running.
+
+        Raises:
+            KeyError: If no pass with this id exists.
+            ValueError: If enabled passes would read an output of the
+                disabled pass that has no bypass; the pass stays enabled.
+        """
+        if self._builder is None or pid not in self._builder.passes:
+            raise KeyError(f"Pass '{pid}' does not exist")
+        pass_obj = self._builder.passes[pid]
+        was_enabled = pass_obj.enabled
+        pass_obj.enabled = enabled
+        if self._graph is None:
+            return
+        try:
+            self._graph.active_pass_order()
+        except ValueError:
+            pass_obj.enabled = was_enabled
+            raise
+
+    def set_profiling(self, enabled: bool, *, history: int = 120) -> None:
+        """
+        Start or stop recording per-pass CPU and GPU timings.
+
+        Restarting discards previous timings. See `pass_timings()`.
+        """
+        if self._profiler is not None:
+            self._profiler.release()
+            self._profiler = None
+        if enabled:
+            self._profiler = GraphProfiler(self.gl, history=history)
+        if self._graph is not None:
+            self._graph.profiler = self._profiler
+
+    def pass_timings(self) -> Dict[PassId, PassTiming]:
+        """
+        Rolling per-pass timings of the recent frames.
+
+        GPU times lag a few frames behind. Empty when profiling is off.
+        """
+        if self._profiler is None:
+            return {}
+        return self._profiler.breakdown()
+
+    def prepare_frame(self, frame: RenderFrameInput) -> PreparedFrame:
+        """
+        Do the CPU-side work for a frame: culling, render-queue sorting and
+        per-pass buffer packing.
+
+        Issues no GL calls, so it may run on a render-prep thread while the
+        main thread simulates the next step.
+        """
+        if self._graph is None:
+            raise RuntimeError("DeferredRenderer not initialized")
+
+        if self.settings.frustum_culling:
+            assert self._mesh_mgr is not None
+            frame, self._cull_stats = cull_frame(frame, self._mesh_mgr)
+
+        if self.settings.sort_draws and frame.draws:
+            assert self._mesh_mgr is not None and self._material_mgr is not None
+            frame = sort_frame(frame, self._mesh_mgr, self._material_mgr)
+
+        return self._graph.prepare(frame)
+
+    def render_frame(
+        self,
+        frame: RenderFrameInput,
+        prepared: Optional[PreparedFrame] = None,
+    ) -> None:
         """
         Render a single frame.
 
+        `prepared` is the result of `prepare_frame(frame)` if it was built
+        ahead of time; it is redone inline when missing or when the graph was
+        rebuilt since.
+
         Emits RenderFrameEvent after completion if emit_event is configured.
         """
         if self._graph is None:
             raise RuntimeError("DeferredRenderer not initialized")
 
-        self._graph.execute(frame)
+        if self._stream is not None:
+            self._stream.begin_frame()
+
+        if self._assets is not None:
+            self._assets.pump()
+
+        if self._shader_warm_up is not None:
+            budget = self.settings.shaders.warm_up_budget_ms
+            assert budget is not None
+            if self._shader_warm_up.step(budget):
+                self._shader_warm_up = None
+
+        if self._instances is not None:
+            self._instances.begin_frame()
+            if frame.instances is not None:
+                self._instances.sync(frame.instances)
+
+        if prepared is None or prepared.graph is not self._graph:
+            prepared = self.prepare_frame(frame)
+
+        if self._resolution is None or self._frame_timer is None:
+            self._graph.execute(prepared.frame, prepared)
+        elif self._profiler is not None and self._profiler.gpu_enabled:
+            # Pass timers are running; a frame-wide query would overlap them.
+            self._graph.execute(
+                prepared.frame, prepared, render_scale=self._resolution.scale
+            )
+            frame_ms = self._profiler.poll_frame_gpu_ms()
+            if frame_ms is not None:
+                self._resolution.update(frame_ms)
+        else:
+            with self._frame_timer.measure():
+                self._graph.execute(
+                    prepared.frame, prepared, render_scale=self._resolution.scale
+                )
+            frame_ms = self._frame_timer.poll()
+            if frame_ms is not None:
+                self._resolution.update(frame_ms)
+
+        if self._stream is not None:
+            self._stream.end_frame()
 
     def _clone_builder(self) -> RenderGraphBuilder:
         """
         Clone current RenderGraphBuilder State.
+
+        Pass objects are shared with the active graph (compiled passes hold
+        GL objects and cannot be deep-copied); untouched passes are kept
+        by the incremental compile.
         """
         assert isinstance(self._builder, RenderGraphBuilder)
-        return deepcopy(self._builder)
+        return self._builder.copy()
 
     def _activate_builder(
         self, builder: RenderGraphBuilder, *, reason: str
     ) -> None:
         """
         Activate a given RenderGraphBuilder.
-        """
-        if self._graph is not None:
-            self._graph.destroy()
 
-        assert self._shader_mgr is not None
-        assert self._mesh_mgr is not None
-        assert self._material_mgr is not None
-        assert self._texture_mgr is not None
+        The active graph is recompiled incrementally, reusing the resources
+        and passes that did not change.
+        """
+        if self._services is None:
+            assert self._shader_mgr is not None
+            assert self._mesh_mgr is not None
+            assert self._material_mgr is not None
+            assert self._texture_mgr is not None
 
-        services = RenderServices(
-            shader_manager=self._shader_mgr,
-            mesh_manager=self._mesh_mgr,
-            material_manager=self._material_mgr,
-            texture_manager=self._texture_mgr,
-        )
+            self._services = RenderServices(
+                shader_manager=self._shader_mgr,
+                mesh_manager=self._mesh_mgr,
+                material_manager=self._material_mgr,
+                texture_manager=self._texture_mgr,
+                instances=self._instances,
+                stream=self._stream,
+            )
 
         graph = compile_render_graph(
-            gl=self.gl, builder=builder, services=services
+            gl=self.gl,
+            builder=builder,
+            services=self._services,
+            previous=self._graph,
         )
 
+        graph.profiler = self._profiler
         self._builder = builder
         self._graph = graph
 
-        dump_render_graph_state(
-            graph=self._graph,
-            gl=self.gl,
-            header="POST-COMPILE GRAPH STATE",
-        )
+        if self.dump_graph_on_compile:
+            dump_render_graph_state(
+                graph=self._graph,
+                gl=self.gl,
+                header=f"POST-COMPILE GRAPH STATE ({reason})",
+            )
 
     @property
     def shader_manager(self) -> ShaderManager:
@@ -177,3 +406,51 @@ class Renderer:
     def texture_manager(self) -> TextureManager:
         assert self._texture_mgr is not None
         return self._texture_mgr
+
+    @property
+    def sky_luts(self) -> SkyLutCache:
+        """
+        Sky LUTs generated for `texture_manager.update_sky_lut()`, kept in
+        memory and in `settings.streaming.sky_lut_cache_dir`.
+        """
+        assert self._sky_luts is not None
+        return self._sky_luts
+
+    @property
+    def assets(self) -> AssetLoader:
+        """
+        Background mesh/texture loader; uploads are drained each frame
+        within `settings.streaming`'s budget.
+        """
+        if self._assets is None:
+            assert self._mesh_mgr is not None and self._texture_mgr is not None
+            self._assets = AssetLoader(
+                self._mesh_mgr, self._texture_mgr, self.settings.streaming
+            )
+        return self._assets
+
+    def shutdown(self) -> None:
+        """Stop background work (queued asset loads)."""
+        if self._assets is not None:
+            self._assets.shutdown()
+            self._assets = None
+
+    @property
+    def render_scale(self) -> float:
+        """Fraction of the logical resolution currently rendered."""
+        return self._resolution.scale if self._resolution is not None else 1.0
+
+    @property
+    def cull_stats(self) -> CullStats:
+        """Visibility counters of the last rendered frame."""
+        return self._cull_stats
+
+    @property
+    def instances(self) -> InstanceStore:
+        assert self._instances is not None
+        return self._instances
+
+    @property
+    def stream(self) -> StreamingBuffer:
+        assert self._stream is not None
+        return self._stream
@@ -5,6 +5,7 @@ import datetime
 from abc import ABC
 from dataclasses import dataclass
 from enum import Enum
+from typing import Optional
 
 from sparrow.graphics.helpers.nishita import get_sun_dir_from_datetime
 
@@ -17,6 +18,25 @@ class PresentScaleMode(str, Enum):
     INTEGER_FIT = "integer_fit"
 
 
+@dataclass(frozen=True, slots=True)
+class DynamicResolutionSettings:
+    """
+    Policy for scaling the internal render resolution with GPU frame time.
+
+    Render targets stay allocated at the logical size; each frame draws
+    into the top-left `scale` fraction of them and the present pass
+    upscales.
+    """
+
+    enabled: bool = False
+    target_frame_ms: float = 16.0
+    min_scale: float = 0.5
+    max_scale: float = 1.0
+    headroom: float = 0.1  # dead band around the target, as a fraction
+    step: float = 0.05  # scales are multiples of this
+    cooldown_frames: int = 15  # frames between two scale changes
+
+
 @dataclass(frozen=True, slots=True)
 class ResolutionSettings:
     """Resolution policy for internal rendering and presentation."""
@@ -24,6 +44,41 @@ class ResolutionSettings:
     logical_width: int
     logical_height: int
     scale_mode: PresentScaleMode = PresentScaleMode.STRETCH
+    dynamic: DynamicResolutionSettings = DynamicResolutionSettings()
+
+
+@dataclass(frozen=True, slots=True)
+class ShaderCacheSettings:
+    """
+    Where shader variants and preprocessed sources persist between runs.
+
+    Variants listed in `manifest_path` are compiled while the renderer
+    initializes, or `warm_up_budget_ms` per frame if that is set, and the
+    variants used in a session are written back on scene exit.
+    """
+
+    manifest_path: Optional[str] = None
+    source_cache_dir: Optional[str] = None
+    warm_up_budget_ms: Optional[float] = None
+
+
+@dataclass(frozen=True, slots=True)
+class AssetStreamingSettings:
+    """
+    Background asset loading (see `Renderer.assets`).
+
+    Files are parsed and decoded on `workers` threads; the main thread
+    uploads finished assets until either per-frame budget is spent, but
+    always at least one per frame. Decoded images are kept in
+    `texture_cache_dir`, and generated sky LUTs in `sky_lut_cache_dir`,
+    if set, and memory-mapped on later runs.
+    """
+
+    workers: int = 2
+    upload_bytes_per_frame: int = 16 * 1024 * 1024
+    upload_ms_per_frame: float = 2.0
+    texture_cache_dir: Optional[str] = None
+    sky_lut_cache_dir: Optional[str] = None
 
 
 _default_time = datetime.datetime(2023, 10, 27, 15, 0, 0)
@@ -45,6 +100,10 @@ class RendererSettings(ABC):
 
     resolution: ResolutionSettings
     sunlight: SunlightSettings
+    frustum_culling: bool = True
+    sort_draws: bool = True  # render-queue order (renderer.render_queue)
+    shaders: ShaderCacheSettings = ShaderCacheSettings()
+    streaming: AssetStreamingSettings = AssetStreamingSettings()
 
 
 @dataclass(frozen=True, slots=True)
@@ -71,6 +130,11 @@ class ForwardRendererSettings(RendererSettings):
 class RaytracingRendererSettings(RendererSettings):
     """Forward renderer configuration."""
 
+    # Rays reach geometry outside the view frustum.
+    frustum_culling: bool = False
+    # Submission order is irrelevant to rays; keeping it stable lets the
+    # triangle packer skip static instances.
+    sort_draws: bool = False
     max_bounces: int = 2
     samples_per_pixel: int = 1
     denoiser_enabled: bool = True
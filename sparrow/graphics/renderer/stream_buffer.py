@@ -0,0 +1,190 @@
+# sparrow/graphics/renderer/stream_buffer.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import moderngl
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class StreamAllocation:
+    """A byte range of the streaming buffer, valid for the current frame."""
+
+    buffer: moderngl.Buffer
+    offset: int
+    size: int
+
+    def index(self, stride: int) -> int:
+        """Offset in elements of `stride` bytes (e.g. a first instance)."""
+        return self.offset // stride
+
+    def bind_to_storage_buffer(self, binding: int) -> None:
+        self.buffer.bind_to_storage_buffer(
+            binding, offset=self.offset, size=self.size
+        )
+
+    def bind_to_uniform_block(self, binding: int) -> None:
+        self.buffer.bind_to_uniform_block(
+            binding, offset=self.offset, size=self.size
+        )
+
+
+class RingAllocator:
+    """
+    Offset bookkeeping for a ring of per-frame regions.
+
+    The ring is split into `frames_in_flight` equal regions; frame k
+    sub-allocates linearly from region k % frames_in_flight. Offsets are
+    rounded up to the requested alignment, which does not have to be a
+    power of two (so element strides can be used to make offsets
+    addressable as a first vertex / instance / command).
+    """
+
+    def __init__(self, region_size: int, frames_in_flight: int = 3) -> None:
+        if frames_in_flight < 1:
+            raise ValueError("frames_in_flight must be at least 1")
+        self.region_size = region_size
+        self.frames_in_flight = frames_in_flight
+        self.region = 0
+        self.head = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.region_size * self.frames_in_flight
+
+    @property
+    def used(self) -> int:
+        """Bytes allocated from the current region."""
+        return self.head - self.region * self.region_size
+
+    def advance(self) -> int:
+        """Move to the next region and return its index."""
+        self.region = (self.region + 1) % self.frames_in_flight
+        self.head = self.region * self.region_size
+        return self.region
+
+    def allocate(self, size: int, alignment: int) -> Optional[int]:
+        """
+        Reserve `size` bytes in the current region.
+
+        Returns:
+            The aligned offset, or None if the region is exhausted.
+        """
+        offset = -(-self.head // alignment) * alignment
+        if offset + size > (self.region + 1) * self.region_size:
+            return None
+        self.head = offset + size
+        return offset
+
+
+class StreamingBuffer:
+    """
+    Shared ring buffer for per-frame dynamic uploads.
+
+    Passes upload vertex, instance, indirect, uniform and storage data that
+    only lives for one frame into sub-allocations of one large buffer
+    instead of owning (and orphaning) buffers of their own. Each frame
+    writes a different region, so a region is never rewritten while the
+    GPU may still read it. `end_frame()` records a fence for the region.
+    `begin_frame()` waits on the fence of the region it is about to reuse
+    `frames_in_flight` frames later. That wait only blocks if the GPU
+    lags that far behind.
+
+    moderngl has no sync objects. The fence is an empty timer query issued
+    after the frame's commands: its result becomes available once the GPU
+    has reached that point.
+
+    When a frame outgrows its region, the ring is reallocated twice as
+    large. Allocations already handed out keep pointing at the old
+    buffer, which is released at the next `begin_frame()`.
+    """
+
+    DEFAULT_ALIGNMENT = 256  # satisfies uniform/storage offset alignment
+
+    def __init__(
+        self,
+        gl: moderngl.Context,
+        region_size: int = 4 << 20,
+        frames_in_flight: int = 3,
+    ) -> None:
+        self._gl = gl
+        self._ring = RingAllocator(region_size, frames_in_flight)
+        self.buffer = gl.buffer(reserve=self._ring.capacity, dynamic=True)
+        self.generation = 0  # bumped whenever `buffer` is replaced
+        self._fences: List[Optional[moderngl.Query]] = [None] * frames_in_flight
+        self._retired: List[moderngl.Buffer] = []
+        self.last_frame_bytes = 0
+
+    @property
+    def frames_in_flight(self) -> int:
+        return self._ring.frames_in_flight
+
+    @property
+    def region_size(self) -> int:
+        return self._ring.region_size
+
+    def begin_frame(self) -> None:
+        """Switch to the next region, waiting until the GPU is done with it."""
+        for old in self._retired:
+            old.release()
+        self._retired.clear()
+
+        self.last_frame_bytes = self._ring.used
+        region = self._ring.advance()
+        fence = self._fences[region]
+        if fence is not None:
+            fence.elapsed  # blocks until the region's last frame completed
+
+    def end_frame(self) -> None:
+        """Fence the current region after this frame's commands."""
+        region = self._ring.region
+        fence = self._fences[region]
+        if fence is None:
+            fence = self._fences[region] = self._gl.query(time=True)
+        with fence:
+            pass
+
+    def allocate(
+        self, size: int, alignment: int = DEFAULT_ALIGNMENT
+    ) -> StreamAllocation:
+        """Reserve `size` bytes for this frame, growing the ring if needed."""
+        offset = self._ring.allocate(size, alignment)
+        if offset is None:
+            self._grow(size + alignment)
+            offset = self._ring.allocate(size, alignment)
+            assert offset is not None
+        return StreamAllocation(self.buffer, offset, size)
+
+    def upload(
+        self, data: np.ndarray | bytes, alignment: int = DEFAULT_ALIGNMENT
+    ) -> StreamAllocation:
+        """Copy `data` into a fresh allocation of this frame."""
+        if isinstance(data, np.ndarray):
+            data = np.ascontiguousarray(data)
+            size = data.nbytes
+        else:
+            size = len(data)
+        alloc = self.allocate(max(size, 1), alignment)
+        if size:
+            alloc.buffer.write(data, offset=alloc.offset)
+        return alloc
+
+    def release(self) -> None:
+        for old in self._retired:
+            old.release()
+        self._retired.clear()
+        self._fences = [None] * self.frames_in_flight
+        self.buffer.release()
+
+    def _grow(self, needed: int) -> None:
+        """Reallocate with regions of at least `needed` (and 2x) bytes."""
+        ring = self._ring
+        region_size = max(2 * ring.region_size, needed)
+        ring.region_size = region_size
+        ring.head = ring.region * region_size
+
+        self._retired.append(self.buffer)
+        self.buffer = self._gl.buffer(reserve=ring.capacity, dynamic=True)
+        self.generation += 1
@@ -0,0 +1,31 @@
+// Clustered point lights, binned on the CPU (helpers/light_clusters.py).
+struct PointLight {
+    vec4 pos_radius;       // xyz = world position, w = radius (<= 0: unbounded)
+    vec4 color_intensity;  // rgb = color, w = intensity
+};
+
+layout(std430, binding = 11) readonly buffer LightBuffer {
+    PointLight u_lights[];
+};
+layout(std430, binding = 12) readonly buffer ClusterBuffer {
+    uvec2 u_clusters[];    // offset, count into u_light_indices
+};
+layout(std430, binding = 13) readonly buffer LightIndexBuffer {
+    uint u_light_indices[];
+};
+
+uniform uvec3 u_cluster_grid;        // tiles x, tiles y, depth slices
+uniform vec2  u_cluster_tile_size;   // pixels per tile
+uniform vec2  u_cluster_depth;       // slice = log(depth) * x + y
+uniform vec4  u_cluster_view_depth;  // depth = dot(this, vec4(p_ws, 1))
+
+uvec2 cluster_lights(vec2 frag_xy, vec3 pos_ws) {
+    float depth = dot(u_cluster_view_depth, vec4(pos_ws, 1.0));
+    int slice = int(floor(log(max(depth, 1e-6)) * u_cluster_depth.x + u_cluster_depth.y));
+    ivec3 c = clamp(
+        ivec3(ivec2(frag_xy / u_cluster_tile_size), slice),
+        ivec3(0),
+        ivec3(u_cluster_grid) - 1
+    );
+    return u_clusters[(c.z * int(u_cluster_grid.y) + c.y) * int(u_cluster_grid.x) + c.x];
+}
@@ -7,14 +7,11 @@ layout(binding=0)uniform sampler2D u_g_albedo;
 layout(binding=1)uniform sampler2D u_g_normal;
 layout(binding=2)uniform sampler2D u_g_orm;   // g = roughness, b = metallic
 layout(binding=3)uniform sampler2D u_g_depth;
+uniform vec2 u_uv_scale = vec2(1.0); // drawn region of the G-buffer (dynamic resolution)
 
-uniform mat4 u_inv_view_proj;
-uniform vec3 u_camera_pos;
+#include "frame_constants.glsl"
 
-const int MAX_LIGHTS = 64;
-uniform int   u_light_count;
-uniform vec4  u_light_pos_radius[MAX_LIGHTS];
-uniform vec4  u_light_color_intensity[MAX_LIGHTS];
+#include "clustered_lights.glsl"
 
 layout(binding=10) uniform sampler2D u_sky_lut;
 uniform float u_sky_max_mip;
@@ -115,18 +112,19 @@ float hash12(vec2 p) {
 
 void main() {
     // 1. Sample G-Buffer
-    vec3 albedo_srgb = texture(u_g_albedo, v_uv).rgb;
+    vec2 g_uv = v_uv * u_uv_scale;
+    vec3 albedo_srgb = texture(u_g_albedo, g_uv).rgb;
     vec3 albedo = pow(albedo_srgb, vec3(2.2)); // keep if you stored sRGB; remove if already linear
 
-    vec3 n_enc = texture(u_g_normal, v_uv).xyz;
+    vec3 n_enc = texture(u_g_normal, g_uv).xyz;
     vec3 N = normalize(n_enc * 2.0 - 1.0);
 
-    vec3 orm = texture(u_g_orm, v_uv).xyz;
+    vec3 orm = texture(u_g_orm, g_uv).xyz;
     float ao        = orm.r;
     float roughness = clamp(orm.g, 0.02, 1.0);
     float metallic  = clamp(orm.b, 0.0, 1.0);
 
-    float depth01 = texture(u_g_depth, v_uv).r;
+    float depth01 = texture(u_g_depth, g_uv).r;
 
     // View ray direction for background
     vec3 Vray = view_dir_from_uv(v_uv);
@@ -147,12 +145,14 @@ void main() {
 
     vec3 Lo = vec3(0.0);
 
-    // 3. Lighting Loop
-    // NOTE: u_light_color_intensity.rgb is "color", .w is intensity scale.
+    // 3. Lighting Loop over the lights of this pixel's cluster
+    // NOTE: color_intensity.rgb is "color", .w is intensity scale.
     //       We use inverse-square; radius is a hard cutoff only.
-    for (int i = 0; i < u_light_count; ++i) {
-        vec3  Lpos   = u_light_pos_radius[i].xyz;
-        float radius = u_light_pos_radius[i].w;
+    uvec2 cluster = cluster_lights(gl_FragCoord.xy, pos_ws);
+    for (uint k = 0u; k < cluster.y; ++k) {
+        PointLight light = u_lights[u_light_indices[cluster.x + k]];
+        vec3  Lpos   = light.pos_radius.xyz;
+        float radius = light.pos_radius.w;
 
         vec3  toL = Lpos - pos_ws;
         float dist2 = dot(toL, toL);
@@ -169,8 +169,8 @@ void main() {
         if (NdotL <= 0.0 || NdotV <= 0.0) continue;
 
         // Radiance at the shading point
-        vec3 lightColor = u_light_color_intensity[i].rgb;
-        float intensity = u_light_color_intensity[i].w;
+        vec3 lightColor = light.color_intensity.rgb;
+        float intensity = light.color_intensity.w;
         vec3 radiance = lightColor * intensity / max(dist2, 1e-6);
 
         float D = DistributionGGX(N, H, roughness);
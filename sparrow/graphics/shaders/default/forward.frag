@@ -12,9 +12,8 @@ struct Material {
 
 uniform Material u_material;
 
-uniform vec3 u_light_color;
-uniform vec3 u_light_pos;
-uniform vec3 u_camera_pos;
+#include "frame_constants.glsl"
+#include "clustered_lights.glsl"
 
 layout(binding = 5) uniform sampler2D u_sky_lut;
 
@@ -96,20 +95,31 @@ vec3 fresnelSchlick(float cosTheta, vec3 F0) {
 
 void main() {
     vec3 N = normalize(v_normal);
-    vec3 L = normalize(u_light_pos - v_frag_pos);
 
     float numColorSteps = 4.0;
 
-    float diffuse = max(dot(N, L), 0.0);
-
-    float diffuseToon = max(ceil(diffuse * numColorSteps) / numColorSteps, 0.0);
-
     vec3 ambient = vec3(0.1) * u_material.albedo;
-
-    vec3 lightColor = u_light_color;
     vec3 objectColor = u_material.albedo;
 
-    vec3 color = ambient + (diffuseToon * lightColor * objectColor);
+    // Toon diffuse from every light of this fragment's cluster; radius is a
+    // hard cutoff as in the deferred path.
+    vec3 lit = vec3(0.0);
+    uvec2 cluster = cluster_lights(gl_FragCoord.xy, v_frag_pos);
+    for (uint k = 0u; k < cluster.y; ++k) {
+        PointLight light = u_lights[u_light_indices[cluster.x + k]];
+        vec3 toL = light.pos_radius.xyz - v_frag_pos;
+        float radius = light.pos_radius.w;
+        if (radius > 0.0 && dot(toL, toL) > radius * radius) continue;
+
+        vec3 L = normalize(toL);
+        float diffuse = max(dot(N, L), 0.0);
+        float diffuseToon = max(ceil(diffuse * numColorSteps) / numColorSteps, 0.0);
+
+        vec3 lightColor = light.color_intensity.rgb * light.color_intensity.w;
+        lit += diffuseToon * lightColor;
+    }
+
+    vec3 color = ambient + lit * objectColor;
 
     fragColor = vec4(color, 1.0);
 }
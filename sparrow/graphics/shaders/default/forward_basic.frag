@@ -0,0 +1,8 @@
+#version 460 core
+out vec4 fragColor;
+
+uniform vec3 u_albedo;
+
+void main() {
+    fragColor = vec4(u_albedo, 1.0);
+}
@@ -0,0 +1,13 @@
+#version 460 core
+layout (location=0) in vec3 in_pos;
+in uint in_instance;
+
+layout(std430, binding = 8) readonly buffer InstanceBuffer {
+    mat4 u_models[];
+};
+
+#include "frame_constants.glsl"
+
+void main() {
+    gl_Position = u_view_proj * u_models[in_instance] * vec4(in_pos, 1.0);
+}
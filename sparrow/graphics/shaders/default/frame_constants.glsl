@@ -0,0 +1,10 @@
+// Per-frame constants, uploaded once per frame by the render graph
+// (graph/frame_constants.py) and shared by every pass.
+layout(std140, binding = 0) uniform FrameConstants {
+    mat4  u_view_proj;
+    mat4  u_inv_view_proj;
+    vec3  u_camera_pos;
+    int   u_frame_index;
+    vec2  u_resolution;     // viewport in pixels
+    float u_dt_seconds;
+};
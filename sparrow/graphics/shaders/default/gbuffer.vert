@@ -3,17 +3,22 @@
 in vec3 in_pos;
 in vec3 in_normal;
 in vec2 in_uv;
+in uint in_instance;
 
-uniform mat4 u_model;
-uniform mat4 u_view_proj;
+layout(std430, binding = 8) readonly buffer InstanceBuffer {
+    mat4 u_models[];
+};
+
+#include "frame_constants.glsl"
 
 out vec3 v_normal;
 out vec2 v_uv;
 
 void main() {
-    vec4 world_pos = u_model * vec4(in_pos, 1.0);
+    mat4 model = u_models[in_instance];
+    vec4 world_pos = model * vec4(in_pos, 1.0);
 
-    mat3 normal_mat = transpose(inverse(mat3(u_model)));
+    mat3 normal_mat = transpose(inverse(mat3(model)));
     v_normal = normalize(normal_mat * in_normal);   
     
     v_uv = in_uv;
@@ -1,14 +1,53 @@
-#version 330 core
+#version 430 core
 
-in vec2 in_position;
+// Model-space outline segments from the shared shape arena, stored as
+// endpoint pairs: segment i runs from u_points[2i] to u_points[2i + 1].
+layout(std430, binding = 9) readonly buffer ShapeArena {
+    vec2 u_points[];
+};
+
+// Per-instance 2D affine rows, color and stroke width in pixels.
+in vec3 in_affine_x;
+in vec3 in_affine_y;
 in vec4 in_color;
+in float in_width;
 
-uniform mat4 u_view_proj;
+#include "frame_constants.glsl"
 
 out vec4 v_color;
 
+// Each segment is expanded to a screen-space quad (two triangles):
+// x picks the endpoint, y the side of the centerline.
+const vec2 CORNERS[6] = vec2[](
+    vec2(0.0, -1.0), vec2(0.0, 1.0), vec2(1.0, -1.0),
+    vec2(1.0, -1.0), vec2(0.0, 1.0), vec2(1.0, 1.0)
+);
+
+vec4 to_clip(vec2 local) {
+    vec3 p = vec3(local, 1.0);
+    return u_view_proj * vec4(dot(in_affine_x, p), dot(in_affine_y, p), 0.0, 1.0);
+}
+
 void main() {
+    int segment = gl_VertexID / 6;
+    vec2 corner = CORNERS[gl_VertexID % 6];
+
+    vec4 a = to_clip(u_points[2 * segment]);
+    vec4 b = to_clip(u_points[2 * segment + 1]);
+
+    vec2 a_px = a.xy / a.w * 0.5 * u_resolution;
+    vec2 b_px = b.xy / b.w * 0.5 * u_resolution;
+    vec2 delta = b_px - a_px;
+    vec2 dir = length(delta) > 1e-6 ? normalize(delta) : vec2(1.0, 0.0);
+    vec2 normal = vec2(-dir.y, dir.x);
+
+    // Square caps (half a width past each end) close the gaps at joints.
+    float half_width = 0.5 * max(in_width, 1.0);
+    vec2 offset_px = (normal * corner.y + dir * (2.0 * corner.x - 1.0)) * half_width;
+
+    vec4 pos = corner.x < 0.5 ? a : b;
+    pos.xy += offset_px / (0.5 * u_resolution) * pos.w;
+
     v_color = in_color;
-    vec4 world_pos = vec4(in_position, 0.0, 1.0);
-    gl_Position = u_view_proj * world_pos;
+    gl_Position = pos;
 }
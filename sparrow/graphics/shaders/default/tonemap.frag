@@ -4,6 +4,7 @@ in vec2 v_uv;
 out vec4 frag_color;
 
 uniform sampler2D u_hdr;
+uniform vec2 u_uv_scale = vec2(1.0); // drawn region of u_hdr (dynamic resolution)
 
 vec3 tonemap_reinhard(vec3 x) {
     return x / (1.0 + x);
@@ -11,7 +12,7 @@ vec3 tonemap_reinhard(vec3 x) {
 
 
 void main() {
-    vec3 hdr = texture(u_hdr, v_uv).rgb;
+    vec3 hdr = texture(u_hdr, v_uv * u_uv_scale).rgb;
 
     vec3 mapped = tonemap_reinhard(hdr);
 
@@ -1,13 +1,18 @@
 # sparrow/graphics/shaders/shader_manager.py
 from __future__ import annotations
 
-from dataclasses import dataclass
+import json
+import re
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Dict, Sequence, Tuple
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 import moderngl
 
 from sparrow.graphics.shaders.program_types import ProgramHandle, ShaderStages
+from sparrow.graphics.shaders.source_cache import ShaderSourceCache
 from sparrow.graphics.util.ids import ShaderId
 
 
@@ -31,19 +36,101 @@ def _load_source(src: str) -> str:
     return src
 
 
+_INCLUDE_RE = re.compile(r'^[ \t]*#include[ \t]+"([^"]+)"[ \t]*$', re.MULTILINE)
+
+
+def _resolve_includes(
+    source: str,
+    search_dirs: Sequence[Path],
+    included: Optional[Set[Path]] = None,
+) -> str:
+    """
+    Inline `#include "file"` directives.
+
+    Files are looked up in `search_dirs` in order and inlined at most once
+    per stage (include guards are implicit). `#line` directives around each
+    inlined file keep compiler line numbers meaningful.
+
+    Raises:
+        FileNotFoundError: If an included file is in none of the directories.
+    """
+    if included is None:
+        included = set()
+
+    def replace(match: re.Match[str]) -> str:
+        name = match.group(1)
+        for directory in search_dirs:
+            path = (directory / name).resolve()
+            if path.is_file():
+                break
+        else:
+            raise FileNotFoundError(f"Shader include '{name}' not found")
+
+        next_line = source.count("\n", 0, match.start()) + 2
+        if path in included:
+            return f"#line {next_line}"
+        included.add(path)
+
+        text = _resolve_includes(
+            _load_source(str(path)), [path.parent, *search_dirs], included
+        )
+        return f"#line 1\n{text}\n#line {next_line}"
+
+    return _INCLUDE_RE.sub(replace, source)
+
+
+_VERSION_RE = re.compile(r"^[ \t]*#version[^\n]*$", re.MULTILINE)
+
+
 def _inject_defines(source: str, defines: Sequence[ShaderDefine]) -> str:
+    """
+    Insert `#define`s right after the `#version` directive.
+
+    GLSL requires `#version` to come first, so defines go below it, followed
+    by a `#line` directive that keeps the original line numbers.
+    """
     if not defines:
         return source
 
-    lines = [f"#define {d.key} {d.value}" for d in defines]
-    return "\n".join(lines) + "\n\n" + source
+    block = "\n".join(f"#define {d.key} {d.value}" for d in defines)
+    match = _VERSION_RE.search(source)
+    if match is None:
+        return f"{block}\n#line 1\n{source}"
+
+    end = match.end()
+    next_line = source.count("\n", 0, end) + 2
+    return f"{source[:end]}\n{block}\n#line {next_line}{source[end:]}"
 
 
-def _load_stage(src: str | None, req: ShaderRequest) -> str | None:
+def _load_stage(
+    src: str | None,
+    req: ShaderRequest,
+    include_paths: Sequence[Path] = (),
+    cache: Optional[ShaderSourceCache] = None,
+) -> str | None:
     if src is None:
         return None
+
+    defines = [(d.key, d.value) for d in req.defines]
+    if cache is not None:
+        cached = cache.get(src, defines, include_paths)
+        if cached is not None:
+            return cached
+
     text = _load_source(src)
-    return _inject_defines(text, req.defines)
+    is_file = Path(src).exists()
+    included: Set[Path] = set()
+    if "#include" in text:
+        search_dirs = list(include_paths)
+        if is_file:
+            search_dirs.insert(0, Path(src).parent)
+        text = _resolve_includes(text, search_dirs, included)
+    text = _inject_defines(text, req.defines)
+
+    if cache is not None:
+        deps = [Path(src), *included] if is_file else list(included)
+        cache.put(src, defines, include_paths, text, deps)
+    return text
 
 
 @dataclass(frozen=True, slots=True)
@@ -71,6 +158,102 @@ class ShaderRequest:
     label: str = ""
 
 
+class ShaderVariantManifest:
+    """
+    Ordered set of shader variants, saved as JSON between sessions.
+
+    ShaderManager records every variant it compiles here; loading the
+    manifest at startup and warming it up moves those compiles to load time.
+    """
+
+    _FORMAT = 1
+
+    def __init__(self, requests: Iterable[ShaderRequest] = ()) -> None:
+        self._requests: Dict[
+            tuple[ShaderId, tuple[tuple[str, str], ...]], ShaderRequest
+        ] = {}
+        for req in requests:
+            self.record(req)
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def __contains__(self, req: ShaderRequest) -> bool:
+        return _make_variant_key(req) in self._requests
+
+    @property
+    def requests(self) -> List[ShaderRequest]:
+        return list(self._requests.values())
+
+    def record(self, req: ShaderRequest) -> None:
+        self._requests.setdefault(_make_variant_key(req), req)
+
+    def save(self, path: str | Path) -> None:
+        variants = [
+            {
+                "shader_id": str(req.shader_id),
+                "label": req.label,
+                "stages": {k: v for k, v in asdict(req.stages).items() if v},
+                "defines": [[d.key, d.value] for d in req.defines],
+            }
+            for req in self._requests.values()
+        ]
+        data = {"format": self._FORMAT, "variants": variants}
+        Path(path).write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str | Path) -> ShaderVariantManifest:
+        """
+        Raises:
+            ValueError: If the file is not a manifest of this format.
+        """
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if not isinstance(data, dict) or data.get("format") != cls._FORMAT:
+            raise ValueError(f"{path} is not a shader variant manifest")
+
+        return cls(
+            ShaderRequest(
+                shader_id=ShaderId(v["shader_id"]),
+                stages=ShaderStages(**v["stages"]),
+                defines=tuple(ShaderDefine(k, val) for k, val in v["defines"]),
+                label=v.get("label", ""),
+            )
+            for v in data["variants"]
+        )
+
+
+class ShaderWarmUp:
+    """Compiles a list of variants a time budget at a time."""
+
+    def __init__(
+        self, manager: ShaderManager, requests: Iterable[ShaderRequest]
+    ) -> None:
+        self._manager = manager
+        self._pending: Deque[ShaderRequest] = deque(requests)
+
+    @property
+    def remaining(self) -> int:
+        return len(self._pending)
+
+    @property
+    def done(self) -> bool:
+        return not self._pending
+
+    def step(self, budget_ms: float) -> bool:
+        """
+        Compile variants until `budget_ms` is spent (at least one).
+
+        Returns:
+            True once every variant has been compiled.
+        """
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        while self._pending:
+            self._manager._warm(self._pending.popleft())
+            if time.perf_counter() >= deadline:
+                break
+        return not self._pending
+
+
 class ShaderManager:
     """
     Central shader loader/compiler/cache.
@@ -83,9 +266,20 @@ class ShaderManager:
       - optional hot reload support
     """
 
-    def __init__(self, gl: moderngl.Context, *, include_paths: Sequence[str]) -> None:
+    def __init__(
+        self,
+        gl: moderngl.Context,
+        *,
+        include_paths: Sequence[str],
+        source_cache_dir: str | None = None,
+    ) -> None:
         self._gl = gl
-        self._include_paths = tuple(include_paths)
+        self._include_paths = tuple(Path(p) for p in include_paths)
+        self._source_cache = (
+            ShaderSourceCache(source_cache_dir) if source_cache_dir else None
+        )
+        # Every variant compiled this session.
+        self.manifest = ShaderVariantManifest()
 
         self._shader_cache: Dict[
             tuple[ShaderId, tuple[tuple[str, str], ...]], ProgramHandle
@@ -103,10 +297,11 @@ class ShaderManager:
 
         # TODO: Replace individual stages with a tagged union
         # dataclass to remove check below.
-        vert = _load_stage(stages.vertex, req)
-        frag = _load_stage(stages.fragment, req)
-        geom = _load_stage(stages.geometry, req)
-        comp = _load_stage(stages.compute, req)
+        paths, cache = self._include_paths, self._source_cache
+        vert = _load_stage(stages.vertex, req, paths, cache)
+        frag = _load_stage(stages.fragment, req, paths, cache)
+        geom = _load_stage(stages.geometry, req, paths, cache)
+        comp = _load_stage(stages.compute, req, paths, cache)
 
         if comp is not None:
             program = self._gl.compute_shader(comp)
@@ -123,8 +318,32 @@ class ShaderManager:
 
         handle = ProgramHandle(program=program, label=req.label or str(req.shader_id))
         self._shader_cache[key] = handle
+        self.manifest.record(req)
         return handle
 
+    def warm_up(self, requests: Iterable[ShaderRequest]) -> int:
+        """
+        Compile variants ahead of their first use.
+
+        Variants whose sources are gone or no longer compile are skipped, so
+        a manifest from an older build does not break startup.
+
+        Returns:
+            The number of variants that are now compiled.
+        """
+        return sum(self._warm(req) for req in requests)
+
+    def begin_warm_up(self, requests: Iterable[ShaderRequest]) -> ShaderWarmUp:
+        """Like `warm_up()`, but compiled a slice per `step()`, e.g. per frame."""
+        return ShaderWarmUp(self, requests)
+
+    def _warm(self, req: ShaderRequest) -> bool:
+        try:
+            self.get(req)
+        except (OSError, ValueError, moderngl.Error):
+            return False
+        return True
+
     def invalidate(self, shader_id: ShaderId) -> None:
         """Drop cached programs for a shader id; next get() recompiles."""
         to_delete = [k for k in self._shader_cache if k[0] == shader_id]
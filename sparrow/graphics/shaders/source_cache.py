@@ -0,0 +1,94 @@
+# sparrow/graphics/shaders/source_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+Defines = Sequence[Tuple[str, str]]
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class ShaderSourceCache:
+    """
+    On-disk cache of preprocessed, define-injected shader stage sources.
+
+    Sources are stored once per content hash (`<sha256>.glsl`). A small
+    index entry per (stage source, defines, include paths) names the
+    content hash and the files it was built from, with their mtimes and
+    sizes. A hit therefore costs a few `stat` calls and one read instead of
+    reading the stage and all of its includes and preprocessing them again.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+
+    def get(
+        self, src: str, defines: Defines, include_paths: Sequence[Path]
+    ) -> Optional[str]:
+        """Return the cached source, or None if missing or out of date."""
+        entry_path = self._entry_path(src, defines, include_paths)
+        try:
+            entry = json.loads(entry_path.read_text(encoding="utf-8"))
+            blob = self._dir / f"{entry['source']}.glsl"
+            text = blob.read_text(encoding="utf-8")
+        except (OSError, ValueError, KeyError):
+            return None
+
+        for path, stamp in entry.get("deps", {}).items():
+            if _stamp(Path(path)) != tuple(stamp):
+                return None
+        if _content_hash(text) != entry["source"]:
+            return None  # truncated or edited by hand
+        return text
+
+    def put(
+        self,
+        src: str,
+        defines: Defines,
+        include_paths: Sequence[Path],
+        text: str,
+        deps: Iterable[Path],
+    ) -> None:
+        """Store `text`, built from the files `deps`."""
+        digest = _content_hash(text)
+        stamps: Dict[str, Tuple[int, int]] = {}
+        for path in deps:
+            stamp = _stamp(path)
+            if stamp is None:
+                return  # a source vanished mid-build; don't cache it
+            stamps[str(path)] = stamp
+
+        blob = self._dir / f"{digest}.glsl"
+        if not blob.exists():
+            _write_atomic(blob, text)
+        entry = json.dumps({"source": digest, "deps": stamps})
+        _write_atomic(self._entry_path(src, defines, include_paths), entry)
+
+    def _entry_path(
+        self, src: str, defines: Defines, include_paths: Sequence[Path]
+    ) -> Path:
+        key = json.dumps(
+            [src, [list(d) for d in defines], [str(p) for p in include_paths]]
+        )
+        return self._dir / f"{_content_hash(key)}.json"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
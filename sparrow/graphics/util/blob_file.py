@@ -0,0 +1,142 @@
+# sparrow/graphics/util/blob_file.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Raw cache files: magic, u32 header length, JSON header, then each blob
+# starting on a 64-byte boundary so it can be memory-mapped as is. The
+# header's "blobs" entry lists (offset, length) per blob; the rest of the
+# header belongs to the caller.
+_ALIGN = 64
+
+Buffer = bytes | memoryview
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def file_digest(path: str | Path) -> str:
+    """SHA-256 of a file's content."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def source_stamp(
+    path: str | Path, *, digest: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Identify the current content of `path`: mtime, size and SHA-256.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    st = os.stat(path)
+    return {
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "sha256": digest or file_digest(path),
+    }
+
+
+def current_stamp(
+    stamp: Mapping[str, Any], path: str | Path
+) -> Optional[Dict[str, Any]]:
+    """
+    The stamp of `path` if `stamp` still describes its content, else None.
+
+    The content is unchanged if mtime and size match. Otherwise, if the
+    size matches, the content hash decides (a checkout or copy changes the
+    mtime but not the content). A returned stamp that differs from `stamp`
+    only has a new mtime; callers may write it back.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    if stamp.get("size") != st.st_size:
+        return None
+    if stamp.get("mtime_ns") == st.st_mtime_ns:
+        return {key: stamp.get(key) for key in ("mtime_ns", "size", "sha256")}
+    try:
+        if stamp.get("sha256") != file_digest(path):
+            return None
+    except OSError:
+        return None
+    return {
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "sha256": stamp["sha256"],
+    }
+
+
+def read_blob_file(
+    path: str | Path, magic: bytes
+) -> Optional[Tuple[Dict[str, Any], List[memoryview]]]:
+    """
+    Read a blob file's header and memory-map its blobs.
+
+    Returns:
+        The header and one read-only view per blob, or None if the file is
+        missing, of another format, or truncated.
+    """
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(magic)) != magic:
+                return None
+            (length,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(length))
+        spans = [(int(offset), int(size)) for offset, size in header["blobs"]]
+        mapped = np.memmap(path, dtype=np.uint8, mode="r")
+    except (OSError, ValueError, KeyError, TypeError, struct.error):
+        return None
+
+    if any(offset + size > len(mapped) for offset, size in spans):
+        return None
+    views = [memoryview(mapped[offset : offset + size]) for offset, size in spans]
+    return header, views
+
+
+def write_blob_file(
+    path: str | Path,
+    magic: bytes,
+    header: Mapping[str, Any],
+    blobs: Sequence[Buffer],
+) -> None:
+    """
+    Atomically write `header` and `blobs` to `path`.
+
+    Failures to write are ignored; callers use these files as caches.
+    """
+    path = Path(path)
+    sizes = [memoryview(blob).nbytes for blob in blobs]
+    spans = [[0, size] for size in sizes]
+    full = dict(header, blobs=spans)
+
+    # The offsets are part of the header; reserve room for them first.
+    preamble = len(magic) + 4
+    offset = _aligned(preamble + len(json.dumps(full)) + 24 * len(spans))
+    for span in spans:
+        span[0] = offset
+        offset = _aligned(offset + span[1])
+    encoded = json.dumps(full).encode("utf-8")
+    assert not spans or preamble + len(encoded) <= spans[0][0]
+
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(magic + struct.pack("<I", len(encoded)) + encoded)
+            for blob, (blob_offset, _) in zip(blobs, spans):
+                f.seek(blob_offset)
+                f.write(blob)
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from sparrow.core.world import World
+from sparrow.graphics.graph.render_graph import PreparedFrame
 from sparrow.graphics.renderer.renderer import Renderer
 from sparrow.resources.rendering import (
     RenderContext,
@@ -28,7 +29,7 @@ def ensure_renderer_resource(world: World) -> RendererResource | None:
     return renderer_res
 
 
-def render_system(world: World) -> None:
+def render_system(world: World, prepared: PreparedFrame | None = None) -> None:
     frame_res = world.try_resource(RenderFrame)
     if frame_res is None:
         return
@@ -37,4 +38,4 @@ def render_system(world: World) -> None:
     if renderer_res is None:
         return
 
-    renderer_res.renderer.render_frame(frame_res.frame)
+    renderer_res.renderer.render_frame(frame_res.frame, prepared)
@@ -0,0 +1,126 @@
+from PIL import Image
+
+from sparrow.graphics.assets.mesh_manager import MeshManager
+from sparrow.graphics.assets.streaming import AssetLoader, AssetState
+from sparrow.graphics.assets.texture_manager import TextureManager
+from sparrow.graphics.renderer.settings import AssetStreamingSettings
+from sparrow.graphics.util.ids import MeshId, TextureId
+
+TRIANGLE = "v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 3\n"
+
+
+class _Object:
+    def __init__(self, data=None):
+        self.data = data
+        self.released = False
+
+    def release(self):
+        self.released = True
+
+    def build_mipmaps(self):
+        pass
+
+
+class _GL:
+    """Just enough of a moderngl.Context for the asset managers."""
+
+    def buffer(self, data=None, **kwargs):
+        return _Object(bytes(data))
+
+    def texture(self, size, components, data=None, dtype="f1"):
+        return _Object(data)
+
+
+def _loader(**budget):
+    gl = _GL()
+    meshes = MeshManager(gl)
+    textures = TextureManager(gl)
+    settings = AssetStreamingSettings(workers=1, **budget)
+    return meshes, textures, AssetLoader(meshes, textures, settings)
+
+
+def test_reserved_mesh_is_filled_in_place(tmp_path):
+    path = tmp_path / "tri.obj"
+    path.write_text(TRIANGLE)
+    meshes, _, loader = _loader()
+
+    request = loader.load_mesh(MeshId("tri"), str(path))
+    handle = meshes.get(MeshId("tri"))
+    assert not meshes.is_resident(MeshId("tri"))
+    assert handle.draw_count == 36  # the placeholder cube
+
+    loader.flush()
+
+    assert request.state is AssetState.RESIDENT
+    assert meshes.is_resident(MeshId("tri"))
+    assert meshes.get(MeshId("tri")) is handle
+    assert handle.draw_count == 3
+    assert meshes.revision == 1
+    loader.shutdown()
+
+
+def test_uploads_respect_the_byte_budget(tmp_path):
+    for i in range(3):
+        Image.new("RGBA", (8, 8)).save(tmp_path / f"{i}.png")
+    # Each texture is 256 bytes; the budget fits one and a half.
+    _, textures, loader = _loader(upload_bytes_per_frame=384)
+
+    requests = [
+        loader.load_texture(TextureId(f"t{i}"), str(tmp_path / f"{i}.png"))
+        for i in range(3)
+    ]
+    loader._executor.shutdown(wait=True)  # all decodes finished
+
+    assert [loader.pump(), loader.pump(), loader.pump()] == [1, 1, 1]
+    assert all(r.state is AssetState.RESIDENT for r in requests)
+    assert len(textures.get(TextureId("t0")).texture.data) == 256
+
+
+def test_flush_uploads_what_a_limited_pump_left_behind(tmp_path):
+    for i in range(3):
+        Image.new("RGBA", (8, 8)).save(tmp_path / f"{i}.png")
+    _, _, loader = _loader(upload_bytes_per_frame=1)
+
+    requests = [
+        loader.load_texture(TextureId(f"t{i}"), str(tmp_path / f"{i}.png"))
+        for i in range(3)
+    ]
+    loader._executor.shutdown(wait=True)
+    assert loader.pump() == 1
+
+    loader.flush()
+
+    assert all(r.state is AssetState.RESIDENT for r in requests)
+
+
+def test_failed_loads_keep_the_placeholder():
+    _, textures, loader = _loader()
+
+    request = loader.load_texture(TextureId("missing"), "does/not/exist.png")
+    placeholder = textures.get(TextureId("missing")).texture
+    loader.flush()
+
+    assert request.state is AssetState.FAILED
+    assert isinstance(request.error, FileNotFoundError)
+    assert textures.get(TextureId("missing")).texture is placeholder
+    assert not textures.is_resident(TextureId("missing"))
+    assert loader.pending == 0
+    loader.shutdown()
+
+
+def test_cached_textures_upload_from_the_mapping(tmp_path):
+    Image.new("RGBA", (8, 8), (1, 2, 3, 4)).save(tmp_path / "t.png")
+    cache = str(tmp_path / "cache")
+    _, _, cold = _loader(texture_cache_dir=cache)
+    cold.load_texture(TextureId("t"), str(tmp_path / "t.png"))
+    cold.flush()
+
+    _, textures, warm = _loader(texture_cache_dir=cache)
+    warm.load_texture(TextureId("t"), str(tmp_path / "t.png"))
+    warm.flush()
+
+    data = textures.get(TextureId("t")).texture.data
+    assert isinstance(data, memoryview)
+    assert bytes(data) == bytes((1, 2, 3, 4)) * 64
+    cold.shutdown()
+    warm.shutdown()
@@ -0,0 +1,153 @@
+import numpy as np
+
+from sparrow.graphics.helpers.bvh import (
+    build_bvh,
+    transformed_bounds,
+    triangle_bounds,
+)
+
+
+def _random_triangles(count, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(-10.0, 10.0, size=(count, 1, 3))
+    return (centers + rng.normal(scale=0.3, size=(count, 3, 3))).astype(
+        np.float32
+    )
+
+
+def _leaves(bvh):
+    nodes = bvh.nodes
+    return nodes[nodes["count"] > 0]
+
+
+def _hit_triangle(origin, direction, tri):
+    e1, e2 = tri[1] - tri[0], tri[2] - tri[0]
+    p = np.cross(direction, e2)
+    det = e1 @ p
+    if abs(det) < 1e-9:
+        return None
+    s = origin - tri[0]
+    u = (s @ p) / det
+    q = np.cross(s, e1)
+    v = (direction @ q) / det
+    t = (e2 @ q) / det
+    if u < 0 or v < 0 or u + v > 1 or t <= 1e-4:
+        return None
+    return t
+
+
+def _hit_box(origin, inv_dir, lo, hi, t_max):
+    t0, t1 = (lo - origin) * inv_dir, (hi - origin) * inv_dir
+    enter = max(np.minimum(t0, t1).max(), 0.0)
+    return enter <= min(np.maximum(t0, t1).min(), t_max)
+
+
+def _traverse(bvh, tris, origin, direction):
+    inv_dir = 1.0 / direction
+    best = np.inf
+    stack = [0]
+    while stack:
+        node = bvh.nodes[stack.pop()]
+        if not _hit_box(origin, inv_dir, node["lo"], node["hi"], best):
+            continue
+        first = int(node["left_first"])
+        if node["count"] == 0:
+            stack += [first, first + 1]
+            continue
+        for prim in bvh.order[first : first + node["count"]]:
+            t = _hit_triangle(origin, direction, tris[prim])
+            if t is not None:
+                best = min(best, t)
+    return best
+
+
+def test_leaves_cover_every_primitive_once():
+    tris = _random_triangles(500)
+    bvh = build_bvh(*triangle_bounds(tris), leaf_size=4)
+
+    np.testing.assert_array_equal(np.sort(bvh.order), np.arange(500))
+    leaves = _leaves(bvh)
+    assert leaves["count"].sum() == 500
+    assert leaves["count"].max() <= 4 or len(leaves) == 1
+
+
+def test_children_are_contained_in_their_parent():
+    tris = _random_triangles(300, seed=1)
+    lo, hi = triangle_bounds(tris)
+    bvh = build_bvh(lo, hi)
+    nodes = bvh.nodes
+
+    for node in nodes[nodes["count"] == 0]:
+        for child in nodes[node["left_first"] : node["left_first"] + 2]:
+            assert np.all(child["lo"] >= node["lo"])
+            assert np.all(child["hi"] <= node["hi"])
+    for leaf in _leaves(bvh):
+        prims = bvh.order[leaf["left_first"] : leaf["left_first"] + leaf["count"]]
+        assert np.all(lo[prims] >= leaf["lo"] - 1e-6)
+        assert np.all(hi[prims] <= leaf["hi"] + 1e-6)
+
+
+def test_traversal_matches_brute_force():
+    tris = _random_triangles(400, seed=2).astype(np.float64)
+    bvh = build_bvh(*triangle_bounds(tris))
+    rng = np.random.default_rng(3)
+
+    for _ in range(50):
+        origin = rng.uniform(-15.0, 15.0, size=3)
+        direction = rng.normal(size=3)
+        direction /= np.linalg.norm(direction)
+
+        hits = [_hit_triangle(origin, direction, tri) for tri in tris]
+        expected = min((t for t in hits if t is not None), default=np.inf)
+        assert _traverse(bvh, tris, origin, direction) == expected
+
+
+def test_transformed_bounds_enclose_rotated_corners():
+    lo, hi = np.array([[-1.0, -2.0, -0.5]]), np.array([[1.0, 2.0, 0.5]])
+    angle = 0.7
+    model = np.eye(4)
+    model[:2, :2] = [[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]]
+    model[:3, 3] = [5.0, 0.0, -1.0]
+
+    w_lo, w_hi = transformed_bounds(lo, hi, model[None])
+
+    corners = np.array(np.meshgrid(*zip(lo[0], hi[0]))).reshape(3, -1).T
+    world = corners @ model[:3, :3].T + model[:3, 3]
+    np.testing.assert_allclose(w_lo[0], world.min(axis=0))
+    np.testing.assert_allclose(w_hi[0], world.max(axis=0))
+
+
+def test_empty_input_builds_an_empty_hierarchy():
+    bvh = build_bvh(np.zeros((0, 3)), np.zeros((0, 3)))
+
+    assert len(bvh.nodes) == 0
+    assert np.all(np.isinf(bvh.bounds[0]))
+
+
+def _depth(bvh):
+    depth, stack = 0, [(0, 0)]
+    while stack:
+        index, d = stack.pop()
+        node = bvh.nodes[index]
+        depth = max(depth, d)
+        if node["count"] == 0:
+            first = int(node["left_first"])
+            stack += [(first, d + 1), (first + 1, d + 1)]
+    return depth
+
+
+def test_skewed_input_is_capped_at_max_depth():
+    # Exponentially spaced boxes make every SAH split peel off one box.
+    x = 2.0 ** np.arange(60)
+    lo = np.stack([x, np.zeros(60), np.zeros(60)], axis=1)
+    hi = lo + 1.0
+
+    assert _depth(build_bvh(lo, hi, leaf_size=1)) > 8
+    capped = build_bvh(lo, hi, leaf_size=1, max_depth=8)
+
+    assert _depth(capped) == 8
+    leaves = _leaves(capped)
+    covered = np.concatenate(
+        [capped.order[f : f + c] for f, c in leaves[["left_first", "count"]]]
+    )
+    assert sorted(covered.tolist()) == list(range(60))
@@ -0,0 +1,92 @@
+import numpy as np
+
+from sparrow.core.components import Camera, Camera2D, Transform
+from sparrow.graphics.renderer.culling import (
+    CullStats,
+    aabbs_visible,
+    circles_visible,
+    frustum_planes,
+    ortho_view_rect,
+    spheres_visible,
+)
+from sparrow.systems.camera import _calculate_camera_2d, _calculate_camera_3d
+from sparrow.types import Vector3
+
+
+def _perspective_view_proj():
+    camera = Camera(
+        fov=60.0,
+        width=100,
+        height=100,
+        near_clip=0.1,
+        far_clip=100.0,
+        target=np.zeros(3),
+    )
+    transform = Transform(pos=Vector3(0.0, 0.0, 5.0))
+    return _calculate_camera_3d(camera, transform).view_proj
+
+
+def _planes():
+    return frustum_planes(_perspective_view_proj())
+
+
+def _translations(*points):
+    models = np.repeat(np.eye(4, dtype=np.float32)[None], len(points), axis=0)
+    models[:, :3, 3] = points
+    return models
+
+
+def test_aabbs_inside_and_outside_frustum():
+    models = _translations((0, 0, 0), (0, 0, 50), (500, 0, 0), (0, 0, -150))
+    lo = np.full((4, 3), -1.0)
+    hi = np.full((4, 3), 1.0)
+
+    visible = aabbs_visible(_planes(), lo, hi, models)
+
+    assert visible.tolist() == [True, False, False, False]
+
+
+def test_box_straddling_a_plane_is_kept():
+    # Centered outside the right plane but large enough to cross it.
+    models = _translations((8.0, 0.0, 0.0))
+    visible = aabbs_visible(
+        _planes(), np.full((1, 3), -6.0), np.full((1, 3), 6.0), models
+    )
+    assert visible.tolist() == [True]
+
+
+def test_light_spheres():
+    centers = np.array([[0.0, 0.0, 0.0], [30.0, 0.0, 0.0], [30.0, 0.0, 0.0]])
+    radii = np.array([1.0, 1.0, 40.0])
+
+    assert spheres_visible(_planes(), centers, radii).tolist() == [
+        True,
+        False,
+        True,
+    ]
+
+
+def test_cull_ratio():
+    stats = CullStats(
+        draws_total=8, draws_visible=2, lights_total=2, lights_visible=2
+    )
+    assert stats.cull_ratio == 0.6
+    assert CullStats().cull_ratio == 0.0
+
+
+def test_ortho_view_rect_and_circles():
+    camera = Camera2D(zoom=10.0, width=200, height=100)
+    transform = Transform(pos=Vector3(3.0, -1.0, 0.0))
+    view_proj = _calculate_camera_2d(camera, transform).view_proj
+
+    rect = ortho_view_rect(view_proj)
+    np.testing.assert_allclose(rect, [-7.0, -6.0, 13.0, 4.0])
+
+    centers = np.array([[0.0, 0.0], [14.0, 0.0], [14.0, 0.0]])
+    radii = np.array([0.5, 0.5, 2.0])
+    assert circles_visible(rect, centers, radii).tolist() == [True, False, True]
+
+
+def test_ortho_view_rect_rejects_perspective():
+    assert ortho_view_rect(_perspective_view_proj()) is None
+
@@ -0,0 +1,70 @@
+import pytest
+
+from sparrow.graphics.passes.raytracing import RaytracingPass
+from sparrow.graphics.renderer.dynamic_resolution import (
+    DynamicResolutionController,
+)
+from sparrow.graphics.renderer.settings import (
+    DynamicResolutionSettings,
+    RaytracingRendererSettings,
+    ResolutionSettings,
+    SunlightSettings,
+)
+from sparrow.graphics.util.ids import PassId, ResourceId
+
+SETTINGS = DynamicResolutionSettings(
+    enabled=True, target_frame_ms=16.0, min_scale=0.5, cooldown_frames=5
+)
+
+
+def _run(controller, cost_at_full_scale_ms, frames):
+    """Feed frame times of a GPU whose cost grows with pixel count."""
+    for _ in range(frames):
+        controller.update(cost_at_full_scale_ms * controller.scale**2)
+    return controller.scale
+
+
+def test_scale_drops_until_the_target_is_met():
+    controller = DynamicResolutionController(SETTINGS)
+
+    scale = _run(controller, 30.0, 200)
+
+    assert scale < 1.0
+    assert 30.0 * scale**2 <= 16.0 * (1.0 + SETTINGS.headroom)
+    assert scale == pytest.approx(round(scale / SETTINGS.step) * SETTINGS.step)
+
+
+def test_scale_recovers_when_the_load_goes_away():
+    controller = DynamicResolutionController(SETTINGS)
+    _run(controller, 40.0, 200)
+
+    assert _run(controller, 8.0, 200) == SETTINGS.max_scale
+
+
+def test_scale_is_clamped_and_stable_inside_the_dead_band():
+    controller = DynamicResolutionController(SETTINGS)
+    assert _run(controller, 500.0, 200) == SETTINGS.min_scale
+
+    steady = DynamicResolutionController(SETTINGS)
+    for _ in range(100):
+        steady.update(16.5)
+    assert steady.scale == SETTINGS.max_scale
+
+
+def test_invalid_bounds_are_rejected():
+    with pytest.raises(ValueError):
+        DynamicResolutionController(DynamicResolutionSettings(max_scale=1.5))
+
+
+def test_path_tracer_accumulation_restarts_when_the_render_size_changes():
+    rt = RaytracingPass(
+        pass_id=PassId("rt"),
+        out_texture=ResourceId("hdr"),
+        settings=RaytracingRendererSettings(
+            resolution=ResolutionSettings(64, 64), sunlight=SunlightSettings()
+        ),
+    )
+
+    assert [rt._accumulate((64, 64)) for _ in range(3)] == [0, 1, 2]
+    assert [rt._accumulate((48, 48)) for _ in range(2)] == [0, 1]
+    assert rt._accumulate((64, 64)) == 0
@@ -0,0 +1,59 @@
+import numpy as np
+
+from sparrow.core.components import Camera, Transform
+from sparrow.graphics.ecs.frame_submit import RenderFrameInput
+from sparrow.graphics.graph.frame_constants import (
+    FRAME_CONSTANTS_DTYPE,
+    build_frame_constants,
+)
+from sparrow.systems.camera import _calculate_camera_3d
+from sparrow.types import Vector3
+
+
+def _frame():
+    camera = Camera(
+        fov=60.0,
+        width=320,
+        height=180,
+        near_clip=0.1,
+        far_clip=100.0,
+        target=np.zeros(3),
+    )
+    transform = Transform(pos=Vector3(1.0, 2.0, 5.0))
+    return RenderFrameInput(
+        frame_index=7,
+        dt_seconds=0.5,
+        camera=_calculate_camera_3d(camera, transform),
+        draws=[],
+        point_lights=[],
+    )
+
+
+def test_layout_matches_std140_block():
+    fields = FRAME_CONSTANTS_DTYPE.fields
+    offsets = {name: fields[name][1] for name in FRAME_CONSTANTS_DTYPE.names}
+
+    assert offsets == {
+        "view_proj": 0,
+        "inv_view_proj": 64,
+        "camera_pos": 128,
+        "frame_index": 140,
+        "resolution": 144,
+        "dt_seconds": 152,
+        "pad": 156,
+    }
+    assert FRAME_CONSTANTS_DTYPE.itemsize % 16 == 0
+
+
+def test_matrices_are_column_major_inverses():
+    frame = _frame()
+    constants = build_frame_constants(frame, 320, 180)[0]
+
+    view_proj = constants["view_proj"].T  # back to row-major
+    np.testing.assert_allclose(view_proj, frame.camera.view_proj, rtol=1e-6)
+    np.testing.assert_allclose(
+        constants["inv_view_proj"].T @ view_proj, np.eye(4), atol=1e-4
+    )
+    np.testing.assert_array_equal(constants["camera_pos"], [1.0, 2.0, 5.0])
+    assert constants["frame_index"] == 7
+    np.testing.assert_array_equal(constants["resolution"], [320, 180])
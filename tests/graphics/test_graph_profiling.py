@@ -0,0 +1,119 @@
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import numpy as np
+
+from sparrow.graphics.ecs.frame_submit import CameraData, RenderFrameInput
+from sparrow.graphics.graph.pass_base import PassBuildInfo, RenderPass
+from sparrow.graphics.graph.profiling import GraphProfiler
+from sparrow.graphics.graph.render_graph import CompiledRenderGraph
+from sparrow.graphics.util.ids import PassId
+
+
+class _Query:
+    def __init__(self, elapsed_ns):
+        self.elapsed = elapsed_ns
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _GL:
+    """Timer queries that report 1 ms, 2 ms, ... in creation order."""
+
+    def __init__(self):
+        self.created = 0
+
+    def query(self, time=False):
+        self.created += 1
+        return _Query(self.created * 1_000_000)
+
+
+def test_cpu_timings_form_a_bounded_rolling_window():
+    profiler = GraphProfiler(None, history=4)
+    for _ in range(10):
+        with profiler.measure(PassId("lighting")):
+            pass
+        profiler.end_frame()
+
+    timing = profiler.breakdown()[PassId("lighting")]
+    assert timing.samples == 4
+    assert timing.gpu_ms is None
+    assert 0.0 <= timing.cpu_ms <= timing.cpu_max_ms
+    assert not profiler.gpu_enabled
+
+
+def test_gpu_results_arrive_late_without_waiting():
+    gl = _GL()
+    profiler = GraphProfiler(gl, latency=1)
+    passes = [PassId("lighting"), PassId("bloom")]
+
+    def frame():
+        for pid in passes:
+            with profiler.measure(pid):
+                pass
+        profiler.end_frame()
+
+    # Two queries per pass are in flight before the first is read back.
+    frame()
+    frame()
+    assert profiler.poll_frame_gpu_ms() is None
+    assert all(t.gpu_ms is None for t in profiler.breakdown().values())
+
+    frame()
+    timings = profiler.breakdown()
+    # Query 1 was the capability probe; lighting owns 2 and 4, bloom 3 and 5.
+    assert timings[PassId("lighting")].gpu_ms == 2.0
+    assert timings[PassId("bloom")].gpu_ms == 3.0
+    assert profiler.poll_frame_gpu_ms() == 5.0
+    assert profiler.poll_frame_gpu_ms() is None
+
+
+@dataclass(kw_only=True)
+class _Pass(RenderPass):
+    ran: list
+
+    def build(self) -> PassBuildInfo:
+        return PassBuildInfo(pass_id=self.pass_id, name=self.pass_id)
+
+    def execute(self, exec_ctx) -> None:
+        self.ran.append(self.pass_id)
+
+
+def test_execute_times_every_active_pass():
+    ran = []
+    order = [PassId("gbuffer"), PassId("lighting")]
+    alloc = SimpleNamespace(bind_to_uniform_block=lambda binding: None)
+    graph = CompiledRenderGraph(
+        gl=None,
+        pass_order=order,
+        passes={pid: _Pass(pass_id=pid, settings=None, ran=ran) for pid in order},
+        resources={},
+        services=SimpleNamespace(stream=SimpleNamespace(upload=lambda a: alloc)),
+        outputs=frozenset({PassId("lighting")}),
+        profiler=GraphProfiler(None),
+    )
+    frame = RenderFrameInput(
+        frame_index=0,
+        dt_seconds=0.0,
+        camera=CameraData(
+            view=np.eye(4),
+            proj=np.eye(4),
+            view_proj=np.eye(4),
+            position_ws=np.zeros(3),
+            near=0.1,
+            far=100.0,
+        ),
+        draws=[],
+        point_lights=[],
+        viewport_width=64,
+        viewport_height=64,
+    )
+
+    graph.execute(frame)
+
+    assert ran == order
+    assert set(graph.profiler.breakdown()) == set(order)
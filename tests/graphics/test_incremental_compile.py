@@ -0,0 +1,223 @@
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import pytest
+
+from sparrow.graphics.graph import compilation
+from sparrow.graphics.graph.builder import RenderGraphBuilder
+from sparrow.graphics.graph.compilation import (
+    _adopt_previous_passes,
+    _pass_config,
+    _same_pass_config,
+    compile_render_graph,
+)
+from sparrow.graphics.graph.pass_base import (
+    PassBuildInfo,
+    PassResourceUse,
+    RenderPass,
+)
+from sparrow.graphics.graph.render_graph import CompiledRenderGraph
+from sparrow.graphics.graph.resources import (
+    BufferDesc,
+    FramebufferDesc,
+    FramebufferResource,
+    TextureDesc,
+    TextureResource,
+)
+from sparrow.graphics.util.ids import PassId, ResourceId, get_pass_fbo_id
+
+HDR = TextureDesc(64, 32, 4, "f2")
+
+
+@dataclass(kw_only=True)
+class _Pass(RenderPass):
+    target: ResourceId
+    sources: tuple = ()
+    buffer: ResourceId | None = None
+    strength: float = 1.0
+
+    _compiles: int = 0
+
+    @property
+    def output_target(self):
+        return self.target
+
+    def build(self) -> PassBuildInfo:
+        reads = [PassResourceUse(r, "read", "sampled") for r in self.sources]
+        if self.buffer:
+            reads.append(PassResourceUse(self.buffer, "read", "storage"))
+        return PassBuildInfo(
+            self.pass_id,
+            "pass",
+            reads=reads,
+            writes=[PassResourceUse(self.target, "write", "color")],
+        )
+
+    def on_graph_compiled(self, *, ctx, resources, services) -> None:
+        self._compiles += 1
+
+
+def _make(pid, target="color", **kw):
+    return _Pass(pass_id=PassId(pid), settings=None, target=ResourceId(target), **kw)
+
+
+class _Handle:
+    def __init__(self):
+        self.released = 0
+
+    def release(self):
+        self.released += 1
+
+
+class _GL:
+    def buffer(self, reserve=0):
+        return _Handle()
+
+
+@pytest.fixture
+def fake_allocation(monkeypatch):
+    def texture(gl, desc):
+        return TextureResource(desc=desc, handle=_Handle(), label=desc.label)
+
+    def framebuffer(gl, *, color_attachment_ids, depth_attachment_id, label, **kw):
+        desc = FramebufferDesc(tuple(color_attachment_ids), depth_attachment_id)
+        return FramebufferResource(desc=desc, handle=_Handle(), label=label)
+
+    monkeypatch.setattr(compilation, "allocate_texture", texture)
+    monkeypatch.setattr(compilation, "allocate_framebuffer", framebuffer)
+
+
+def _chain():
+    """a -> b -> c -> out; c can alias a, out is exported."""
+    builder = RenderGraphBuilder()
+    for rid in ("a", "b", "c", "out"):
+        builder.add_texture(ResourceId(rid), HDR)
+    builder.add_buffer(ResourceId("params"), BufferDesc(64))
+    builder.add_pass(PassId("p0"), _make("p0", "a", buffer=ResourceId("params")))
+    builder.add_pass(PassId("p1"), _make("p1", "b", sources=(ResourceId("a"),)))
+    builder.add_pass(PassId("p2"), _make("p2", "c", sources=(ResourceId("b"),)))
+    builder.add_pass(PassId("p3"), _make("p3", "out", sources=(ResourceId("c"),)))
+    builder.export_resource(ResourceId("out"))
+    return builder
+
+
+def _compile(builder, services, previous=None):
+    return compile_render_graph(
+        gl=_GL(), builder=builder, services=services, previous=previous
+    )
+
+
+def _handles(graph):
+    return {rid: res.handle for rid, res in graph.resources.items()}
+
+
+def test_pass_config_ignores_compiled_state():
+    compiled = _make("a")
+    compiled._program = object()
+    config = _pass_config(compiled)
+
+    assert _same_pass_config(config, _make("a"))
+    assert not _same_pass_config(config, _make("a", target="other"))
+    assert not _same_pass_config(config, _make("a", enabled=False))
+
+
+def test_rebuilt_pipeline_adopts_compiled_passes():
+    old_a, old_b = _make("a"), _make("b")
+    previous = CompiledRenderGraph(
+        gl=None,
+        pass_order=[PassId("a"), PassId("b")],
+        passes={PassId("a"): old_a, PassId("b"): old_b},
+        pass_configs={pid: _pass_config(p) for pid, p in [("a", old_a), ("b", old_b)]},
+        resources={},
+        services=None,
+    )
+
+    builder = RenderGraphBuilder()
+    builder.add_pass(PassId("a"), _make("a"))
+    builder.add_pass(PassId("b"), _make("b", target="elsewhere"))
+    _adopt_previous_passes(builder=builder, previous=previous)
+
+    assert builder.passes[PassId("a")] is old_a
+    assert builder.passes[PassId("b")] is not old_b
+
+
+def test_builder_copy_shares_passes_but_not_tables():
+    builder = RenderGraphBuilder()
+    builder.add_pass(PassId("a"), _make("a"))
+    builder.export_resource(ResourceId("color"))
+
+    clone = builder.copy()
+    clone.remove_pass(PassId("a"))
+    clone.export_resource(ResourceId("other"))
+
+    assert PassId("a") in builder.passes
+    assert builder.exports == {"color"}
+    assert builder.copy().passes[PassId("a")] is builder.passes[PassId("a")]
+
+
+def test_unchanged_resources_and_passes_are_taken_over(fake_allocation):
+    services = SimpleNamespace()
+    builder = _chain()
+    first = _compile(builder, services)
+    before = _handles(first)
+    assert before["c"] is before["a"]  # aliased
+
+    clone = builder.copy()
+    clone.add_texture(ResourceId("out"), TextureDesc(32, 32, 4, "f2"))
+    second = _compile(clone, services, previous=first)
+    after = _handles(second)
+
+    for rid in ("a", "b", "c", "params"):
+        assert after[rid] is before[rid]
+    for pid in ("p0", "p1", "p2"):
+        fbo = get_pass_fbo_id(PassId(pid))
+        assert after[fbo] is before[fbo]
+        assert clone.passes[PassId(pid)]._compiles == 1
+
+    p3_fbo = get_pass_fbo_id(PassId("p3"))
+    assert after["out"] is not before["out"]
+    assert after[p3_fbo] is not before[p3_fbo]
+    assert clone.passes[PassId("p3")]._compiles == 2
+
+    # Only the replaced handles are released, once each.
+    assert before["out"].released == 1
+    assert before[p3_fbo].released == 1
+    assert sum(h.released for h in set(before.values())) == 2
+
+
+def test_aliased_handles_are_released_once(fake_allocation):
+    services = SimpleNamespace()
+    first = _compile(_chain(), services)
+    shared = _handles(first)["a"]
+
+    clone = _chain()
+    for rid in ("a", "c"):
+        clone.add_texture(ResourceId(rid), TextureDesc(16, 16, 4, "f2"))
+    _compile(clone, services, previous=first)
+
+    assert shared.released == 1
+
+
+def test_fresh_equal_passes_are_adopted_and_skip_compilation(fake_allocation):
+    services = SimpleNamespace()
+    first = _compile(_chain(), services)
+
+    second = _compile(_chain(), services, previous=first)
+
+    for pid in ("p0", "p1", "p2", "p3"):
+        assert second.passes[PassId(pid)] is first.passes[PassId(pid)]
+        assert second.passes[PassId(pid)]._compiles == 1
+
+
+def test_in_place_edits_of_shared_passes_recompile(fake_allocation):
+    services = SimpleNamespace()
+    builder = _chain()
+    first = _compile(builder, services)
+
+    clone = builder.copy()
+    clone.passes[PassId("p1")].strength = 2.0  # same object as in `first`
+    second = _compile(clone, services, previous=first)
+
+    assert second.passes[PassId("p1")]._compiles == 2
+    assert second.passes[PassId("p2")]._compiles == 1
+    assert second.pass_configs[PassId("p1")][1]["strength"] == 2.0
@@ -0,0 +1,66 @@
+import numpy as np
+
+from sparrow.graphics.ecs.frame_submit import DrawItem
+from sparrow.graphics.helpers.instancing import build_instance_batch
+
+
+def _draw(mesh, material, slot, x=0.0):
+    model = np.eye(4, dtype=np.float32)
+    model[0, 3] = x
+    return DrawItem(mesh, material, model, entity_id=slot, instance=slot)
+
+
+def test_draws_grouped_by_mesh_and_material_in_submission_order():
+    draws = [
+        _draw("cube", "red", 0),
+        _draw("ball", "red", 1),
+        _draw("cube", "red", 2),
+        _draw("cube", "blue", 3),
+        _draw("ball", "red", 4),
+    ]
+
+    batch = build_instance_batch(draws)
+
+    groups = [(g.mesh_id, g.material_id, g.first, g.count) for g in batch.groups]
+    assert groups == [
+        ("cube", "red", 0, 2),
+        ("ball", "red", 2, 2),
+        ("cube", "blue", 4, 1),
+    ]
+    assert batch.slots.tolist() == [0, 2, 1, 4, 3]
+    assert batch.slots.dtype == np.uint32
+    assert len(batch.transient) == 0
+
+
+def test_draws_without_slot_carry_their_matrices():
+    draws = [
+        _draw("cube", "red", 5),
+        _draw("cube", "red", -1, x=3.0),
+    ]
+
+    batch = build_instance_batch(draws)
+
+    assert batch.transient.tolist() == [1]
+    assert batch.transient_models[0, 0, 3] == 3.0
+
+
+def test_empty_draw_list():
+    batch = build_instance_batch([])
+
+    assert batch.groups == []
+    assert len(batch.slots) == 0
+
+
+def test_sorted_runs_keep_queue_order_between_groups():
+    draws = [
+        _draw("cube", "glass", 0),
+        _draw("ball", "glass", 1),
+        _draw("cube", "glass", 2),
+        _draw("cube", "glass", 3),
+    ]
+
+    batch = build_instance_batch(draws, sorted_runs=True)
+
+    groups = [(g.mesh_id, g.first, g.count) for g in batch.groups]
+    assert groups == [("cube", 0, 1), ("ball", 1, 1), ("cube", 2, 2)]
+    assert batch.slots.tolist() == [0, 1, 2, 3]
@@ -0,0 +1,94 @@
+import numpy as np
+
+from sparrow.core.components import Camera, Transform
+from sparrow.graphics.ecs.frame_submit import LightPoint
+from sparrow.graphics.helpers.light_clusters import (
+    ClusterGrid,
+    build_light_clusters,
+)
+from sparrow.systems.camera import _calculate_camera_3d
+from sparrow.types import Vector3
+
+GRID = ClusterGrid(tiles_x=8, tiles_y=6, slices=12)
+
+
+def _camera():
+    camera = Camera(
+        fov=60.0,
+        width=160,
+        height=120,
+        near_clip=0.1,
+        far_clip=100.0,
+        target=np.zeros(3),
+    )
+    return _calculate_camera_3d(camera, Transform(pos=Vector3(0.0, 0.0, 10.0)))
+
+
+def _light(position, radius, light_id=0):
+    return LightPoint(
+        np.array(position, dtype=np.float64),
+        radius,
+        np.ones(3),
+        1.0,
+        light_id,
+    )
+
+
+def _cluster_of(clusters, camera, point):
+    """Cluster of a world point, computed like the shaders do."""
+    clip = camera.view_proj @ np.append(point, 1.0)
+    ndc = clip[:2] / clip[3]
+    tile = np.floor((ndc * 0.5 + 0.5) * [GRID.tiles_x, GRID.tiles_y])
+    depth = clusters.view_depth @ np.append(point, 1.0)
+    z = np.floor(np.log(depth) * clusters.depth_scale + clusters.depth_bias)
+    x, y = np.clip(tile, 0, [GRID.tiles_x - 1, GRID.tiles_y - 1]).astype(int)
+    return x, y, int(np.clip(z, 0, GRID.slices - 1))
+
+
+def test_points_inside_a_light_find_it_in_their_cluster():
+    camera = _camera()
+    rng = np.random.default_rng(0)
+    lights = [
+        _light(rng.uniform((-6, -4, -20), (6, 4, 5)), 1.5, i) for i in range(40)
+    ]
+    clusters = build_light_clusters(lights, camera, GRID)
+
+    for i, light in enumerate(lights):
+        offsets = rng.normal(size=(64, 3))
+        offsets *= rng.uniform(0, light.radius, (64, 1)) / np.linalg.norm(
+            offsets, axis=1, keepdims=True
+        )
+        for point in light.position_ws + offsets:
+            clip = camera.view_proj @ np.append(point, 1.0)
+            if clip[3] <= 0 or np.any(np.abs(clip[:2] / clip[3]) > 1):
+                continue  # off screen
+            assert i in clusters.lights_at(*_cluster_of(clusters, camera, point))
+
+
+def test_small_lights_stay_out_of_distant_clusters():
+    clusters = build_light_clusters([_light((0, 0, 0), 0.5)], _camera(), GRID)
+
+    touched = np.count_nonzero(clusters.clusters[:, 1])
+    assert 0 < touched < GRID.count // 20
+    assert len(clusters.indices) == touched
+
+
+def test_offsets_partition_the_index_list():
+    rng = np.random.default_rng(1)
+    lights = [
+        _light(rng.uniform(-5, 5, 3), rng.uniform(0.5, 4), i) for i in range(25)
+    ]
+    clusters = build_light_clusters(lights, _camera(), GRID)
+
+    offsets, counts = clusters.clusters[:, 0], clusters.clusters[:, 1]
+    np.testing.assert_array_equal(offsets[1:], (offsets + counts)[:-1])
+    assert offsets[-1] + counts[-1] == len(clusters.indices)
+
+
+def test_unbounded_and_hidden_lights():
+    lights = [_light((0, 0, 0), 0.0, 0), _light((0, 0, 30), 2.0, 1)]
+    clusters = build_light_clusters(lights, _camera(), GRID)
+
+    # radius <= 0 lights everything; the light behind the camera nothing.
+    np.testing.assert_array_equal(clusters.clusters[:, 1], 1)
+    assert not np.any(clusters.indices == 1)
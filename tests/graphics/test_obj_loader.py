@@ -0,0 +1,109 @@
+import os
+
+import numpy as np
+import pytest
+
+from sparrow.graphics.assets.mesh_manager import mesh_triangles
+from sparrow.graphics.assets.obj_loader import load_obj
+
+QUAD = """\
+v 0 0 0
+v 1 0 0
+v 1 1 0
+v 0 1 0
+vn 0 0 1
+vt 0 0
+vt 1 0
+vt 1 1
+vt 0 1
+f 1/1/1 2/2/1 3/3/1
+f 1/1/1 3/3/1 4/4/1
+"""
+
+
+def test_shared_corners_become_one_indexed_vertex(tmp_path):
+    path = tmp_path / "quad.obj"
+    path.write_text(QUAD)
+
+    data = load_obj(str(path))
+
+    assert len(data.vertices) // data.vertex_layout.stride_bytes == 4
+    assert data.index_element_size == 2
+    indices = np.frombuffer(data.indices, dtype=np.uint16)
+    assert indices.tolist() == [0, 1, 2, 0, 2, 3]
+    np.testing.assert_array_equal(
+        mesh_triangles(data),
+        [[[0, 0, 0], [1, 0, 0], [1, 1, 0]], [[0, 0, 0], [1, 1, 0], [0, 1, 0]]],
+    )
+
+
+def test_corners_differing_in_any_attribute_stay_apart(tmp_path):
+    path = tmp_path / "seam.obj"
+    # Same positions, but the second triangle has its own normal.
+    path.write_text(
+        QUAD.replace("f 1/1/1 3/3/1 4/4/1", "vn 1 0 0\nf 1/1/2 3/3/2 4/4/2")
+    )
+
+    data = load_obj(str(path))
+
+    assert len(data.vertices) // data.vertex_layout.stride_bytes == 6
+
+
+def test_large_meshes_use_32_bit_indices(tmp_path):
+    triangles = 0xFFFF // 3  # 65535 unique vertices
+    lines = [f"v {i} 0 0" for i in range(triangles * 3)]
+    lines += [f"f {3 * t + 1} {3 * t + 2} {3 * t + 3}" for t in range(triangles)]
+    path = tmp_path / "big.obj"
+    path.write_text("\n".join(lines))
+
+    data = load_obj(str(path))
+
+    assert data.index_element_size == 4
+    indices = np.frombuffer(data.indices, dtype=np.uint32)
+    assert indices[-1] == 0xFFFE
+
+
+def test_ngons_are_fan_triangulated_with_relative_indices(tmp_path):
+    path = tmp_path / "pentagon.obj"
+    path.write_text(
+        "o pentagon\n"
+        "v 0 0 0\nv 1 0 0\nv 2 1 0\nv 1 2 0\nv 0 1 0\n"
+        "vn 0 0 1\n"
+        "f -5//-1 -4//-1 -3//-1 -2//-1 -1//-1\n"
+    )
+
+    data = load_obj(str(path))
+
+    indices = np.frombuffer(data.indices, dtype=np.uint16)
+    assert indices.tolist() == [0, 1, 2, 0, 2, 3, 0, 3, 4]
+    assert data.aabb == ((0.0, 0.0, 0.0), (2.0, 2.0, 0.0))
+
+
+def test_faces_referencing_missing_vertices_raise(tmp_path):
+    path = tmp_path / "broken.obj"
+    path.write_text("v 0 0 0\nv 1 0 0\nf 1 2 3\n")
+
+    with pytest.raises(ValueError):
+        load_obj(str(path))
+
+
+def test_cached_import_is_memory_mapped_until_the_source_changes(tmp_path):
+    path = tmp_path / "quad.obj"
+    path.write_text(QUAD)
+    cache = tmp_path / "cache"
+    parsed = load_obj(str(path), cache_dir=str(cache))
+
+    cached = load_obj(str(path), cache_dir=str(cache))
+    assert isinstance(cached.vertices, memoryview)
+    assert bytes(cached.vertices) == parsed.vertices
+    assert bytes(cached.indices) == parsed.indices
+    assert cached.aabb == parsed.aabb
+
+    # A new mtime alone keeps the entry; the content hash still matches.
+    os.utime(path, ns=(1, 1))
+    assert isinstance(load_obj(str(path), cache_dir=str(cache)).vertices, memoryview)
+
+    path.write_text(QUAD.replace("v 1 1 0", "v 1 1 5"))
+    changed = load_obj(str(path), cache_dir=str(cache))
+    assert isinstance(changed.vertices, bytes)
+    assert changed.aabb[1][2] == 5.0
@@ -0,0 +1,203 @@
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import pytest
+
+from sparrow.graphics.graph.builder import RenderGraphBuilder
+from sparrow.graphics.graph.compilation import (
+    _build_dependency_dag,
+    _graph_outputs,
+    _toposort,
+)
+from sparrow.graphics.graph.pass_base import (
+    PassBuildInfo,
+    PassResourceUse,
+    RenderPass,
+)
+from sparrow.graphics.graph.pass_culling import live_passes
+from sparrow.graphics.graph.render_graph import CompiledRenderGraph
+from sparrow.graphics.pipelines.deferred import build_deferred_pipeline
+from sparrow.graphics.renderer.renderer import Renderer
+from sparrow.graphics.renderer.settings import (
+    DeferredRendererSettings,
+    ResolutionSettings,
+    SunlightSettings,
+)
+from sparrow.graphics.util.ids import PassId, ResourceId
+
+
+def _info(name, reads=(), writes=()):
+    return PassBuildInfo(
+        pass_id=PassId(name),
+        name=name,
+        reads=[PassResourceUse(ResourceId(r), "read", "sampled") for r in reads],
+        writes=[PassResourceUse(ResourceId(w), "write", "color") for w in writes],
+    )
+
+
+# gbuffer -> lighting -> bloom -> tonemap (screen), plus a debug view of the
+# normals and an SSAO pass whose output nothing reads.
+INFOS = [
+    _info("gbuffer", writes=["albedo", "normal"]),
+    _info("ssao", reads=["normal"], writes=["ao"]),
+    _info("lighting", reads=["albedo", "normal"], writes=["light"]),
+    _info("bloom", reads=["light"], writes=["bloomed"]),
+    _info("debug_normals", reads=["normal"], writes=["debug"]),
+    _info("tonemap", reads=["bloomed"]),
+]
+ORDER = [info.pass_id for info in INFOS]
+PASS_INFOS = {info.pass_id: info for info in INFOS}
+
+
+def test_passes_not_reaching_an_output_are_culled():
+    live = live_passes(
+        order=ORDER, pass_infos=PASS_INFOS, outputs={PassId("tonemap")}
+    )
+
+    assert live == ["gbuffer", "lighting", "bloom", "tonemap"]
+
+
+def test_exported_outputs_keep_their_producers():
+    live = live_passes(
+        order=ORDER,
+        pass_infos=PASS_INFOS,
+        outputs={PassId("tonemap"), PassId("debug_normals")},
+    )
+
+    assert live == ["gbuffer", "lighting", "bloom", "debug_normals", "tonemap"]
+
+
+def test_overlay_writes_keep_the_pass_underneath():
+    infos = {
+        PassId("scene"): _info("scene", writes=["color"]),
+        PassId("overlay"): _info("overlay", writes=["color"]),
+        PassId("present"): _info("present", reads=["color"]),
+    }
+
+    live = live_passes(
+        order=list(infos), pass_infos=infos, outputs={PassId("present")}
+    )
+
+    assert live == ["scene", "overlay", "present"]
+
+
+@dataclass(kw_only=True)
+class _Pass(RenderPass):
+    def build(self) -> PassBuildInfo:
+        return PASS_INFOS[self.pass_id]
+
+
+def test_disabling_a_pass_reculls_without_recompiling():
+    passes = {pid: _Pass(pass_id=pid, settings=None) for pid in ORDER}
+    graph = CompiledRenderGraph(
+        gl=None,
+        pass_order=ORDER,
+        passes=passes,
+        resources={},
+        services=None,
+        pass_infos=PASS_INFOS,
+        outputs=frozenset({PassId("tonemap"), PassId("debug_normals")}),
+    )
+
+    assert PassId("debug_normals") in graph.active_pass_order()
+
+    passes[PassId("debug_normals")].enabled = False
+    assert graph.active_pass_order() == ["gbuffer", "lighting", "bloom", "tonemap"]
+
+    # Without the final pass nothing is observable, so nothing runs.
+    passes[PassId("tonemap")].enabled = False
+    assert graph.active_pass_order() == []
+
+    passes[PassId("tonemap")].enabled = True
+    passes[PassId("debug_normals")].enabled = True
+    assert len(graph.active_pass_order()) == 5
+
+
+def test_disabled_pass_without_bypass_rejects_enabled_readers():
+    with pytest.raises(ValueError, match="'bloom'"):
+        live_passes(
+            order=ORDER,
+            pass_infos=PASS_INFOS,
+            outputs={PassId("tonemap")},
+            disabled={PassId("bloom")},
+        )
+
+    live = live_passes(
+        order=ORDER,
+        pass_infos=PASS_INFOS,
+        outputs={PassId("tonemap")},
+        disabled={PassId("bloom")},
+        bypass={PassId("bloom"): {ResourceId("bloomed"): ResourceId("light")}},
+    )
+    assert live == ["gbuffer", "lighting", "bloom", "tonemap"]
+
+
+class _Texture:
+    width, height, components, dtype = 64, 32, 4, "f2"
+
+    def __init__(self, rid):
+        self.rid = rid
+        self.data = rid.encode()
+
+    def read_into(self, buffer):
+        buffer.data = self.data
+
+    def write(self, buffer):
+        self.data = buffer.data
+
+
+class _GL:
+    def buffer(self, reserve=0):
+        assert reserve == 64 * 32 * 4 * 2
+        return SimpleNamespace(data=b"")
+
+
+def _deferred():
+    settings = DeferredRendererSettings(
+        resolution=ResolutionSettings(64, 32), sunlight=SunlightSettings()
+    )
+    builder = RenderGraphBuilder()
+    build_deferred_pipeline(builder, settings)
+
+    infos = {pid: p.build() for pid, p in builder.passes.items()}
+    gl = _GL()
+    graph = CompiledRenderGraph(
+        gl=gl,  # type: ignore[arg-type]
+        pass_order=_toposort(adjacency=_build_dependency_dag(pass_infos=infos)),
+        passes=builder.passes,
+        resources={
+            rid: SimpleNamespace(handle=_Texture(rid))  # type: ignore[misc]
+            for rid in builder.textures
+        },
+        services=None,  # type: ignore[arg-type]
+        pass_infos=infos,
+        outputs=frozenset(_graph_outputs(builder=builder, pass_infos=infos)),
+    )
+    renderer = Renderer(gl=gl, settings=settings)  # type: ignore[arg-type]
+    renderer._builder, renderer._graph = builder, graph
+    return renderer, graph
+
+
+def test_disabling_bloom_keeps_the_gbuffer_and_lighting():
+    renderer, graph = _deferred()
+
+    renderer.set_pass_enabled(PassId("bloom"), False)
+
+    assert graph.active_pass_order() == [
+        "gbuffer",
+        "deferred_lighting",
+        "bloom",
+        "tonemap",
+    ]
+    graph._run_pass(PassId("bloom"), None)  # type: ignore[arg-type]
+    assert graph.resources[ResourceId("bloomed_light")].handle.data == b"light_accum"
+
+
+def test_disabling_a_pass_without_bypass_is_rejected():
+    renderer, graph = _deferred()
+
+    with pytest.raises(ValueError, match="deferred_lighting"):
+        renderer.set_pass_enabled(PassId("deferred_lighting"), False)
+
+    assert graph.passes[PassId("deferred_lighting")].enabled
+    assert len(graph.active_pass_order()) == 4
@@ -0,0 +1,189 @@
+import numpy as np
+
+from sparrow.core.components import PolygonRenderable, Transform
+from sparrow.graphics.ecs.frame_submit import RenderFrameInput
+from sparrow.graphics.ecs.polygon_shapes import PolygonShapes
+from sparrow.graphics.ecs.render_mirror import RenderMirror
+from sparrow.graphics.passes.polygon_2d import Polygon2DPass
+from sparrow.types import Vector2, Vector3
+
+HULL = [Vector2(0.0, 1.0), Vector2(-0.5, -0.5), Vector2(0.5, -0.5)]
+
+
+def _frame(mirror):
+    return RenderFrameInput(
+        frame_index=0,
+        dt_seconds=0.0,
+        camera=None,  # type: ignore[arg-type]
+        draws=[],
+        point_lights=[],
+        polygons=mirror.polygons,
+        polygon_bounds=mirror.polygon_bounds,
+        polygon_instances=mirror.polygon_instances,
+        polygon_shapes=mirror.shapes,
+    )
+
+
+def _ship(world, x, width=2.0):
+    return world.create_entity(
+        Transform(pos=Vector3(x, 0.0, 0.0)),
+        PolygonRenderable(list(HULL), (1.0, 1.0, 1.0, 1.0), width, True),
+    )
+
+
+def test_shapes_are_deduplicated_by_outline():
+    shapes = PolygonShapes()
+
+    a = shapes.acquire(HULL, True)
+    assert shapes.acquire(list(HULL), True) == a
+    b = shapes.acquire(HULL, False)
+
+    assert a != b
+    assert shapes.counts.tolist() == [6, 4]
+    assert shapes.first.tolist() == [0, 6]
+    assert shapes.packed().shape == (10, 2)
+
+
+def test_released_shapes_recycle_their_id_and_arena_range():
+    shapes = PolygonShapes()
+    hull = shapes.acquire(HULL, True)
+    line = shapes.acquire(HULL, False)
+    assert shapes.acquire(HULL, True) == hull
+
+    shapes.release(hull)
+    assert shapes.live == 2  # still referenced once
+    shapes.release(hull)
+    assert shapes.live == 1
+    assert shapes.counts.tolist() == [0, 4]
+
+    square = [Vector2(0.0, 0.0), Vector2(1.0, 0.0), Vector2(1.0, 1.0)]
+    reused = shapes.acquire(square, True)
+    assert reused == hull
+    assert shapes.first[reused] == 0
+    assert shapes.vertex_count == 10
+    assert shapes.packed()[:2].tolist() == [[0.0, 0.0], [1.0, 0.0]]
+
+    shapes.release(line)
+    assert shapes.vertex_count == 6  # the freed tail shrinks the arena
+
+
+def test_per_frame_outlines_keep_the_registry_bounded(world):
+    mirror = RenderMirror()
+    ships = [_ship(world, float(i)) for i in range(3)]
+    mirror.sync(world)
+
+    for frame in range(200):
+        # A trail-like entity with a new world-space outline every frame.
+        for _, (polys,) in world.get_batch(PolygonRenderable):
+            polys["vertices"][0] = [Vector2(0.0, 0.0), Vector2(frame, 1.0)]
+        if frame % 10 == 0:
+            world.delete_entity(ships.pop())
+            ships.append(_ship(world, float(frame)))
+        mirror.sync(world)
+
+    assert mirror.shapes.live <= 2
+    assert len(mirror.shapes) <= 3
+    assert mirror.shapes.vertex_count <= 12
+
+
+def test_mirror_streams_affine_records(world):
+    for i in range(3):
+        _ship(world, float(i))
+
+    mirror = RenderMirror()
+    mirror.sync(world)
+
+    records = mirror.polygon_instances
+    assert len(mirror.shapes) == 1
+    assert sorted(records["affine"][:, 0, 2].tolist()) == [0.0, 1.0, 2.0]
+    assert records["affine"][0, :, :2].tolist() == [[1, 0], [0, 1]]
+
+    for _, (transforms,) in world.get_batch(Transform):
+        transforms["pos"][1, 0] = 9.0
+    mirror.sync(world)
+
+    assert mirror.last_dirty_polygons == 1
+    assert 9.0 in mirror.polygon_instances["affine"][:, 0, 2]
+    assert len(mirror.shapes) == 1
+
+
+def test_prepare_matches_for_mirror_and_plain_items(world):
+    _ship(world, 0.0, width=1.0)
+    _ship(world, 1.0, width=3.0)
+    _ship(world, 2.0, width=1.0)
+
+    mirror = RenderMirror()
+    mirror.sync(world)
+    frame = _frame(mirror)
+    plain = RenderFrameInput(
+        frame_index=0,
+        dt_seconds=0.0,
+        camera=None,  # type: ignore[arg-type]
+        draws=[],
+        point_lights=[],
+        polygons=list(mirror.polygons),
+    )
+
+    pass_ = Polygon2DPass(pass_id="polygons", settings=None)
+    mirrored = pass_.prepare(frame)
+    fallback = pass_.prepare(plain)
+
+    assert mirrored.runs == [(0, 3)]
+    assert fallback.runs == mirrored.runs
+    np.testing.assert_array_equal(fallback.commands, mirrored.commands)
+    np.testing.assert_array_equal(
+        fallback.records["affine"], mirrored.records["affine"]
+    )
+    assert mirrored.commands[:, 3].tolist() == [0, 1, 2]
+
+
+def test_layers_are_chunked_by_vertex_budget(world):
+    for i in range(5):
+        _ship(world, float(i), width=float(i + 1))
+
+    mirror = RenderMirror()
+    mirror.sync(world)
+
+    pass_ = Polygon2DPass(pass_id="polygons", settings=None)
+    pass_.BATCH_SIZE = 40  # two closed triangles (18 vertices each) per draw
+    batch = pass_.prepare(_frame(mirror))
+
+    assert batch.commands[:, 0].tolist() == [18] * 5
+    assert batch.runs == [(0, 2), (2, 2), (4, 1)]
+
+
+class _Arena:
+    def __init__(self, size):
+        self.data = bytearray(size)
+
+    @property
+    def size(self):
+        return len(self.data)
+
+    def orphan(self, size):
+        self.data = bytearray(size)
+
+    def write(self, data, offset=0):
+        raw = np.ascontiguousarray(data).tobytes()
+        self.data[offset : offset + len(raw)] = raw
+
+
+def test_arena_uploads_only_rewritten_ranges():
+    shapes = PolygonShapes()
+    hull = shapes.acquire(HULL, True)
+    shapes.acquire(HULL, False)
+    pass_ = Polygon2DPass(pass_id="polygons", settings=None)
+    pass_._arena = _Arena(16)
+
+    pass_._sync_arena(shapes)
+    assert bytes(pass_._arena.data[:80]) == shapes.packed().tobytes()
+
+    pass_._arena.data[:] = bytes(len(pass_._arena.data))
+    shapes.release(hull)
+    square = [Vector2(0.0, 0.0), Vector2(1.0, 0.0), Vector2(1.0, 1.0)]
+    shapes.acquire(square, True)
+    pass_._sync_arena(shapes)
+
+    # Only the recycled range [0, 6) was rewritten.
+    assert bytes(pass_._arena.data[:48]) == shapes.packed()[:6].tobytes()
+    assert not any(pass_._arena.data[48:80])
@@ -0,0 +1,107 @@
+import numpy as np
+
+from sparrow.core.components import Mesh, PolygonRenderable, RenderLayer, Transform
+from sparrow.graphics.ecs.render_mirror import RenderMirror, dirty_ranges
+from sparrow.types import Vector2, Vector3
+
+
+def _spawn(world, x):
+    return world.create_entity(
+        Transform(pos=Vector3(x, 0.0, 0.0)), Mesh("cube", "default")
+    )
+
+
+def test_dirty_ranges_merges_small_gaps():
+    mask = np.zeros(20, dtype=bool)
+    mask[[1, 2, 4, 10, 11]] = True
+
+    assert dirty_ranges(mask) == [(1, 3), (4, 5), (10, 12)]
+    assert dirty_ranges(mask, max_gap=1) == [(1, 5), (10, 12)]
+    assert dirty_ranges(np.zeros(4, dtype=bool)) == []
+
+
+def test_first_sync_marks_everything_dirty(world):
+    for i in range(5):
+        _spawn(world, float(i))
+
+    mirror = RenderMirror()
+    update = mirror.sync(world)
+
+    assert update.count == 5
+    assert update.dirty == [(0, 5)]
+    assert len(mirror.draws) == 5
+    assert sorted(d.model[0, 3] for d in mirror.draws) == [0, 1, 2, 3, 4]
+
+
+def test_unchanged_world_produces_no_dirty_ranges(world):
+    for i in range(5):
+        _spawn(world, float(i))
+
+    mirror = RenderMirror()
+    mirror.sync(world)
+    update = mirror.sync(world)
+
+    assert update.dirty == []
+    assert update.base_sequence == update.sequence - 1
+
+
+def test_in_place_column_write_is_detected(world):
+    eids = [_spawn(world, float(i)) for i in range(5)]
+
+    mirror = RenderMirror()
+    mirror.sync(world)
+
+    for _, (transforms,) in world.get_batch(Transform):
+        transforms["pos"][2, 1] = 7.0
+
+    update = mirror.sync(world)
+    slot = mirror.mesh_slot(eids[2])
+
+    assert update.dirty == [(slot, slot + 1)]
+    assert mirror.draws[slot].model[1, 3] == 7.0
+    assert mirror.draws[slot].entity_id == eids[2]
+
+
+def test_despawn_swaps_last_slot_into_hole(world):
+    eids = [_spawn(world, float(i)) for i in range(4)]
+
+    mirror = RenderMirror()
+    mirror.sync(world)
+
+    world.delete_entity(eids[0])
+    update = mirror.sync(world)
+
+    assert update.count == 3
+    assert mirror.mesh_slot(eids[0]) == -1
+    assert {d.entity_id for d in mirror.draws} == set(eids[1:])
+    for draw in mirror.draws:
+        assert draw.instance == mirror.mesh_slot(draw.entity_id)
+        np.testing.assert_array_equal(update.models[draw.instance], draw.model)
+
+
+def test_render_layer_changes_after_the_first_sync(world):
+    outline = [Vector2(0.0, 1.0), Vector2(-0.5, -0.5), Vector2(0.5, -0.5)]
+    eids = [
+        world.create_entity(
+            Transform(pos=Vector3(float(i), 0.0, 0.0)),
+            PolygonRenderable(list(outline), (1.0, 1.0, 1.0, 1.0), 1.0, True),
+        )
+        for i in range(3)
+    ]
+    world.add_component(eids[0], RenderLayer(2))
+
+    mirror = RenderMirror()
+    mirror.sync(world)
+    assert sorted(mirror.polygon_instances["layer"].tolist()) == [0, 0, 2]
+
+    world.add_component(eids[1], RenderLayer(-1))
+    world.remove_component(eids[0], RenderLayer)
+    world.add_component(eids[2], RenderLayer(3))
+    mirror.sync(world)
+    layers = {int(item.model[0, 3]): item.layer for item in mirror.polygons}
+    assert layers == {0: 0, 1: -1, 2: 3}
+
+    world.mutate_component(eids[2], RenderLayer(7))
+    mirror.sync(world)
+    assert mirror.last_dirty_polygons == 1
+    assert sorted(mirror.polygon_instances["layer"].tolist()) == [-1, 0, 7]
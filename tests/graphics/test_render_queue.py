@@ -0,0 +1,61 @@
+import numpy as np
+
+from sparrow.core.components import Camera, Transform
+from sparrow.graphics.assets.material_manager import Material, MaterialManager
+from sparrow.graphics.ecs.frame_submit import DrawItem, RenderFrameInput
+from sparrow.graphics.renderer.render_queue import sort_frame
+from sparrow.graphics.util.ids import MaterialId
+from sparrow.systems.camera import _calculate_camera_3d
+from sparrow.types import Vector3
+
+
+class _Meshes:
+    def index_of(self, mesh_id):
+        return {"cube": 0, "ball": 1}[mesh_id]
+
+
+def _materials():
+    materials = MaterialManager()
+    materials.create(MaterialId("red"), Material(albedo=(1.0, 0.0, 0.0)))
+    return materials
+
+
+def _frame(draws):
+    camera = Camera(
+        fov=60.0,
+        width=100,
+        height=100,
+        near_clip=0.1,
+        far_clip=100.0,
+        target=np.array([0.0, 0.0, -1.0]),
+    )
+    transform = Transform(pos=Vector3(0.0, 0.0, 0.0))
+    return RenderFrameInput(
+        frame_index=0,
+        dt_seconds=0.0,
+        camera=_calculate_camera_3d(camera, transform),
+        draws=draws,
+        point_lights=[],
+    )
+
+
+def _draw(mesh, material, distance, entity):
+    model = np.eye(4, dtype=np.float32)
+    model[2, 3] = -distance  # straight ahead of the camera
+    return DrawItem(mesh, material, model, entity_id=entity)
+
+
+def test_opaque_grouped_by_state_then_front_to_back():
+    draws = [
+        _draw("ball", "red", 5.0, 0),
+        _draw("cube", "red", 9.0, 1),
+        _draw("cube", "engine.default", 4.0, 2),
+        _draw("cube", "red", 2.0, 3),
+    ]
+
+    frame = sort_frame(_frame(draws), _Meshes(), _materials())
+
+    # engine.default is material 0, red is 1; cube is mesh 0, ball mesh 1.
+    assert [d.entity_id for d in frame.draws] == [2, 3, 1, 0]
+    assert np.all(np.diff(frame.draw_sort_keys.astype(np.float64)) >= 0)
+
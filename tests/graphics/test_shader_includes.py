@@ -0,0 +1,27 @@
+import pytest
+
+from sparrow.graphics.shaders.shader_manager import _resolve_includes
+
+
+def test_includes_are_inlined_once_with_line_directives(tmp_path):
+    (tmp_path / "common.glsl").write_text("const float PI = 3.14159;")
+    (tmp_path / "lights.glsl").write_text('#include "common.glsl"\nvec3 light();')
+    source = (
+        "#version 460 core\n"
+        '#include "common.glsl"\n'
+        '#include "lights.glsl"\n'
+        "void main() {}\n"
+    )
+
+    out = _resolve_includes(source, [tmp_path])
+
+    assert out.count("const float PI") == 1
+    assert "vec3 light();" in out
+    assert out.startswith("#version 460 core\n#line 1\n")
+    # The line after the last include is numbered as in the original file.
+    assert out.endswith("#line 4\nvoid main() {}\n")
+
+
+def test_missing_include_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        _resolve_includes('#include "nope.glsl"\n', [tmp_path])
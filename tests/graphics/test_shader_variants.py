@@ -0,0 +1,116 @@
+import os
+
+import moderngl
+
+import sparrow.graphics.shaders.shader_manager as sm
+from sparrow.graphics.shaders.program_types import ShaderStages
+from sparrow.graphics.shaders.shader_manager import (
+    ShaderDefine,
+    ShaderManager,
+    ShaderRequest,
+    ShaderVariantManifest,
+    _inject_defines,
+    _load_stage,
+)
+from sparrow.graphics.shaders.source_cache import ShaderSourceCache
+from sparrow.graphics.util.ids import ShaderId
+
+
+def _request(name, vert="void main() {}", frag="void main() {}", defines=()):
+    return ShaderRequest(
+        shader_id=ShaderId(name),
+        stages=ShaderStages(vertex=vert, fragment=frag),
+        defines=tuple(ShaderDefine(*d) for d in defines),
+    )
+
+
+def test_defines_follow_the_version_directive():
+    source = "// header\n#version 460 core\nvoid main() {}\n"
+
+    defines = [ShaderDefine("USE_SHADOWS"), ShaderDefine("N", "4")]
+
+    out = _inject_defines(source, defines)
+
+    assert out == (
+        "// header\n#version 460 core\n"
+        "#define USE_SHADOWS 1\n#define N 4\n#line 3\n"
+        "void main() {}\n"
+    )
+
+
+def test_cached_sources_skip_reads_until_a_dependency_changes(
+    tmp_path, monkeypatch
+):
+    (tmp_path / "common.glsl").write_text("const float K = 1.0;")
+    stage = tmp_path / "lit.frag"
+    stage.write_text('#version 460\n#include "common.glsl"\nvoid main() {}\n')
+    cache = ShaderSourceCache(tmp_path / "cache")
+    req = _request("lit", defines=[("FOG", "1")])
+
+    first = _load_stage(str(stage), req, (), cache)
+
+    reads = []
+    original = sm._load_source
+    monkeypatch.setattr(
+        sm, "_load_source", lambda src: reads.append(src) or original(src)
+    )
+    assert _load_stage(str(stage), req, (), cache) == first
+    assert reads == []
+
+    # A different variant of the same file is a separate entry.
+    assert "#define FOG" not in _load_stage(str(stage), _request("lit"), (), cache)
+
+    include = tmp_path / "common.glsl"
+    include.write_text("const float K = 2.0;")
+    os.utime(include, ns=(1, 1))
+    assert "K = 2.0" in _load_stage(str(stage), req, (), cache)
+
+
+def test_manifest_round_trips_distinct_variants(tmp_path):
+    manifest = ShaderVariantManifest(
+        [
+            _request("lit", defines=[("A", "1"), ("B", "2")]),
+            _request("lit", defines=[("B", "2"), ("A", "1")]),  # same variant
+            _request("lit"),
+        ]
+    )
+    path = tmp_path / "shaders.json"
+    manifest.save(path)
+
+    loaded = ShaderVariantManifest.load(path)
+
+    assert len(loaded) == 2
+    assert loaded.requests == manifest.requests
+
+
+class _GL:
+    def __init__(self):
+        self.compiled = []
+
+    def program(self, vertex_shader, fragment_shader, geometry_shader=None):
+        if "error" in fragment_shader:
+            raise moderngl.Error("compile failed")
+        self.compiled.append(fragment_shader)
+        return object()
+
+
+def test_warm_up_compiles_a_slice_per_step_and_skips_broken_variants():
+    gl = _GL()
+    mgr = ShaderManager(gl, include_paths=[])
+    requests = [
+        _request("a"),
+        _request("broken", frag="error"),
+        _request("b", defines=[("X", "1")]),
+    ]
+
+    warm_up = mgr.begin_warm_up(requests)
+    assert not warm_up.step(0.0)
+    assert warm_up.remaining == 2
+    assert warm_up.step(1000.0)
+
+    assert len(gl.compiled) == 2
+    assert len(mgr.manifest) == 2
+    assert _request("broken", frag="error") not in mgr.manifest
+    # Warmed variants are served from the program cache.
+    mgr.get(requests[2])
+    assert len(gl.compiled) == 2
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from sparrow.graphics.assets.texture_manager import SKY_LUT_ID, TextureManager
+from sparrow.graphics.helpers import sky_lut_cache
+from sparrow.graphics.helpers.sky_lut_cache import SkyLutCache
+from sparrow.graphics.helpers.spectral_sky import generate_spectral_sky_lut
+
+calls = []
+
+
+def _gradient(width: int = 4, height: int = 2, sun_dir=(0.0, 1.0, 0.0)) -> bytes:
+    calls.append((width, height, sun_dir))
+    return np.full((height, width, 4), sun_dir[1], dtype="f4").tobytes()
+
+
+def test_results_are_memoized_per_argument_set():
+    calls.clear()
+    cache = SkyLutCache(capacity=2)
+
+    first = cache.get(_gradient, sun_dir=(0.0, 0.5, 0.0))
+    # Spelling out a default is the same key.
+    assert cache.get(_gradient, width=4, sun_dir=(0.0, 0.5, 0.0)) is first
+    cache.get(_gradient)
+    cache.get(_gradient, height=3)  # evicts the least recently used entry
+
+    assert len(cache) == 2
+    cache.get(_gradient, sun_dir=(0.0, 0.5, 0.0))
+    assert len(calls) == 4
+
+
+def test_disk_entries_are_memory_mapped_across_instances(tmp_path):
+    calls.clear()
+    generated = SkyLutCache(str(tmp_path)).get(_gradient, height=3)
+
+    reloaded = SkyLutCache(str(tmp_path)).get(_gradient, height=3)
+
+    assert len(calls) == 1
+    assert isinstance(reloaded, memoryview)
+    assert bytes(reloaded) == generated
+    SkyLutCache(str(tmp_path)).get(_gradient, height=5)
+    assert len(calls) == 2
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")  # the model's own overflow
+def test_spectral_lut_matches_the_generator(tmp_path):
+    params = dict(width=8, height=4, sun_elevation=12.5, num_samples=2)
+    SkyLutCache(str(tmp_path)).spectral(**params)
+
+    cached = SkyLutCache(str(tmp_path)).spectral(**params)
+
+    assert bytes(cached) == generate_spectral_sky_lut(**params)
+
+
+class _Texture:
+    def __init__(self, size, data):
+        self.size = size
+        self.data = data
+        self.released = False
+
+    def write(self, data):
+        self.data = data
+
+    def build_mipmaps(self, base=0, max_level=1000):
+        pass
+
+    def release(self):
+        self.released = True
+
+
+class _GL:
+    def texture(self, size, components, data=None, dtype="f1"):
+        return _Texture(size, data)
+
+
+def _spectral(width=1024, height=512, sun_elevation=45.2, **params) -> bytes:
+    calls.append((width, height, sun_elevation))
+    return np.full((height, width, 4), sun_elevation, dtype="f4").tobytes()
+
+
+def test_engine_sky_lut_is_served_by_the_cache(monkeypatch, tmp_path):
+    calls.clear()
+    monkeypatch.setattr(sky_lut_cache, "generate_spectral_sky_lut", _spectral)
+    textures = TextureManager(_GL(), sky_luts=SkyLutCache(str(tmp_path)))
+
+    handle = textures.sky_lut()
+    assert textures.get(SKY_LUT_ID) is handle
+    assert textures.sky_lut() is handle
+    assert handle.texture.size == (512, 256)
+    texture = handle.texture
+
+    # Time of day: written in place, revisited sun positions skip the model.
+    for elevation in (30.0, 15.0, 30.0):
+        assert textures.update_sky_lut(sun_elevation=elevation) is handle
+    assert handle.texture is texture
+    assert np.frombuffer(texture.data, "f4")[0] == 30.0
+    assert len(calls) == 2
+
+    textures.update_sky_lut(width=64, height=32)
+    assert handle.texture is not texture and texture.released
+    assert handle.texture.size == (64, 32)
+
+    # A later run maps the stored LUT.
+    TextureManager(_GL(), sky_luts=SkyLutCache(str(tmp_path))).sky_lut()
+    assert len(calls) == 3
@@ -0,0 +1,37 @@
+import pytest
+
+from sparrow.graphics.renderer.stream_buffer import RingAllocator
+
+
+def test_allocations_are_aligned_within_the_frame_region():
+    ring = RingAllocator(region_size=1024, frames_in_flight=3)
+
+    assert ring.allocate(10, alignment=256) == 0
+    assert ring.allocate(10, alignment=256) == 256
+    # Non power-of-two strides work too (first instance of 52-byte records).
+    assert ring.allocate(52, alignment=52) == 312
+    assert ring.used == 364
+
+
+def test_each_frame_uses_the_next_region_and_wraps():
+    ring = RingAllocator(region_size=1024, frames_in_flight=2)
+    ring.allocate(100, alignment=4)
+
+    assert ring.advance() == 1
+    assert ring.allocate(100, alignment=4) == 1024
+    assert ring.advance() == 0
+    assert ring.allocate(100, alignment=4) == 0
+
+
+def test_exhausted_region_reports_none():
+    ring = RingAllocator(region_size=512, frames_in_flight=2)
+
+    assert ring.allocate(500, alignment=4) == 0
+    assert ring.allocate(16, alignment=4) is None
+    # The failed request must not bleed into the next region.
+    assert ring.head == 500
+
+
+def test_at_least_one_frame_in_flight():
+    with pytest.raises(ValueError):
+        RingAllocator(region_size=64, frames_in_flight=0)
@@ -0,0 +1,124 @@
+from sparrow.graphics.graph.compilation import _plan_texture_aliases
+from sparrow.graphics.graph.pass_base import PassBuildInfo, PassResourceUse
+from sparrow.graphics.graph.resources import TextureDesc
+from sparrow.graphics.util.ids import PassId, ResourceId
+
+HDR = TextureDesc(64, 32, 4, "f2")
+
+
+def _pass(name, reads=(), writes=(), readwrites=()):
+    return PassBuildInfo(
+        pass_id=PassId(name),
+        name=name,
+        reads=[PassResourceUse(ResourceId(r), "read", "sampled") for r in reads]
+        + [PassResourceUse(ResourceId(r), "readwrite", "storage") for r in readwrites],
+        writes=[PassResourceUse(ResourceId(w), "write", "color") for w in writes],
+    )
+
+
+def _plan(textures, *passes, exports=()):
+    infos = {info.pass_id: info for info in passes}
+    return _plan_texture_aliases(
+        order=[info.pass_id for info in passes],
+        pass_infos=infos,
+        textures={ResourceId(k): v for k, v in textures.items()},
+        exports={ResourceId(e) for e in exports},
+    )
+
+
+def test_deferred_chain_reuses_the_gbuffer_for_bloom():
+    aliases = _plan(
+        {
+            "albedo": HDR,
+            "normal": HDR,
+            "light": HDR,
+            "bloom": TextureDesc(64, 32, 4, "f2", label="bloomed"),
+        },
+        _pass("gbuffer", writes=["albedo", "normal"]),
+        _pass("lighting", reads=["albedo", "normal"], writes=["light"]),
+        _pass("bloom", reads=["light"], writes=["bloom"]),
+        _pass("tonemap", reads=["bloom"]),
+    )
+
+    # light overlaps the gbuffer in "lighting"; bloom starts after it ends.
+    assert aliases["light"] == "light"
+    assert aliases["bloom"] in ("albedo", "normal")
+    assert aliases["albedo"] == "albedo"
+    assert aliases["normal"] == "normal"
+
+
+def test_incompatible_descriptors_never_alias():
+    aliases = _plan(
+        {
+            "a": HDR,
+            "b": TextureDesc(64, 32, 4, "f4"),
+            "c": TextureDesc(32, 32, 4, "f2"),
+            "d": TextureDesc(64, 32, 1, "f4", depth=True),
+        },
+        _pass("p0", writes=["a"]),
+        _pass("p1", reads=["a"], writes=["b"]),
+        _pass("p2", reads=["b"], writes=["c"]),
+        _pass("p3", reads=["c"], writes=["d"]),
+    )
+
+    assert all(rid == owner for rid, owner in aliases.items())
+
+
+def test_persistent_and_history_textures_keep_their_memory():
+    aliases = _plan(
+        {
+            "scratch": HDR,
+            "accum": TextureDesc(64, 32, 4, "f2", persistent=True),
+            "history": HDR,
+            "taa": HDR,
+        },
+        _pass("p0", writes=["scratch"]),
+        _pass("p1", reads=["scratch"]),
+        _pass("trace", writes=["accum"]),
+        _pass("resolve", reads=["history"], writes=["taa"]),
+        _pass("present", reads=["accum", "taa"], readwrites=["history"]),
+    )
+
+    assert aliases["accum"] == "accum"
+    assert aliases["history"] == "history"
+    # Only the genuinely transient texture can be reused.
+    assert aliases["taa"] == "scratch"
+
+
+def test_unused_textures_are_allocated_on_their_own():
+    aliases = _plan(
+        {"used": HDR, "unused": HDR},
+        _pass("p0", writes=["used"]),
+    )
+
+    assert aliases == {"used": "used", "unused": "unused"}
+
+
+def test_exported_textures_are_never_reused():
+    aliases = _plan(
+        {"exported": HDR, "scratch": HDR, "temp": HDR},
+        _pass("a", writes=["exported"]),
+        _pass("b", writes=["scratch"]),
+        _pass("c", reads=["scratch"], writes=["temp"]),
+        _pass("d", reads=["temp"]),
+        exports=["exported"],
+    )
+
+    assert aliases["exported"] == "exported"
+    assert "exported" not in (aliases["scratch"], aliases["temp"])
+
+
+def test_textures_with_several_producers_keep_their_memory():
+    textures = {"scratch": HDR, "tmp": HDR, "color": HDR}
+    passes = [
+        _pass("a", writes=["scratch"]),
+        _pass("b", reads=["scratch"], writes=["tmp"]),
+        _pass("scene", writes=["color"]),
+        _pass("overlay", writes=["color"]),
+        _pass("present", reads=["color", "tmp"]),
+    ]
+
+    # Disabling "scene" keeps "present" running on the overlay's output,
+    # which must not be drawn over another texture's memory.
+    assert _plan(textures, *passes)["color"] == "color"
+    assert _plan(textures, *passes[:3], passes[4])["color"] == "scratch"
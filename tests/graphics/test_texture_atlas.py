@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from sparrow.core.components import Sprite
+from sparrow.core.world import World
+from sparrow.graphics.assets.atlas import SkylinePacker, build_atlas, remap_sprites
+from sparrow.graphics.assets.texture_manager import TextureManager
+from sparrow.graphics.util.ids import TextureId
+
+
+class _Texture:
+    def __init__(self, size):
+        self.size = size
+        self.max_level = None
+
+    def build_mipmaps(self, base=0, max_level=1000):
+        self.max_level = max_level
+
+
+class _GL:
+    def texture(self, size, components, data=None, dtype="f1"):
+        return _Texture(size)
+
+
+def _solid(width, height, value):
+    return np.full((height, width, 4), value, dtype=np.uint8)
+
+
+def _overlaps(a, b):
+    return not (
+        a[0] + a[2] <= b[0]
+        or b[0] + b[2] <= a[0]
+        or a[1] + a[3] <= b[1]
+        or b[1] + b[3] <= a[1]
+    )
+
+
+def test_skyline_packs_without_overlap_until_full():
+    packer = SkylinePacker(16, 16)
+    placed = []
+    for w, h in [(8, 8), (8, 4), (4, 4), (4, 4), (16, 4), (8, 4), (8, 4)]:
+        spot = packer.insert(w, h)
+        assert spot is not None
+        placed.append((*spot, w, h))
+
+    for i, a in enumerate(placed):
+        assert a[0] + a[2] <= 16 and a[1] + a[3] <= 16
+        assert not any(_overlaps(a, b) for b in placed[i + 1 :])
+    assert packer.insert(1, 1) is None
+
+
+def test_images_keep_their_pixels_and_extruded_gutters():
+    images = {f"s{i}": _solid(5 + i, 3 + i, 10 * (i + 1)) for i in range(20)}
+
+    atlas = build_atlas("ui", images, page_size=64, padding=2)
+
+    assert atlas.mip_levels == 1
+    rects = []
+    for key, img in images.items():
+        e = atlas.entries[key]
+        page = atlas.pages[e.page]
+        np.testing.assert_array_equal(
+            page[e.y : e.y + e.height, e.x : e.x + e.width], img
+        )
+        # The gutter repeats the edge texels.
+        np.testing.assert_array_equal(
+            page[e.y - 2 : e.y + e.height + 2, e.x - 2 : e.x + e.width + 2],
+            np.full((e.height + 4, e.width + 4, 4), img[0, 0]),
+        )
+        assert (e.x - 2) % 2 == 0 and (e.y - 2) % 2 == 0
+        rects.append((e.page, e.x - 2, e.y - 2, e.width + 4, e.height + 4))
+
+    assert len(atlas.pages) > 1
+    for i, a in enumerate(rects):
+        assert not any(a[0] == b[0] and _overlaps(a[1:], b[1:]) for b in rects[i + 1 :])
+
+
+def test_oversized_images_are_rejected():
+    with pytest.raises(ValueError):
+        build_atlas("ui", {"big": _solid(64, 8, 0)}, page_size=64, padding=1)
+
+
+def test_sprites_are_pointed_at_their_page_and_region():
+    atlas = build_atlas(
+        "ui", {"a": _solid(16, 8, 1), "b": _solid(8, 8, 2)}, page_size=64
+    )
+    a = atlas.entries["a"]
+    world = World()
+    whole = world.create_entity(Sprite(texture_id="a"))
+    half = world.create_entity(Sprite(texture_id="a", region=(0.5, 0.0, 0.5, 1.0)))
+    other = world.create_entity(Sprite(texture_id="unpacked"))
+
+    assert remap_sprites(world, atlas) == 2
+
+    sprite = world.component(whole, Sprite)
+    assert sprite.texture_id == "ui#0"
+    assert sprite.region == pytest.approx((a.x / 64, a.y / 64, 16 / 64, 8 / 64))
+    assert world.component(half, Sprite).region == pytest.approx(
+        ((a.x + 8) / 64, a.y / 64, 8 / 64, 8 / 64)
+    )
+    assert world.component(other, Sprite).texture_id == "unpacked"
+
+
+def test_pages_upload_with_a_bounded_mip_chain():
+    images = {f"s{i}": _solid(24, 24, i) for i in range(8)}
+    atlas = build_atlas("ui", images, page_size=64, padding=4)
+    textures = TextureManager(_GL())
+
+    handles = textures.create_atlas(atlas)
+
+    assert len(handles) == len(atlas.pages) == 2
+    assert textures.get(TextureId("ui#1")) is handles[1]
+    assert handles[0].texture.max_level == 2
+    with pytest.raises(KeyError):
+        textures.create_atlas(atlas)
@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+from PIL import Image
+
+from sparrow.graphics.assets.image_loader import build_mip_chain, decode_texture
+
+
+def _write_png(path, pixels):
+    Image.fromarray(np.asarray(pixels, dtype=np.uint8), "RGBA").save(path)
+
+
+def test_warm_decodes_map_the_cached_pixels(tmp_path):
+    path = tmp_path / "tex.png"
+    pixels = np.random.default_rng(0).integers(0, 256, (5, 7, 4), dtype=np.uint8)
+    _write_png(path, pixels)
+    cache = str(tmp_path / "cache")
+
+    cold = decode_texture(str(path), cache_dir=cache)
+    warm = decode_texture(str(path), cache_dir=cache)
+
+    assert isinstance(cold.data, bytes)
+    assert isinstance(warm.data, memoryview)
+    assert (warm.width, warm.height) == (7, 5)
+    assert bytes(warm.data) == cold.data == pixels.tobytes()
+
+    # A touched file with the same content keeps its entry.
+    os.utime(path, ns=(1, 1))
+    assert isinstance(decode_texture(str(path), cache_dir=cache).data, memoryview)
+
+    _write_png(path, 255 - pixels)
+    changed = decode_texture(str(path), cache_dir=cache)
+    assert isinstance(changed.data, bytes)
+    assert changed.data == (255 - pixels).tobytes()
+
+
+def test_import_settings_are_part_of_the_key(tmp_path):
+    path = tmp_path / "tex.png"
+    _write_png(path, np.full((8, 4, 4), 200))
+    cache = str(tmp_path / "cache")
+
+    assert decode_texture(str(path), cache_dir=cache).mips == ()
+    chained = decode_texture(str(path), cache_dir=cache, mips=True)
+    cached = decode_texture(str(path), cache_dir=cache, mips=True)
+
+    assert isinstance(chained.data, bytes)
+    assert [len(m) for m in cached.mips] == [32, 8, 4]  # 2x4, 1x2, 1x1
+    assert [bytes(m) for m in cached.mips] == list(chained.mips)
+
+
+def test_mips_average_in_linear_light_and_ignore_transparent_texels():
+    checker = np.array(
+        [[[0, 0, 0, 255], [255, 255, 255, 255]], [[255] * 4, [0, 0, 0, 255]]]
+    )
+    (level,) = build_mip_chain(checker.astype(np.uint8))
+    assert level.tolist() == [[[188, 188, 188, 255]]]
+
+    edge = np.array([[[255, 0, 0, 255], [0, 0, 0, 0]]], dtype=np.uint8)
+    (level,) = build_mip_chain(edge)
+    assert level.tolist() == [[[255, 0, 0, 128]]]
@@ -0,0 +1,71 @@
+import numpy as np
+
+from sparrow.graphics.assets.material_manager import Material, MaterialManager
+from sparrow.graphics.assets.mesh_manager import mesh_triangles
+from sparrow.graphics.assets.types import MeshData, VertexLayout
+from sparrow.graphics.ecs.frame_submit import DrawItem
+from sparrow.graphics.helpers.triangle_packing import TrianglePacker
+from sparrow.graphics.util.ids import MaterialId
+
+LAYOUT = VertexLayout(["in_pos"], "3f", 12)
+QUAD = MeshData(
+    vertices=np.array(
+        [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], dtype=np.float32
+    ).tobytes(),
+    indices=np.array([0, 1, 2, 0, 2, 3], dtype=np.uint16).tobytes(),
+    vertex_layout=LAYOUT,
+    aabb=((0, 0, 0), (1, 1, 0)),
+    index_element_size=2,
+)
+
+
+class _Meshes:
+    def triangles(self, mesh_id):
+        return mesh_triangles(QUAD)
+
+
+def _draw(x):
+    model = np.eye(4, dtype=np.float32)
+    model[0, 3] = x
+    return DrawItem("quad", "red", model, entity_id=0)
+
+
+def _materials():
+    materials = MaterialManager()
+    materials.create(
+        MaterialId("red"), Material(albedo=(1.0, 0.0, 0.0), metallic=0.25)
+    )
+    return materials
+
+
+def test_mesh_triangles_resolves_uint16_indices():
+    tris = mesh_triangles(QUAD)
+
+    assert tris.shape == (2, 3, 3)
+    np.testing.assert_array_equal(tris[1], [[0, 0, 0], [1, 1, 0], [0, 1, 0]])
+
+
+def test_packs_world_space_triangles_in_std430_layout():
+    packer = TrianglePacker(capacity=1)
+    dirty = packer.pack([_draw(0.0), _draw(5.0)], _Meshes(), _materials())
+
+    assert dirty == [(0, 4)]
+    assert packer.count == 4
+    tri = packer.triangles[2]  # first triangle of the second draw
+    np.testing.assert_array_equal(tri[:3, :3], [[5, 0, 0], [6, 0, 0], [6, 1, 0]])
+    assert tri[0, 3] == 0.25  # metallic
+    assert tri[1, 3] == 0.5  # roughness
+    np.testing.assert_array_equal(tri[3], [1, 0, 0, 0])
+
+
+def test_only_changed_instances_are_repacked():
+    packer = TrianglePacker()
+    meshes, materials = _Meshes(), _materials()
+    draws = [_draw(0.0), _draw(1.0), _draw(2.0)]
+    packer.pack(draws, meshes, materials)
+
+    assert packer.pack(draws, meshes, materials) == []
+
+    draws[1].model[1, 3] = 3.0  # moved in place
+    assert packer.pack(draws, meshes, materials) == [(2, 4)]
+    assert packer.triangles[2, 0, 1] == 3.0